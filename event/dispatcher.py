@@ -24,6 +24,12 @@ from util.config import *
 from util.keys import *
 from event.gpiobutton import GpioButton
 from event.i2cbuttons import I2CButtons
+from event.scheduler import Scheduler
+from ui.compositor import compositor
+
+TASK_SCREEN_REFRESH = "screen.refresh"
+IDLE_TIMEOUT = 1.0
+IDLE_REFRESH_PERIOD = 0.1
 
 # Maps IR remote control keys to keyboard keys
 lirc_keyboard_map = {"options": pygame.K_m,
@@ -63,6 +69,10 @@ class EventDispatcher(object):
     This class runs two separate event loops:
     - Main event loop which handles mouse, keyboard and user events
     - LIRC event loop which handles LIRC events
+
+    The main event loop waits for input events until the nearest deadline of the scheduler.
+    The screen is refreshed with the frame rate. When nothing was drawn on the screen
+    it's refreshed less often until the next input event or screen update.
     """
 
     def __init__(self, screensaver_dispatcher, util, volume_control):
@@ -97,6 +107,10 @@ class EventDispatcher(object):
         self.move_enabled = False
         self.poweroff_flag = 0
         self.frame_refresh_period = 1 / self.frame_rate
+        self.last_activity = time.monotonic()
+        self.last_update_count = 0
+        self.scheduler = Scheduler()
+        self.screensaver_dispatcher.set_scheduler(self.scheduler)
 
     def set_current_screen(self, current_screen):
         """ Set current screen. 
@@ -305,6 +319,8 @@ class EventDispatcher(object):
                 
         :param event: event to handle
         """
+        self.set_active()
+
         if self.screensaver_dispatcher.saver_running:
             self.screensaver_was_running = True
         else:
@@ -314,10 +330,29 @@ class EventDispatcher(object):
         if not self.screensaver_was_running:
             self.current_screen.handle_event(event)
 
-    def handle_single_touch(self):
-        """ Handle single touch events """
+    def get_events(self, timeout=None):
+        """ Wait for events
+
+        :param timeout: maximum waiting time in seconds, None - don't wait
+
+        :return: list of events
+        """
+        if not timeout or pygame.event.peek():
+            return pygame.event.get()
+
+        event = pygame.event.wait(max(int(timeout * 1000), 1))
+        if event.type == pygame.NOEVENT:
+            return []
+
+        return [event] + pygame.event.get()
+
+    def handle_single_touch(self, timeout=None):
+        """ Handle single touch events 
         
-        events = pygame.event.get()
+        :param timeout: maximum time in seconds to wait for events
+        """
+        
+        events = self.get_events(timeout)
 
         for event in events:
             source = getattr(event, "source", None)
@@ -362,8 +397,13 @@ class EventDispatcher(object):
         event.button = 1
         return event
 
-    def handle_multi_touch(self):
-        """ Handle multi-touch events """
+    def handle_multi_touch(self, timeout=None):
+        """ Handle multi-touch events 
+        
+        :param timeout: maximum time in seconds to wait for events
+        """
+        if timeout:
+            time.sleep(min(timeout, self.frame_refresh_period))
 
         for touch in self.multi_touch_screen.poll():
             if self.mts_state[touch.slot] != touch.valid:
@@ -480,25 +520,44 @@ class EventDispatcher(object):
         self.shutdown = shutdown
         handler = self.get_handler()
         pygame.event.clear()
+        self.set_active()
 
         while self.run_dispatcher:
-            handler()
+            timeout = self.scheduler.get_timeout()
+            if timeout == None or (self.lirc != None and timeout > self.frame_refresh_period):
+                timeout = self.frame_refresh_period
+
+            handler(timeout)
             if self.lirc != None:
                 code = self.lirc.readline()
                 if code != None:
                     self.handle_lirc_event(code)
 
-            area = self.screensaver_dispatcher.refresh()
-            if self.screensaver_dispatcher.saver_running:
-                if area:
-                    pygame.display.update(area)
-                else:
-                    areas = self.screensaver_dispatcher.update()
-                    if areas:
-                        pygame.display.update(areas)
-            else:
-                area = self.current_screen.refresh()
-                if area:
-                    self.current_screen.clean_draw_update(area)
+            compositor.begin()
+            self.scheduler.run_pending()
+            compositor.end()
+
+    def set_active(self):
+        """ Switch screen refresh to the frame rate after input event or screen update """
 
-            time.sleep(self.frame_refresh_period)
+        self.last_activity = time.monotonic()
+
+        if self.scheduler.get_period(TASK_SCREEN_REFRESH) != self.frame_refresh_period:
+            p = self.frame_refresh_period
+            self.scheduler.schedule(TASK_SCREEN_REFRESH, p, self.refresh_screen, p)
+
+    def refresh_screen(self):
+        """ Scheduler task which refreshes the current screen or updates running screensaver """
+
+        if self.screensaver_dispatcher.saver_running:
+            compositor.add(self.screensaver_dispatcher.update())
+        else:
+            area = self.current_screen.refresh()
+            if area:
+                self.current_screen.clean_draw_update(area)
+
+        if compositor.update_count != self.last_update_count:
+            self.last_update_count = compositor.update_count
+            self.set_active()
+        elif time.monotonic() - self.last_activity > IDLE_TIMEOUT:
+            self.scheduler.set_period(TASK_SCREEN_REFRESH, max(IDLE_REFRESH_PERIOD, self.frame_refresh_period))
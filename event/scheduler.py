@@ -0,0 +1,143 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import heapq
+
+from threading import RLock
+
+DEADLINE = 0
+NAME = 2
+CALLBACK = 3
+PERIOD = 4
+ACTIVE = 5
+
+class Scheduler(object):
+    """ Timer heap of named tasks used by the main event loop. The loop sleeps until
+    the nearest deadline or until the input event arrives. Periodic tasks are rescheduled
+    relative to their previous deadline, so they don't drift. If the deadline was missed
+    the missed runs are skipped.
+    """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.lock = RLock()
+        self.heap = []
+        self.tasks = {}
+        self.sequence = 0
+
+    def schedule(self, name, delay, callback, period=None):
+        """ Schedule task. The task with the same name is replaced.
+
+        :param name: task name
+        :param delay: delay in seconds before the first run
+        :param callback: task function
+        :param period: period in seconds for periodic task, None for one-shot task
+        """
+        with self.lock:
+            self.cancel(name)
+            self.sequence += 1
+            task = [time.monotonic() + delay, self.sequence, name, callback, period, True]
+            self.tasks[name] = task
+            heapq.heappush(self.heap, task)
+
+    def cancel(self, name):
+        """ Cancel task
+
+        :param name: task name
+        """
+        with self.lock:
+            task = self.tasks.pop(name, None)
+            if task:
+                task[ACTIVE] = False
+
+    def is_scheduled(self, name):
+        """ Check if task is scheduled
+
+        :param name: task name
+
+        :return: True - scheduled, False - otherwise
+        """
+        with self.lock:
+            return name in self.tasks
+
+    def get_period(self, name):
+        """ Get task period
+
+        :param name: task name
+
+        :return: period in seconds or None
+        """
+        with self.lock:
+            task = self.tasks.get(name, None)
+            if task:
+                return task[PERIOD]
+            return None
+
+    def set_period(self, name, period):
+        """ Change task period. New period will be used after the next run.
+
+        :param name: task name
+        :param period: new period in seconds
+        """
+        with self.lock:
+            task = self.tasks.get(name, None)
+            if task:
+                task[PERIOD] = period
+
+    def get_timeout(self):
+        """ Get time left to the nearest deadline
+
+        :return: timeout in seconds or None if there are no tasks
+        """
+        with self.lock:
+            while self.heap and not self.heap[0][ACTIVE]:
+                heapq.heappop(self.heap)
+
+            if not self.heap:
+                return None
+
+            return max(self.heap[0][DEADLINE] - time.monotonic(), 0)
+
+    def run_pending(self):
+        """ Run all tasks with expired deadlines """
+
+        now = time.monotonic()
+        due = []
+
+        with self.lock:
+            while self.heap and self.heap[0][DEADLINE] <= now:
+                task = heapq.heappop(self.heap)
+                if not task[ACTIVE]:
+                    continue
+
+                due.append(task)
+                period = task[PERIOD]
+                if period:
+                    deadline = task[DEADLINE] + period
+                    if deadline <= now:
+                        deadline += period * (int((now - deadline) / period) + 1)
+                    self.sequence += 1
+                    next_task = [deadline, self.sequence, task[NAME], task[CALLBACK], period, True]
+                    self.tasks[task[NAME]] = next_task
+                    heapq.heappush(self.heap, next_task)
+                else:
+                    del self.tasks[task[NAME]]
+
+        for task in due:
+            task[CALLBACK]()
@@ -24,6 +24,8 @@ import time
 import logging
 import socket
 
+STARTUP_TIME = time.monotonic()
+
 from datetime import datetime
 from threading import RLock, Thread
 from subprocess import Popen
@@ -32,76 +34,29 @@ from player.proxy import Proxy, MPD_NAME, SHAIRPORT_SYNC_NAME, RASPOTIFY_NAME, B
 from player.player import Player
 from screensaver.screensaverdispatcher import ScreensaverDispatcher
 from ui.state import State
-from ui.screen.radiogroup import RadioGroupScreen
-from ui.screen.home import HomeScreen
-from ui.screen.language import LanguageScreen
-from ui.screen.saver import SaverScreen
-from ui.screen.about import AboutScreen
-from ui.screen.black import BlackScreen
-from ui.player.radioplayer import RadioPlayerScreen
-from ui.player.streamplayer import StreamPlayerScreen
-from ui.browser.radio import RadioBrowserScreen
-from ui.browser.stream import StreamBrowserScreen
-from ui.browser.file import FileBrowserScreen
-from ui.player.fileplayer import FilePlayerScreen
-from ui.screen.equalizer import EqualizerScreen
-from ui.screen.timer import TimerScreen
+from ui.registry import RadioGroupScreen, HomeScreen, LanguageScreen, SaverScreen, AboutScreen, BlackScreen, RadioPlayerScreen, \
+    StreamPlayerScreen, RadioBrowserScreen, StreamBrowserScreen, FileBrowserScreen, FilePlayerScreen, \
+    EqualizerScreen, TimerScreen, BookPlayer, BookTrack, BookGenre, BookGenreBooks, BookNew, LoyalBooksParser, \
+    PodcastsScreen, PodcastEpisodesScreen, PodcastPlayerScreen, AirplayPlayerScreen, SpotifyConnectScreen, \
+    NetworkScreen, WiFiScreen, BluetoothScreen, KeyboardScreen, CollectionScreen, TopicScreen, TopicDetailScreen, \
+    LatinAbcScreen, CollectionPlayerScreen, CollectionBrowserScreen, InfoScreen, SwitchScreen, ImageViewer, \
+    BluetoothSinkScreen, YaStreamScreen, YaPlaylistPlayerScreen, YaSearchPlayerScreen, YaPlaylistScreen, \
+    YaSearchScreen, ArchiveFilesBrowserScreen, ArchiveItemsBrowserScreen, JukeboxBrowserScreen, ArchivePlayerScreen, \
+    BrowserScreen, RadioSearchScreen, RadioBrowserPlayerScreen, SearchByScreen, FavoritesScreen, \
+    CatalogScreen, CatalogBase, CatalogAlbumTracks, CatalogPlayerScreen, CatalogGenres, CatalogGenreArtists
 from ui.layout.borderlayout import BorderLayout
 from ui.screen.screen import PERCENT_TOP_HEIGHT, PERCENT_TITLE_FONT
 from util.config import *
 from util.util import Util, LABELS, PLAYER_RUNNING, PLAYER_SLEEPING
 from util.keys import *
-from ui.player.bookplayer import BookPlayer
-from ui.screen.booktrack import BookTrack
-from ui.screen.bookgenre import BookGenre
-from ui.screen.bookgenrebooks import BookGenreBooks
-from ui.screen.booknew import BookNew
-from websiteparser.loyalbooks.loyalbooksparser import LoyalBooksParser
 from websiteparser.loyalbooks.constants import *
 from websiteparser.siteparser import BOOK_URL, FILE_NAME
 from util.volumecontrol import VolumeControl
-from ui.screen.podcasts import PodcastsScreen
-from ui.screen.podcastepisodes import PodcastEpisodesScreen
-from ui.player.podcastplayer import PodcastPlayerScreen
-from ui.player.airplayplayer import AirplayPlayerScreen
-from ui.player.spotifyconnect import SpotifyConnectScreen
-from ui.screen.network import NetworkScreen
-from ui.screen.wifi import WiFiScreen
-from ui.screen.bluetooth import BluetoothScreen
-from ui.screen.keyboard import KeyboardScreen
-from ui.screen.collection import CollectionScreen
-from ui.screen.topic import TopicScreen
-from ui.screen.topicdetail import TopicDetailScreen
-from ui.screen.latinabc import LatinAbcScreen
-from ui.screen.collectionplayer import CollectionPlayerScreen
-from ui.screen.collectionbrowser import CollectionBrowserScreen
-from ui.screen.info import InfoScreen
-from ui.screen.switch import SwitchScreen
-from ui.screen.imageviewer import ImageViewer
-from ui.player.bluetoothsink import BluetoothSinkScreen
-from ui.screen.yastream import YaStreamScreen
-from ui.player.yaplaylistplayer import YaPlaylistPlayerScreen
-from ui.player.yasearchplayer import YaSearchPlayerScreen
-from ui.browser.yaplaylist import YaPlaylistScreen
-from ui.browser.yasearch import YaSearchScreen
-from ui.browser.archivefiles import ArchiveFilesBrowserScreen
-from ui.browser.archiveitems import ArchiveItemsBrowserScreen
 from subprocess import Popen, check_output
-from ui.browser.jukebox import JukeboxBrowserScreen
-from ui.player.archiveplayer import ArchivePlayerScreen
 from util.fileutil import FILE_PLAYLIST
-from ui.browser.browser import BrowserScreen
-from ui.browser.search import RadioSearchScreen
-from ui.player.radiobrowserplayer import RadioBrowserPlayerScreen
-from ui.screen.searchby import SearchByScreen
-from ui.browser.favorites import FavoritesScreen
-from ui.screen.catalog import CatalogScreen
-from ui.browser.catalogbase import CatalogBase
-from ui.browser.catalogalbumtracks import CatalogAlbumTracks
-from ui.player.catalogplayer import CatalogPlayerScreen
-from ui.browser.cataloggenres import CatalogGenres
-from ui.browser.cataloggenreartists import CatalogGenreArtists
 from util.serviceutil import SERVICE_QOBUZ, SERVICE_DEEZER, SERVICE_SPOTIFY
+from util.startuptimer import StartupTimer
+from ui.registry import get_load_times
 
 class Peppy(object):
     """ Main class """
@@ -110,10 +65,15 @@ class Peppy(object):
     def __init__(self):
         """ Initializer """
 
+        self.startup_timer = StartupTimer(STARTUP_TIME)
+        self.startup_timer.phase("imports")
         self.util = Util()
         self.config = self.util.config
+        self.startup_timer.phase("config and display")
         self.util.connected_to_internet = self.check_internet_connectivity()
+        self.startup_timer.phase("internet check")
         self.util.init_utilities()
+        self.startup_timer.phase("utilities")
         
         self.use_web = self.config[USAGE][USE_WEB]
         self.players = {}
@@ -129,6 +89,7 @@ class Peppy(object):
                     self.voice_assistant.start()
                 except Exception as e:
                     logging.debug(e)
+        self.startup_timer.phase("voice assistant")
 
         self.player_screens = {
             KEY_PLAY_SITE: self.go_site_playback,
@@ -186,6 +147,7 @@ class Peppy(object):
         s = self.config[SCRIPTS][SCRIPT_PLAYER_START]
         if s != None and len(s.strip()) != 0:
             self.util.run_script(s)
+        self.startup_timer.phase("devices")
         
         layout = BorderLayout(self.util.screen_rect)
         layout.set_percent_constraints(PERCENT_TOP_HEIGHT, PERCENT_TOP_HEIGHT, 0, 0)
@@ -207,12 +169,10 @@ class Peppy(object):
             except Exception as e:
                 logging.debug(e)
                 self.use_web = False
+        self.startup_timer.phase("web server")
 
         self.screensaver_dispatcher = ScreensaverDispatcher(self.util, self.web_server)
-        
-        about = AboutScreen(self.util)
-        about.add_listener(self.go_home)
-        self.screens = {KEY_ABOUT : about}
+        self.screens = {}
         self.current_player_screen = None
         self.initial_player_name = self.config[AUDIO][PLAYER_NAME]
         self.current_audio_file = None
@@ -225,6 +185,7 @@ class Peppy(object):
             if self.config[USAGE][USE_VU_METER]:
                 self.util.load_screensaver(VUMETER)
             self.start_audio()        
+        self.startup_timer.phase("player start")
                 
         if self.use_web:
             self.screensaver_dispatcher.add_start_listener(self.web_server.start_screensaver_to_json)
@@ -233,6 +194,13 @@ class Peppy(object):
         self.event_dispatcher = EventDispatcher(self.screensaver_dispatcher, self.util, self.volume_control)        
         self.current_screen = None
         self.current_mode = self.config[CURRENT][MODE]
+        self.startup_timer.phase("event dispatcher")
+        self.go_initial_screen()
+        self.startup_timer.phase("initial screen")
+        self.startup_timer.report(get_load_times())
+
+    def go_initial_screen(self):
+        """ Go to the screen defined by the current mode """
 
         disabled_modes = self.util.get_disabled_modes()
         if self.current_mode in disabled_modes:
@@ -544,7 +512,7 @@ class Peppy(object):
         if self.screensaver_dispatcher.saver_running:
             self.screensaver_dispatcher.cancel_screensaver()
 
-        self.screensaver_dispatcher.current_delay = 0      
+        self.screensaver_dispatcher.set_delay(0)
 
         if self.config[USAGE][USE_CLOCK_SCREENSAVER_IN_TIMER]:
             self.screensaver_dispatcher.start_screensaver(CLOCK)
@@ -568,8 +536,7 @@ class Peppy(object):
         self.player_state = PLAYER_RUNNING
         self.player.resume_playback()
         self.set_current_screen(self.previous_screen_name)
-        self.screensaver_dispatcher.delay_counter = 0
-        self.screensaver_dispatcher.current_delay = self.screensaver_dispatcher.get_delay()
+        self.screensaver_dispatcher.set_delay(self.screensaver_dispatcher.get_delay())
         if self.use_web:
             self.web_server.redraw_web_ui()
 
@@ -3253,10 +3220,24 @@ class Peppy(object):
         :param state: button state
         """
         self.exit_current_screen()
+        self.get_about_screen()
         self.set_current_screen(KEY_ABOUT)
         if self.use_web:
             self.add_screen_observers(self.screens[KEY_ABOUT])
     
+    def get_about_screen(self):
+        """ Get About Screen, create it on the first call
+
+        :return: About Screen
+        """
+        try:
+            return self.screens[KEY_ABOUT]
+        except KeyError:
+            about = AboutScreen(self.util)
+            about.add_listener(self.go_home)
+            self.screens[KEY_ABOUT] = about
+            return about
+
     def go_black(self):
         """ Go to the Black Screen for sleeping mode
         
@@ -0,0 +1,212 @@
+# Copyright 2016-2024 Peppy Player peppy.player@gmail.com
+# 
+# This file is part of Peppy Player.
+# 
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# 
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from threading import Thread, RLock, current_thread
+from queue import Queue, Full, Empty
+from concurrent.futures import Future, TimeoutError
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 64
+
+class CommandExecutor(object):
+    """ Bounded pool of worker threads which executes short player commands.
+    Replaces spawning new thread for each command.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, name="command"):
+        """ Initializer
+
+        :param workers: maximum number of worker threads
+        :param queue_size: maximum number of pending commands
+        :param name: worker threads name prefix
+        """
+        self.max_workers = workers
+        self.name = name
+        self.queue = Queue(maxsize=queue_size)
+        self.lock = RLock()
+        self.workers = []
+        self.pending = {}
+        self.running = True
+        self.active = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_queue_depth = 0
+
+    def submit(self, target, args=(), key=None):
+        """ Put command into the queue
+
+        :param target: function to execute
+        :param args: function arguments
+        :param key: command key. Pending command with the same key will be cancelled
+        :return: future object or None if queue is full or executor was stopped
+        """
+        future = Future()
+
+        with self.lock:
+            if not self.running:
+                return None
+
+            if key != None:
+                previous = self.pending.get(key, None)
+                if previous != None and previous.cancel():
+                    self.cancelled += 1
+                self.pending[key] = future
+
+            try:
+                self.queue.put_nowait((future, target, args, key))
+            except Full:
+                self.rejected += 1
+                if key != None and self.pending.get(key, None) == future:
+                    del self.pending[key]
+                logging.debug("Command queue is full, command rejected")
+                return None
+
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+            self.start_worker()
+
+        return future
+
+    def call(self, target, args=(), timeout=None, key=None):
+        """ Execute command and wait for result
+
+        :param target: function to execute
+        :param args: function arguments
+        :param timeout: timeout in seconds
+        :param key: command key
+        :return: function result or None if command failed, was cancelled or timed out
+        """
+        if current_thread() in self.workers:
+            return target(*args)
+
+        future = self.submit(target, args, key)
+        if future == None:
+            return None
+
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            with self.lock:
+                self.timed_out += 1
+            if future.cancel():
+                with self.lock:
+                    self.cancelled += 1
+            logging.debug("Command timeout")
+        except Exception as e:
+            logging.debug(e)
+        return None
+
+    def cancel(self, key):
+        """ Cancel pending command
+
+        :param key: command key
+        :return: True - command was cancelled, False - command is running/finished or not found
+        """
+        with self.lock:
+            future = self.pending.pop(key, None)
+            if future != None and future.cancel():
+                self.cancelled += 1
+                return True
+        return False
+
+    def start_worker(self):
+        """ Start new worker thread if all workers are busy and limit was not reached """
+
+        if len(self.workers) >= self.max_workers or self.active + self.queue.qsize() <= len(self.workers):
+            return
+
+        worker = Thread(target=self.worker_loop, name=self.name + "-" + str(len(self.workers)), daemon=True)
+        self.workers.append(worker)
+        worker.start()
+
+    def worker_loop(self):
+        """ Worker thread loop """
+
+        while True:
+            try:
+                item = self.queue.get(timeout=1.0)
+            except Empty:
+                if not self.running:
+                    break
+                continue
+
+            if item == None:
+                break
+
+            future, target, args, key = item
+
+            with self.lock:
+                if key != None and self.pending.get(key, None) == future:
+                    del self.pending[key]
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self.active += 1
+
+            try:
+                future.set_result(target(*args))
+                with self.lock:
+                    self.completed += 1
+            except Exception as e:
+                logging.debug(e)
+                future.set_exception(e)
+                with self.lock:
+                    self.failed += 1
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+        with self.lock:
+            if current_thread() in self.workers:
+                self.workers.remove(current_thread())
+
+    def get_metrics(self):
+        """ Return executor metrics
+
+        :return: dictionary with metrics
+        """
+        with self.lock:
+            return {
+                "workers": len(self.workers),
+                "active": self.active,
+                "queue_depth": self.queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out
+            }
+
+    def shutdown(self):
+        """ Stop accepting new commands and stop worker threads """
+
+        with self.lock:
+            self.running = False
+            for _ in self.workers:
+                try:
+                    self.queue.put_nowait(None)
+                except Full:
+                    pass
+
+command_executor = CommandExecutor()
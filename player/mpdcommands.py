@@ -29,6 +29,9 @@ CLEAR = "clear"
 ADD = "add "
 STATUS = "status"
 IDLE = "idle"
+NOIDLE = "noidle"
+MIXER = "mixer"
+OPTIONS = "options"
 PLAYER = "player"
 CURRENT = "current"
 CURRENT_SONG = "currentsong"
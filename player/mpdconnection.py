@@ -19,15 +19,13 @@ import socket
 import time
 import logging
 
-from threading import RLock
-from player.commandthread import CommandThread
+from threading import RLock, Thread, Event
+from player.commandexecutor import command_executor
 
 class MpdConnection(object):
     """ Handles TCP/IP communication with MPD server """
-    
-    lock = RLock()
         
-    def __init__(self, host, port, reader_flags='rb', writer_flags='w', encoding='utf-8'):
+    def __init__(self, host, port, reader_flags='rb', writer_flags='w', encoding='utf-8', persistent=False, idle=False):
         """ Initializer
         
         :param host: host where MPD process is running
@@ -35,18 +33,36 @@ class MpdConnection(object):
         :param reader_flags: flags used for creating reader
         :param writer_flags: flags used for creating writer
         :param encoding: encoding used to encode/decode messages
+        :param persistent: True - keep connection open between commands, False - connect for each command
+        :param idle: True - connection is used for idle command, it doesn't use command timeout and keepalive
         """
         self.host = host
         self.port = port
         self.reader_flags = reader_flags
         self.writer_flags = writer_flags
         self.character_encoding = encoding
+        self.persistent = persistent
+        self.idle_connection = idle
+        self.idling = False
+        self.lock = RLock()
         self.OK = "OK"
+        self.LIST_OK = "list_OK"
+        self.ACK = "ACK"
+        self.PING = "ping"
+        self.IDLE = "idle"
+        self.NOIDLE = "noidle"
+        self.CHANGED = "changed: "
+        self.COMMAND_LIST_OK_BEGIN = "command_list_ok_begin"
+        self.COMMAND_LIST_END = "command_list_end"
         self.socket = None
         self.reader = None
         self.writer = None
         self.IDLE_COMMAND_TIMEOUT = 3600.0
         self.COMMAND_TIMEOUT = 5.0 # command thread timeout in seconds
+        self.KEEPALIVE_INTERVAL = 30.0 # should be less than connection_timeout in mpd.conf (default 60 seconds)
+        self.last_command_time = 0
+        self.keepalive_stop = Event()
+        self.keepalive_thread = None
 
     def connect(self):
         """ Connect to MPD process' socket. It's making 3 attempts maximum with 2 seconds delay. """ 
@@ -65,6 +81,9 @@ class MpdConnection(object):
                     time.sleep(delay)
                 else:
                     attempt = attempts
+
+            if self.persistent and not self.idle_connection and self.is_connected():
+                self.start_keepalive()
     
     def try_to_connect(self):
         """ Connect to MPD socket """
@@ -73,15 +92,27 @@ class MpdConnection(object):
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
             self.socket.connect((self.host, self.port))
-            self.socket.settimeout(self.IDLE_COMMAND_TIMEOUT)
+            if self.persistent:
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.persistent and not self.idle_connection:
+                self.socket.settimeout(self.COMMAND_TIMEOUT)
+            else:
+                self.socket.settimeout(self.IDLE_COMMAND_TIMEOUT)
             self.reader = self.socket.makefile(self.reader_flags, encoding=self.character_encoding)
             self.writer = self.socket.makefile(self.writer_flags, encoding=self.character_encoding)
             self.read_line()
+            self.last_command_time = time.time()
         except:
-            if self.socket: 
-                self.disconnect()
-                return False
+            self.disconnect()
+            return False
         return True
+
+    def is_connected(self):
+        """ Check if connection is open
+
+        :return: True - connected, False - not connected
+        """
+        return self.socket != None and self.reader != None and self.writer != None
     
     def disconnect(self):
         """ Disconnect from MPD """
@@ -93,6 +124,41 @@ class MpdConnection(object):
                 if self.socket: self.socket.close()
             except:
                 pass
+            self.reader = None
+            self.writer = None
+            self.socket = None
+
+    def close(self):
+        """ Stop keepalive thread and disconnect from MPD """
+
+        self.stop_keepalive()
+        self.disconnect()
+
+    def start_keepalive(self):
+        """ Start thread which pings MPD to prevent closing idle persistent connection by server """
+
+        if self.keepalive_thread and self.keepalive_thread.is_alive():
+            return
+
+        self.keepalive_stop.clear()
+        self.keepalive_thread = Thread(target=self.keepalive, daemon=True)
+        self.keepalive_thread.start()
+
+    def stop_keepalive(self):
+        """ Stop keepalive thread """
+
+        self.keepalive_stop.set()
+
+    def keepalive(self):
+        """ Keepalive loop. Sends ping command if there were no other commands during keepalive interval """
+
+        while not self.keepalive_stop.wait(self.KEEPALIVE_INTERVAL / 2):
+            if time.time() - self.last_command_time < self.KEEPALIVE_INTERVAL:
+                continue
+            with self.lock:
+                if not self.is_connected():
+                    continue
+                self.execute(self.PING)
     
     def write(self, line):
         """ Send the message to MPD
@@ -102,7 +168,7 @@ class MpdConnection(object):
         with self.lock:        
             if self.writer == None: return
             try:
-                self.writer.write(line + "\n")
+                self.writer.write(line.rstrip("\n") + "\n")
                 self.writer.flush()
             except:
                 pass
@@ -126,75 +192,241 @@ class MpdConnection(object):
     
             return line
 
-    def get_multiline_result(self, cmd):
-        """ Send command to MPD and read the output messages until it's terminated by OK
-         
+    def read_response(self, terminators):
+        """ Read response lines until one of the terminator lines or error line
+
+        :param terminators: list of lines terminating response
+        :return: list of response lines, the last line is terminator or error
+        """
+        r = []
+        while True:
+            line = self.reader.readline()
+            if not line:
+                raise ConnectionError("MPD closed connection")
+            if not isinstance(line, str):
+                line = line.decode(self.character_encoding)
+            line = line.rstrip()
+            r.append(line)
+            if line in terminators or line.startswith(self.ACK):
+                return r
+
+    def send_request(self, request, responses):
+        """ Send request to MPD using persistent connection and read responses.
+        Reconnects and repeats request once if connection was lost.
+
+        :param request: request string, can consist of several lines
+        :param responses: number of responses expected for this request
+        :return: list of responses, each response is the list of lines including terminator
+        """
+        with self.lock:
+            for attempt in range(2):
+                if not self.is_connected():
+                    self.connect()
+                    if not self.is_connected():
+                        return []
+                try:
+                    self.writer.write(request.rstrip("\n") + "\n")
+                    self.writer.flush()
+                    result = []
+                    for _ in range(responses):
+                        r = self.read_response([self.OK, self.LIST_OK])
+                        result.append(r)
+                        if r[-1] == self.OK or r[-1].startswith(self.ACK):
+                            break
+                    if result[-1][-1] != self.OK and not result[-1][-1].startswith(self.ACK):
+                        self.read_response([self.OK])
+                    self.last_command_time = time.time()
+                    return result
+                except Exception as e:
+                    logging.debug("MPD connection error: " + str(e))
+                    self.disconnect()
+            return []
+
+    def idle(self, subsystems=[]):
+        """ Send idle command and wait for changes in MPD subsystems. This is blocking call
+        which can be interrupted by calling noidle method from another thread.
+
+        :param subsystems: list of subsystems to listen, all subsystems if empty
+        :return: list of changed subsystems, empty list if interrupted by noidle, None if connection failed
+        """
+        with self.lock:
+            if not self.is_connected():
+                self.connect()
+                if not self.is_connected():
+                    return None
+            try:
+                cmd = self.IDLE
+                if subsystems:
+                    cmd += " " + " ".join(subsystems)
+                self.writer.write(cmd + "\n")
+                self.writer.flush()
+                self.idling = True
+            except Exception as e:
+                logging.debug("MPD connection error: " + str(e))
+                self.disconnect()
+                return None
+
+        try:
+            r = self.read_response([self.OK]) # blocking call, it's not locked to allow sending noidle
+        except Exception as e:
+            logging.debug("MPD idle connection error: " + str(e))
+            with self.lock:
+                self.idling = False
+                self.disconnect()
+            return None
+
+        with self.lock:
+            self.idling = False
+            self.last_command_time = time.time()
+
+        return [line[len(self.CHANGED):] for line in r if line.startswith(self.CHANGED)]
+
+    def noidle(self):
+        """ Interrupt pending idle command """
+
+        with self.lock:
+            if not self.idling or self.writer == None:
+                return
+            try:
+                self.writer.write(self.NOIDLE + "\n")
+                self.writer.flush()
+            except:
+                pass
+            self.idling = False
+
+    def execute(self, cmd):
+        """ Send one command and read its output
+
         :param cmd: command for MPD
-        :return: list of lines returned after command
-        """  
+        :return: list of lines returned after command including terminator line
+        """
+        if self.persistent:
+            result = self.send_request(cmd, 1)
+            if result:
+                return result[0]
+            return []
+
         with self.lock:
-            r = []        
+            r = []
             self.connect()
             self.write(cmd)
             line = self.read_line()
-            if not line:
-                return r
-            while line and line != self.OK:
+            while line:
                 r.append(line)
+                if line == self.OK or line.startswith(self.ACK):
+                    break
                 line = self.read_line()
-            self.disconnect()            
+            self.disconnect()
             return r
 
+    def command_list(self, cmds):
+        """ Send the list of commands in one batch using command_list_ok_begin
+
+        :param cmds: list of commands
+        :return: list of outputs, one list of lines per command. Commands after failed one have no output.
+        """
+        request = self.COMMAND_LIST_OK_BEGIN + "\n"
+        for cmd in cmds:
+            request += cmd.rstrip("\n") + "\n"
+        request += self.COMMAND_LIST_END
+
+        if self.persistent:
+            result = self.send_request(request, len(cmds))
+        else:
+            with self.lock:
+                result = []
+                self.connect()
+                self.write(request)
+                try:
+                    for _ in range(len(cmds)):
+                        r = self.read_response([self.OK, self.LIST_OK])
+                        result.append(r)
+                        if r[-1] != self.LIST_OK:
+                            break
+                except Exception as e:
+                    logging.debug(e)
+                self.disconnect()
+
+        outputs = []
+        for r in result:
+            if r and (r[-1] == self.OK or r[-1] == self.LIST_OK):
+                outputs.append(r[:-1])
+            else:
+                if r: logging.debug("MPD error: " + r[-1])
+                break
+        return outputs
+
+    def get_multiline_result(self, cmd):
+        """ Send command to MPD and read the output messages until it's terminated by OK
+         
+        :param cmd: command for MPD
+        :return: list of lines returned after command
+        """  
+        r = self.execute(cmd)
+        if r and (r[-1] == self.OK or r[-1].startswith(self.ACK)):
+            return r[:-1]
+        return r
+
+    def parse_dictionary(self, lines):
+        """ Parse lines returned by MPD command
+
+        :param lines: list of 'key: value' lines
+        :return: dictionary representing lines
+        """
+        d = {}
+        if lines == None:
+            return d
+
+        for line in lines:
+            index = line.find(": ")
+            key = line[0:index]
+            if key.endswith(":file"):
+                key = key[0 : key.strip().find(":file")]
+            value = line[index + 1:]
+            d[key.rstrip()] = value.rstrip().strip()
+        return d
+
     def read_dictionary(self, cmd):
         """ Call multiline result method and parse the list of returned lines
          
         :param cmd: command for MPD
         :return: dictionary representing MPD process output for the specified input command
         """        
-        ct = CommandThread(target=self.get_multiline_result, args=[cmd])
-        ct.start()
-        r = ct.join(self.COMMAND_TIMEOUT)
-        
-        d = {}
-        if r == None:
-            return d
-        
-        with self.lock:
-            for line in r:
-                index = line.find(": ")
-                key = line[0:index]
-                if key.endswith(":file"):
-                    key = key[0 : key.strip().find(":file")]
-                value = line[index + 1:]
-                d[key.rstrip()] = value.rstrip().strip()
-        return d        
+        r = command_executor.call(self.get_multiline_result, [cmd], self.COMMAND_TIMEOUT)
+        return self.parse_dictionary(r)
+
+    def read_dictionaries(self, cmds):
+        """ Send commands in one batch and parse outputs
+
+        :param cmds: list of commands
+        :return: list of dictionaries, one per command. Empty dictionary if command failed
+        """
+        r = command_executor.call(self.command_list, [cmds], self.COMMAND_TIMEOUT) or []
+        return [self.parse_dictionary(r[i]) if i < len(r) else {} for i in range(len(cmds))]
 
     def command_method(self, name):
         """ Send command to mpd process and read one line output.
         
-        Connects and disconnects to/from mpd server to avoid mpd client
+        Persistent connection is kept open and pinged to avoid mpd client
         connection timeout - default 60 seconds (property connection_timeout
-        in mpd.conf)
+        in mpd.conf). Non-persistent connection connects and disconnects
+        for each command.
         
         :param name: command name
         :return: command result
         """        
-        with self.lock:
-            self.connect()
-            self.write(name)
-            logging.debug("command: " + name)
-            line = self.read_line()
-            if not isinstance(line, str):
-                line = line.decode("utf-8")
-            self.disconnect()
-            logging.debug("return: " + str(line))
-            return line
+        logging.debug("command: " + name)
+        r = self.execute(name)
+        line = None
+        if r:
+            line = r[0]
+        logging.debug("return: " + str(line))
+        return line
     
     def command(self, name):
-        """ Start new command thread
+        """ Send command to mpd process
         
         :param name: command name
         """
         self.command_method(name)        
         return ""
-    
\ No newline at end of file
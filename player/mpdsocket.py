@@ -23,8 +23,9 @@ import urllib
 
 from player.baseplayer import BasePlayer
 from player.mpdconnection import MpdConnection
+from player.commandexecutor import CommandExecutor
 from player.mpdcommands import CLEAR, ADD, PLAY, STOP, PAUSE, RESUME, \
-    SET_VOLUME, GET_VOLUME, MUTE_2, STATUS, CURRENT_SONG, IDLE, SEEKCUR, EOL, COMMAND_LIST_BEGIN, COMMAND_LIST_END, UPDATE
+    SET_VOLUME, GET_VOLUME, MUTE_2, STATUS, CURRENT_SONG, SEEKCUR, UPDATE, PLAYER, MIXER, OPTIONS
 from player.player import Player
 from util.fileutil import FILE_PLAYLIST, FILE_AUDIO
 from util.config import RADIO, AUDIO_FILES, AUDIOBOOKS, STREAM, PODCASTS, ARCHIVE, YA_STREAM, COLLECTION
@@ -41,10 +42,12 @@ class Mpdsocket(BasePlayer):
         self.muted = False
         self.playing = True
         self.conn = None
+        self.idle_conn = None
         self.dont_parse_track_name = False
         self.current_volume_level = "-1"
         self.current_playlist_url = None
         self.current_file_url = None
+        self.end_of_track_executor = CommandExecutor(workers=1, name="end-of-track")
     
     def set_proxy(self, proxy_process, proxy=None):
         """ mpd socket client doesn't use proxy """
@@ -54,66 +57,76 @@ class Mpdsocket(BasePlayer):
     def start_client(self):
         """ Start client thread """
         
-        self.conn = MpdConnection(self.host, self.port)
+        self.conn = MpdConnection(self.host, self.port, persistent=True)
         self.conn.connect()
         thread = threading.Thread(target=self.mpd_event_listener)
         thread.start()
-        self.conn.command(UPDATE + EOL)
+        self.conn.command(UPDATE)
 
     def stop_client(self):
         """ Stop thread """
 
         with self.lock:
             self.playing = False
+            if self.conn:
+                self.conn.close()
+            if self.idle_conn:
+                self.idle_conn.noidle()
        
     def mpd_event_listener(self):
-        """ Starts the loop for listening MPD events """
-        
+        """ Starts the loop for listening MPD events using one persistent idle connection.
+        Status and current song are fetched in one batch on the same connection
+        to avoid blocking the command connection.
+        """
+        self.idle_conn = MpdConnection(self.host, self.port, persistent=True, idle=True)
+
         while self.playing:
-            c = MpdConnection(self.host, self.port, reader_flags='r', encoding=None)
-            c.connect()
+            subsystems = self.idle_conn.idle([PLAYER, MIXER, OPTIONS])
 
-            if not c.writer:
+            if subsystems == None:
+                time.sleep(1)
                 continue
-            
-            c.writer.write(IDLE + "\n")
-            c.writer.flush()
-            
-            line = None
-            try:        
-                line = c.reader.readline()  # blocking line
-                logging.debug("line from idle: " + line) 
-            except Exception as e:
-                logging.debug(e)
-            
-            if line and "mixer" in line:
-                volume = self.get_volume()
-                self.notify_volume_listeners(volume)
+
+            if not subsystems or not self.playing:
                 continue
-            
-            self.dispatch_callback(line)
-            c.disconnect()
+
+            logging.debug("changed subsystems: " + str(subsystems))
+            status, current = self.idle_conn.read_dictionaries([STATUS, CURRENT_SONG])
+
+            if MIXER in subsystems:
+                self.notify_volume_listeners(self.get_volume_from_status(status))
+
+            if [s for s in subsystems if s != MIXER]:
+                self.dispatch_callback(subsystems, status, current)
+
+        self.idle_conn.close()
                 
-    def dispatch_callback(self, line):
+    def dispatch_callback(self, subsystems, status=None, current=None):
         """ Callback dispatcher
         
-        :line: line from idle command
+        :param subsystems: list of changed subsystems reported by idle command
+        :param status: status dictionary, it will be requested if not provided
+        :param current: current song dictionary, it will be requested if not provided
         """
         streams = [RADIO, STREAM]
         timed_streams = [AUDIOBOOKS, PODCASTS, ARCHIVE, YA_STREAM]
         audio_files = [AUDIO_FILES, COLLECTION]
 
+        if status == None or current == None:
+            status, current = self.status_and_current()
+
         if self.player_mode in streams:
-            self.handle_radio_callback()
+            self.handle_radio_callback(current)
         elif self.player_mode in audio_files:
-            self.handle_audiofiles_callback()
+            self.handle_audiofiles_callback(status, current)
         elif self.player_mode in timed_streams:
-            self.handle_audiobooks_callback(line)
+            self.handle_audiobooks_callback(subsystems, status, current)
     
-    def handle_radio_callback(self):
-        """ Radio callback handler """
-        
-        current = self.current()
+    def handle_radio_callback(self, current):
+        """ Radio callback handler
+
+        :param current: current song dictionary
+        """
         current_title = self.util.get_dictionary_value(current, "Title")
         if current_title == None:
             return
@@ -124,11 +137,12 @@ class Mpdsocket(BasePlayer):
         current["source"] = "player"
         self.notify_player_listeners(current)        
 
-    def handle_audiofiles_callback(self):
-        """ Audiofiles callback handler """
-        
-        current = self.current()
-        status = self.status()
+    def handle_audiofiles_callback(self, status, current):
+        """ Audiofiles callback handler
+
+        :param status: status dictionary
+        :param current: current song dictionary
+        """
         current_file = self.util.get_dictionary_value(current, "file")
         current_title = self.util.get_dictionary_value(current, "Title")
         current["current_track_id"] = self.util.get_dictionary_value(current, "Track")
@@ -157,17 +171,17 @@ class Mpdsocket(BasePlayer):
             current["file_name"] = current_file[current_file.rfind("/") + 1:]
             self.notify_player_listeners(current)
     
-    def handle_audiobooks_callback(self, line):
+    def handle_audiobooks_callback(self, subsystems, status, current):
         """ Audiobooks callback handler
         
-        :line: line from idle command
+        :param subsystems: list of changed subsystems
+        :param status: status dictionary
+        :param current: current song dictionary
         """
-        current = self.current()
-        status = self.status()
         current_title = self.util.get_dictionary_value(current, "Title")
         current_file = self.util.get_dictionary_value(current, "file")
  
-        if current_title == None and current_file == None and "player" in line:
+        if current_title == None and current_file == None and PLAYER in subsystems:
             self.notify_end_of_track_listeners()
             return
          
@@ -236,12 +250,7 @@ class Mpdsocket(BasePlayer):
             url = self.encode_url(url)
             
         self.current_url = url
-        batch = COMMAND_LIST_BEGIN + EOL
-        batch += CLEAR + EOL
-        batch += ADD + url + EOL
-        batch += PLAY + '0' + EOL 
-        batch += COMMAND_LIST_END + EOL
-        self.conn.command(batch)
+        self.conn.command_list([CLEAR, ADD + url, PLAY + '0'])
         
         attempts = 100
         attempt = 0
@@ -255,7 +264,7 @@ class Mpdsocket(BasePlayer):
         if file_name and track_time != "0" and track_time != "0.0":
             time.sleep(0.05)
             self.seek(track_time)
-            self.dispatch_callback("player")
+            self.dispatch_callback([PLAYER])
             
         if getattr(state, "pause", None):
             self.pause()
@@ -330,19 +339,26 @@ class Mpdsocket(BasePlayer):
         :return: volume level or -1 if not available
         """
         with self.lock:
-            st = self.status()
-            volume = '-1'
-            
-            try:
-                volume = st[GET_VOLUME]
-            except KeyError:
-                pass
-            
-            if volume == "-1":
-                with self.lock:
-                    volume = self.current_volume_level
-            
-            return int(volume)
+            return self.get_volume_from_status(self.status())
+
+    def get_volume_from_status(self, status):
+        """  Return volume level from status dictionary
+
+        :param status: status dictionary
+        :return: volume level or current volume level if not available
+        """
+        volume = '-1'
+
+        try:
+            volume = status[GET_VOLUME]
+        except KeyError:
+            pass
+
+        if volume == "-1":
+            with self.lock:
+                volume = self.current_volume_level
+
+        return int(volume)
     
     def mute(self):
         """ Mute """
@@ -370,11 +386,24 @@ class Mpdsocket(BasePlayer):
         with self.lock:
             return self.conn.read_dictionary(CURRENT_SONG)
 
+    def status_and_current(self):
+        """ Return the results of the STATUS and CURRENT_SONG commands sent in one batch
+
+        :return: tuple (status, current song)
+        """
+        with self.lock:
+            status, current = self.conn.read_dictionaries([STATUS, CURRENT_SONG])
+            return (status, current)
+
     def shutdown(self):
         """ Shutdown the player """
         
         with self.lock:
             self.playing = False
+            if self.conn:
+                self.conn.close()
+            if self.idle_conn:
+                self.idle_conn.noidle()
         
     def get_current_track_time(self):
         """  Return current track time
@@ -408,13 +437,14 @@ class Mpdsocket(BasePlayer):
         return super().load_playlist(state, False)
     
     def notify_end_of_track_listeners(self):
-        """  Notify end of track listeners. Starts new thread to unblock player loop. """
+        """  Notify end of track listeners. Uses separate executor to unblock player loop.
+        The listeners switch tracks, that can take long time, so the shared command executor is not used.
+        """
         
-        thread = threading.Thread(target=self.handle_eof)
-        thread.start()
+        self.end_of_track_executor.submit(self.handle_eof)
             
     def handle_eof(self):
-        """  End of track notifier. Runs in separate thread. """ 
+        """  End of track notifier. Runs in end of track executor thread. """ 
         
         for listener in self.end_of_track_listeners:
             listener()
@@ -422,4 +452,4 @@ class Mpdsocket(BasePlayer):
     def update_mpd_database(self):
         """ Update database """
         
-        self.conn.command(UPDATE + EOL)
+        self.conn.command(UPDATE)
@@ -20,6 +20,7 @@ import urllib
 import math
 
 from player.baseplayer import BasePlayer
+from player.commandexecutor import command_executor
 from vlc import Meta, EventType, MediaStats
 from queue import Queue
 from util.fileutil import FILE_PLAYLIST, FILE_AUDIO
@@ -260,11 +261,10 @@ class Vlcclient(BasePlayer):
                 pass
             
             if self.player_volume_control and getattr(self.state, "volume", None) != None:
-                thread = Thread(target=self.volume_thread, args=[int(self.state.volume)])
-                thread.start()
+                command_executor.submit(self.volume_thread, [int(self.state.volume)], key="vlc.volume")
 
     def volume_thread(self, new_volume):
-        """ Volume thread to address delay in volume level in player """
+        """ Volume command to address delay in volume level in player """
 
         volume = self.get_volume()
         attempts = 20
@@ -297,11 +297,10 @@ class Vlcclient(BasePlayer):
         
         with self.lock:            
             msec = int(float(self.seek_time) * 1000)
-            t = Thread(target=self.seek_method, args=[msec])
-            t.start()
+            command_executor.submit(self.seek_method, [msec], key="vlc.seek")
 
     def seek_method(self, msec):
-        """ Seek track thread method
+        """ Seek track command method
 
         :param msec: milliseconds for new position
         """
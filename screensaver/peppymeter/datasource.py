@@ -15,7 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with PeppyMeter. If not, see <http://www.gnu.org/licenses/>.
 
-import os
 import math
 import time
 import statistics
@@ -25,6 +24,7 @@ from random import uniform
 from threading import Thread
 from configfileparser import *
 from util.config import VOLUME, PLAYER_SETTINGS
+from util.pipereader import get_pipe_reader
 from collections import deque
 
 SOURCE_CONSTANT = "constant"
@@ -65,18 +65,18 @@ class DataSource(object):
         self.v = 0
         self.step = self.config[STEP]
         self.pipe_size = 4
-        self.PIPE_BUFFER_SIZE = 1048576 # as defined for Raspberry OS in /proc/sys/fs/pipe-max-size
         self.rng = list(range(int(self.min), int(self.max_in_ui)))
         self.double_rng = self.rng
         self.double_rng.extend(range(int(self.max_in_ui) - 1, int(self.min), -1))
-        self.pipe = None
+        self.pipe_reader = None
+        self.reading_pipe = False
         if self.ds_type == SOURCE_PIPE:
+            self.pipe_reader = get_pipe_reader(self.pipe_name, self.pipe_size)
             thread = Thread(target=self.open_pipe)
             thread.start()
         self.previous_left = self.previous_right = self.previous_mono = 0.0
         self.run_flag = True
         self.polling_interval = self.config[POLLING_INTERVAL]
-        self.pipe_polling_inerval = self.polling_interval / 10
         self.prev_time = None
         self.data = ()
         self.http_data = ()
@@ -98,29 +98,16 @@ class DataSource(object):
     def open_pipe(self):
         """ Open named pipe """
 
-        try:            
-            logging.debug("opening pipe...")
-            self.pipe = os.open(self.pipe_name, os.O_RDONLY | os.O_NONBLOCK)
+        logging.debug("opening pipe...")
+        if self.pipe_reader.open():
             logging.debug("pipe opened")
-        except:
-            logging.debug("Cannot open named pipe: " + self.pipe_name)
-
-    def flush_pipe_buffer(self):
-        """ Flush data from the pipe """
-
-        if not self.pipe:
-            return
-
-        try:
-            os.read(self.pipe, self.PIPE_BUFFER_SIZE)
-        except Exception as e:
-            logging.debug(e)
 
     def start_data_source(self):
         """ Start data source thread. """ 
 
-        if self.ds_type == SOURCE_PIPE:
-            self.flush_pipe_buffer()
+        if self.pipe_reader and not self.reading_pipe:
+            self.pipe_reader.start()
+            self.reading_pipe = True
 
         self.run_flag = True
         thread = Thread(target=self.get_data)
@@ -130,6 +117,10 @@ class DataSource(object):
         """ Stop data source thread. """ 
                
         self.run_flag = False
+
+        if self.pipe_reader and self.reading_pipe:
+            self.pipe_reader.stop()
+            self.reading_pipe = False
     
     def get_current_data(self):
         """ Return current data """
@@ -236,21 +227,13 @@ class DataSource(object):
         return s
     
     def get_latest_pipe_data(self):
-        """ Read from the named pipe until it's empty """
-
-        latest_data = [0, 0, 0, 0]
-        data = None
+        """ Get the newest frame from the pipe reader """
 
-        while True:
-            try:
-                data = os.read(self.pipe, self.pipe_size)
-                if len(data) != 0:
-                    latest_data = [data[0], data[1], data[2], data[3]]
-                time.sleep(self.pipe_polling_inerval)
-            except:
-                break
+        data = self.pipe_reader.get_frame()
+        if data == None:
+            return [0, 0, 0, 0]
 
-        return latest_data
+        return data
 
     def get_http_value(self):
         """ Fetch HTTP value """
@@ -266,7 +249,7 @@ class DataSource(object):
         if volume_level == 0:
             volume_level = 1
         
-        if self.pipe == None:
+        if self.pipe_reader == None or not self.pipe_reader.is_open():
             return (left, right, mono)
         
         try:
@@ -25,26 +25,18 @@ from configfileparser import *
 class MeterFactory(object):
     """ Meter creation factory """
     
-    def __init__(self, util, meter_config, data_source, mono_needle_cache, mono_rect_cache, left_needle_cache, left_rect_cache, right_needle_cache, right_rect_cache):
+    def __init__(self, util, meter_config, data_source, needle_atlas):
         """ Initializer
         
         :param util: utility class
         :param meter_config: configuration dictionary
         :param data_source: the source of audio data
-        :param needle_cache: dictionary where key - meter name, value - list of needle sprites
-        :param mono_rect_cache: dictionary where key - meter name, value - list of mono needle sprite rectangles
-        :param left_rect_cache: dictionary where key - meter name, value - list of left needle sprite rectangles
-        :param right_rect_cache: dictionary where key - meter name, value - list of right needle sprite rectangles
+        :param needle_atlas: storage of needle sprites
         """
         self.util = util
         self.meter_config = meter_config
         self.data_source = data_source
-        self.mono_needle_cache = mono_needle_cache
-        self.mono_rect_cache = mono_rect_cache
-        self.left_needle_cache = left_needle_cache
-        self.left_rect_cache = left_rect_cache
-        self.right_needle_cache = right_needle_cache
-        self.right_rect_cache = right_rect_cache
+        self.needle_atlas = needle_atlas
         
     def create_meter(self):
         """ Dispatcher method """ 
@@ -144,7 +136,7 @@ class MeterFactory(object):
         config[NEEDLE_WIDTH] = w
         config[NEEDLE_HEIGHT] = h
         
-        factory = NeedleFactory(name, needle, config, self.mono_needle_cache, self.mono_rect_cache, self.left_needle_cache, self.left_rect_cache, self.right_needle_cache, self.right_rect_cache)
+        factory = NeedleFactory(name, needle, config, self.needle_atlas)
         
         if config[CHANNELS] == 2:
             meter.left_needle_sprites = factory.left_needle_sprites
@@ -0,0 +1,222 @@
+# Copyright 2016-2022 PeppyMeter peppy.player@gmail.com
+# 
+# This file is part of PeppyMeter.
+# 
+# PeppyMeter is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# 
+# PeppyMeter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with PeppyMeter. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import re
+import json
+import math
+import hashlib
+import logging
+import pygame
+
+from collections import OrderedDict
+
+FOLDER_CACHE = "cache"
+FOLDER_NEEDLES = "needles"
+EXT_ATLAS = ".png"
+EXT_RECTS = ".json"
+MAX_SPRITE_SETS = 6
+CHANNEL_MONO = "mono"
+CHANNEL_LEFT = "left"
+CHANNEL_RIGHT = "right"
+
+class NeedleAtlas(object):
+    """ Disk backed storage of needle sprites. All sprites of the needle are packed into one image.
+    The rectangles of the sprites in the packed image and their positions are stored in the Json file.
+    The files are created once for every meter and its angle configuration. Only the sprites of
+    the recently used meters are kept in memory.
+    """
+
+    def __init__(self, meter_folder, max_sprite_sets=MAX_SPRITE_SETS):
+        """ Initializer
+
+        :param meter_folder: meter folder for the current screen size
+        :param max_sprite_sets: the number of sprite sets kept in memory
+        """
+        self.folder = os.path.join(os.getcwd(), FOLDER_CACHE, FOLDER_NEEDLES, meter_folder)
+        self.max_sprite_sets = max_sprite_sets
+        self.sprite_sets = OrderedDict()
+
+    def get_key(self, image, distance, start_angle, stop_angle, steps_per_degree, flip):
+        """ Get the key of the sprite set
+
+        :param image: base needle image
+        :param distance: distance between rotation origin and image center
+        :param start_angle: start angle
+        :param stop_angle: stop angle
+        :param steps_per_degree: the number of sprites per degree
+        :param flip: True - flip indicator image across X axis
+
+        :return: hash of the needle image and angle configuration
+        """
+        h = hashlib.sha1(pygame.image.tostring(image, "RGBA"))
+        h.update(str((image.get_size(), distance, start_angle, stop_angle, steps_per_degree, flip)).encode())
+        return h.hexdigest()
+
+    def get_prefix(self, name, channel):
+        """ Get file name prefix of the meter atlas
+
+        :param name: meter name
+        :param channel: channel name
+
+        :return: file name prefix
+        """
+        return re.sub(r"[^\w\-]", "_", name + "." + channel) + "."
+
+    def get_sprites(self, name, channel, key, create_sprites):
+        """ Get needle sprites. The sprites are taken from memory, loaded from the atlas files or
+        created and stored in the atlas files.
+
+        :param name: meter name
+        :param channel: channel name (mono, left, right)
+        :param key: key of the sprite set
+        :param create_sprites: function which creates tuple (list of sprite images, list of sprite rectangles)
+
+        :return: tuple (list of sprite images, list of sprite rectangles)
+        """
+        sprites = self.sprite_sets.get(key)
+        if sprites:
+            self.sprite_sets.move_to_end(key)
+            return sprites
+
+        path = os.path.join(self.folder, self.get_prefix(name, channel) + key)
+        sprites = self.load_atlas(path)
+        if sprites == None:
+            images, rects = create_sprites()
+            sprites = self.save_atlas(path, images, rects)
+            if sprites == None:
+                sprites = (images, rects)
+
+        self.sprite_sets[key] = sprites
+        while len(self.sprite_sets) > self.max_sprite_sets:
+            self.sprite_sets.popitem(last=False)
+
+        return sprites
+
+    def load_atlas(self, path):
+        """ Load sprites from atlas files
+
+        :param path: atlas path without extension
+
+        :return: tuple (list of sprite images, list of sprite rectangles) or None if atlas not found
+        """
+        if not os.path.exists(path + EXT_RECTS) or not os.path.exists(path + EXT_ATLAS):
+            return None
+
+        try:
+            with open(path + EXT_RECTS) as f:
+                table = json.load(f)
+            atlas = self.convert(pygame.image.load(path + EXT_ATLAS))
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        return self.get_subsurfaces(atlas, table)
+
+    def save_atlas(self, path, images, rects):
+        """ Pack sprites into one image and save it with the table of rectangles
+
+        :param path: atlas path without extension
+        :param images: list of sprite images
+        :param rects: list of sprite rectangles
+
+        :return: tuple (list of packed sprite images, list of sprite rectangles) or None if atlas cannot be created
+        """
+        if not images:
+            return None
+
+        area = sum(i.get_width() * i.get_height() for i in images)
+        width = max(max(i.get_width() for i in images), int(math.sqrt(area)))
+        x = y = row_height = 0
+        table = []
+
+        for image, rect in zip(images, rects):
+            w, h = image.get_size()
+            if x + w > width:
+                x = 0
+                y += row_height
+                row_height = 0
+            table.append([x, y, w, h, rect.x, rect.y])
+            x += w
+            row_height = max(row_height, h)
+
+        atlas = pygame.Surface((width, y + row_height), pygame.SRCALPHA, 32)
+        for image, t in zip(images, table):
+            atlas.blit(image, (t[0], t[1]), special_flags=pygame.BLEND_RGBA_MAX)
+
+        try:
+            folder, prefix = os.path.split(path)
+            prefix = prefix[0 : prefix.rfind(".") + 1]
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            self.remove_atlas(folder, prefix)
+
+            tmp = path + ".tmp" + EXT_ATLAS
+            pygame.image.save(atlas, tmp)
+            os.replace(tmp, path + EXT_ATLAS)
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(table, f)
+            os.replace(tmp, path + EXT_RECTS)
+        except Exception as e:
+            logging.debug(e)
+
+        return self.get_subsurfaces(self.convert(atlas), table)
+
+    def remove_atlas(self, folder, prefix):
+        """ Remove outdated atlas files of the meter channel
+
+        :param folder: atlas folder
+        :param prefix: file name prefix
+        """
+        for f in os.listdir(folder):
+            if f.startswith(prefix):
+                try:
+                    os.remove(os.path.join(folder, f))
+                except Exception as e:
+                    logging.debug(e)
+
+    def convert(self, atlas):
+        """ Convert atlas to the display format if display is available
+
+        :param atlas: atlas image
+
+        :return: converted image
+        """
+        if pygame.display.get_surface() != None:
+            return atlas.convert_alpha()
+        return atlas
+
+    def get_subsurfaces(self, atlas, table):
+        """ Get sprites from atlas image
+
+        :param atlas: atlas image
+        :param table: list of sprite rectangles in atlas and sprite positions
+
+        :return: tuple (list of sprite images, list of sprite rectangles)
+        """
+        images = []
+        rects = []
+        for x, y, w, h, rx, ry in table:
+            images.append(atlas.subsurface((x, y, w, h)))
+            rects.append(pygame.Rect(rx, ry, w, h))
+        return (images, rects)
+
+    def clear(self):
+        """ Remove all sprites from memory """
+
+        self.sprite_sets.clear()
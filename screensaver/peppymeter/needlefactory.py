@@ -17,77 +17,57 @@
 
 import pygame
 from configfileparser import *
+from needleatlas import CHANNEL_MONO, CHANNEL_LEFT, CHANNEL_RIGHT
 
 class NeedleFactory(object):
     """ Factory to prepare needle sprites for circular animator """
     
-    def __init__(self, name, image, config, mono_needle_cache, mono_rect_cache, left_needle_cache, left_rect_cache, right_needle_cache, right_rect_cache):
+    def __init__(self, name, image, config, needle_atlas):
         """ Initializer
         
         :param name: meter name
         :param image: base needle image
         :param config: configuration dictionary
-        :param mono_needle_cache: dictionary where key - meter name, value - list of mono needle sprites
-        :param mono_rect_cache: dictionary where key - meter name, value - list of mono needle sprite rectangles
-        :param left_needle_cache: dictionary where key - meter name, value - list of left channel needle sprites
-        :param left_rect_cache: dictionary where key - meter name, value - list of left channel needle sprite rectangles
-        :param right_needle_cache: dictionary where key - meter name, value - list of right channel needle sprites
-        :param right_rect_cache: dictionary where key - meter name, value - list of right channel needle sprite rectangles
+        :param needle_atlas: storage of needle sprites
         """
+        self.name = name
         self.image = image
         self.config = config
+        self.needle_atlas = needle_atlas
         
         if config[CHANNELS] == 1:
-            self.mono_needle_sprites = self.get_cached_object(name, mono_needle_cache)
-            self.mono_needle_rects = self.get_cached_object(name, mono_rect_cache)
-
-            if len(self.mono_needle_sprites) != 0:
-                return
-
-            self.create_needle_sprites(self.mono_needle_sprites, self.mono_needle_rects, self.config[DISTANCE],
+            self.mono_needle_sprites, self.mono_needle_rects = self.get_needle_sprites(CHANNEL_MONO, self.config[DISTANCE],
                 self.config[START_ANGLE], self.config[STOP_ANGLE], False)
-            mono_needle_cache[name] = self.mono_needle_sprites
-            mono_rect_cache[name] = self.mono_needle_rects
         elif config[CHANNELS] == 2:
-            self.left_needle_sprites = self.get_cached_object(name, left_needle_cache)
-            self.right_needle_sprites = self.get_cached_object(name, right_needle_cache)
-            self.left_needle_rects = self.get_cached_object(name, left_rect_cache)
-            self.right_needle_rects = self.get_cached_object(name, right_rect_cache)
-
-            if len(self.left_needle_sprites) != 0:
-                return
-
-            self.create_needle_sprites(self.left_needle_sprites, self.left_needle_rects, self.config[DISTANCE],
+            self.left_needle_sprites, self.left_needle_rects = self.get_needle_sprites(CHANNEL_LEFT, self.config[DISTANCE],
                 self.config[LEFT_START_ANGLE], self.config[LEFT_STOP_ANGLE], self.config[LEFT_NEEDLE_FLIP])
 
             if config[LEFT_START_ANGLE] == config[RIGHT_START_ANGLE] and config[LEFT_STOP_ANGLE] == config[RIGHT_STOP_ANGLE]:
                 self.right_needle_sprites = self.left_needle_sprites
                 self.right_needle_rects = self.left_needle_rects
             else:
-                self.create_needle_sprites(self.right_needle_sprites, self.right_needle_rects, self.config[DISTANCE],
+                self.right_needle_sprites, self.right_needle_rects = self.get_needle_sprites(CHANNEL_RIGHT, self.config[DISTANCE],
                     self.config[RIGHT_START_ANGLE], self.config[RIGHT_STOP_ANGLE], self.config[RIGHT_NEEDLE_FLIP])
 
-            left_needle_cache[name] = self.left_needle_sprites
-            right_needle_cache[name] = self.right_needle_sprites
-            left_rect_cache[name] = self.left_needle_rects
-            right_rect_cache[name] = self.right_needle_rects
-
-    def get_cached_object(self, name, cache):
-        """ Get cached object
+    def get_needle_sprites(self, channel, distance, start_angle, stop_angle, flip):
+        """ Get needle sprites from atlas or create them
 
-        :param name: object name
-        :param cache: object cache
+        :param channel: channel name
+        :param distance: distance between rotation origin and image center
+        :param start_angle: start angle
+        :param stop_angle: stop angle
+        :param flip: True - flip indicator image across X axis
 
-        :return: object from cache or empty list otherwise
+        :return: tuple (list of sprite images, list of sprite rectangles)
         """
-        cached_object = list()
-
-        try:
-            cached_object = cache[name]
-        except:
-            pass
-
-        return cached_object
+        key = self.needle_atlas.get_key(self.image, distance, start_angle, stop_angle, self.config[STEPS_PER_DEGREE], flip)
+        def create_sprites():
+            images = []
+            rects = []
+            self.create_needle_sprites(images, rects, distance, start_angle, stop_angle, flip)
+            return (images, rects)
+
+        return self.needle_atlas.get_sprites(self.name, channel, key, create_sprites)
 
     def rotate_image(self, image, distance, angle):
         """ Rotate provided image by specified angle
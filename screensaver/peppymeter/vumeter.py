@@ -20,8 +20,10 @@ import copy
 
 from random import randrange
 from meterfactory import MeterFactory
+from needleatlas import NeedleAtlas
 from screensavermeter import ScreensaverMeter
-from configfileparser import METER, METER_NAMES, RANDOM_METER_INTERVAL, USE_CACHE, SCREEN_RECT, FRAME_RATE
+from configfileparser import METER, METER_NAMES, RANDOM_METER_INTERVAL, USE_CACHE, SCREEN_RECT, FRAME_RATE, \
+    SCREEN_INFO, METER_FOLDER
 
 class Vumeter(ScreensaverMeter):
     """ VU Meter plug-in. """
@@ -55,12 +57,7 @@ class Vumeter(ScreensaverMeter):
         self.current_volume = 100.0
         self.frames = 0
 
-        self.mono_needle_cache = {}
-        self.mono_rect_cache = {}
-        self.left_needle_cache = {}
-        self.left_rect_cache = {}
-        self.right_needle_cache = {}
-        self.right_rect_cache = {}
+        self.needle_atlas = NeedleAtlas(self.util.meter_config[SCREEN_INFO][METER_FOLDER])
     
     def get_meter(self):
         """ Creates meter using meter factory. """  
@@ -80,7 +77,7 @@ class Vumeter(ScreensaverMeter):
             self.util.meter_config[METER] = self.meter_names[self.list_meter_index]
             self.list_meter_index += 1
 
-        factory = MeterFactory(self.util, self.util.meter_config, self.data_source, self.mono_needle_cache, self.mono_rect_cache, self.left_needle_cache, self.left_rect_cache, self.right_needle_cache, self.right_rect_cache)
+        factory = MeterFactory(self.util, self.util.meter_config, self.data_source, self.needle_atlas)
         m = factory.create_meter()
 
         return m
@@ -121,23 +118,12 @@ class Vumeter(ScreensaverMeter):
             self.callback_stop(self.meter)
 
         if not self.util.meter_config[USE_CACHE]:
-            del self.mono_needle_cache
-            del self.mono_rect_cache
-            del self.left_needle_cache
-            del self.left_rect_cache
-            del self.right_needle_cache
-            del self.right_rect_cache
+            self.needle_atlas.clear()
             del self.meter
 
             if hasattr(self, "malloc_trim"):
                 self.malloc_trim()
 
-            self.mono_needle_cache = {}
-            self.mono_rect_cache = {}
-            self.left_needle_cache = {}
-            self.left_rect_cache = {}
-            self.right_needle_cache = {}
-            self.right_rect_cache = {}
             self.meter = None
 
     def restart(self):
@@ -140,7 +140,7 @@ class Pexels(Container, Screensaver):
 
         :return: tuple with image URL and Surface
         """
-        img = self.image_util.load_image_from_url(url)
+        img = self.image_util.load_image_from_url(url, use_cache=False) # random photos are rarely reused
 
         if img == None:
             return None
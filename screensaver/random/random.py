@@ -17,8 +17,11 @@
 
 from random import shuffle
 from screensaver.screensaver import Screensaver, PLUGIN_CONFIGURATION
+from ui.compositor import compositor
 from util.config import CLOCK, LOGO, SLIDESHOW, VUMETER, WEATHER, SPECTRUM, LYRICS, RANDOM, PEXELS, MONITOR, STOCK, \
-    HOROSCOPE, SCREEN_INFO, FRAME_RATE
+    HOROSCOPE
+
+TASK_RANDOM_REFRESH = "screensaver.random.refresh"
 
 class Random(Screensaver):
     """ Random screensaver plug-in. 
@@ -35,7 +38,6 @@ class Random(Screensaver):
         plugin_folder = type(self).__name__.lower() 
         Screensaver.__init__(self, self.name, util, plugin_folder)
         self.config = util.config
-        self.frame_rate = self.config[SCREEN_INFO][FRAME_RATE]
         
         self.current_image = None
         self.current_image_folder = None
@@ -57,7 +59,6 @@ class Random(Screensaver):
         self.saver_num = 0
         self.current_saver = None
         self.update_box = None
-        self.cycle_num = 0
     
     def start(self):
         """ Start screensaver """
@@ -67,9 +68,11 @@ class Random(Screensaver):
     def stop(self):
         """ Stop screensaver """
         
+        if self.scheduler:
+            self.scheduler.cancel(TASK_RANDOM_REFRESH)
+
         if self.current_saver != None:
             self.current_saver.stop()
-            self.cycle_num = 0
     
     def set_image(self, image):
         """ Set station image. 
@@ -111,20 +114,29 @@ class Random(Screensaver):
         """  Update screensaver """
 
         if self.current_saver != None:
-            if self.cycle_num == self.current_saver_update_period * self.frame_rate:
-                self.cycle_num = 0
-                return self.current_saver.refresh(init=True)
+            if self.current_saver_name == SPECTRUM:
+                return self.current_saver.refresh()
             else:
-                self.cycle_num += 1
-                if self.current_saver_name == SPECTRUM:
-                    return self.current_saver.refresh()
-                else:
-                    return self.current_saver.update()
+                return self.current_saver.update()
+
+    def schedule_refresh(self):
+        """ Schedule periodic refresh of the current saver with its update period """
+
+        if self.scheduler and self.current_saver_update_period:
+            p = self.current_saver_update_period
+            self.scheduler.schedule(TASK_RANDOM_REFRESH, p, self.refresh_current_saver, p)
+
+    def refresh_current_saver(self):
+        """ Scheduler task which refreshes the current saver """
+
+        if self.current_saver != None:
+            compositor.add(self.current_saver.refresh(init=True))
 
     def refresh(self, init=False):
         """ Draw screensaver """
         
         if self.current_saver != None and len(self.saver_names) == 1:
+            self.schedule_refresh()
             return
 
         a = None
@@ -152,7 +164,7 @@ class Random(Screensaver):
         
         self.current_saver.start()
         a = self.current_saver.refresh()
-        self.cycle_num = 0
+        self.schedule_refresh()
 
         if self.saver_num == len(self.saver_names) - 1:
             self.saver_num = 0
@@ -42,6 +42,7 @@ class Screensaver():
         self.plugin_config_file.read(path, encoding=UTF8)
         self.update_period = self.plugin_config_file.getint(PLUGIN_CONFIGURATION, UPDATE_PERIOD)
         self.has_exit_area = has_exit_area
+        self.scheduler = None
 
         bgr = util.config[BACKGROUND][SCREEN_BGR_COLOR]
         self.bg = util.get_background(name, bgr)
@@ -50,6 +51,13 @@ class Screensaver():
         self.bgr_key = self.bg[5]
         self.ready = True
         
+    def set_scheduler(self, scheduler):
+        """ Set scheduler of the main event loop. It can be used by plug-ins for timed tasks
+
+        :param scheduler: the scheduler
+        """
+        self.scheduler = scheduler
+
     def get_update_period(self):
         """ Return screensaver update period """
                       
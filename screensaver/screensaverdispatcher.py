@@ -21,6 +21,8 @@ import logging
 from ui.component import Component
 from ui.container import Container
 from ui.state import State
+from ui.compositor import compositor
+from screensaver.screensaver import Screensaver
 from util.keys import USER_EVENT_TYPE
 from util.config import *
 
@@ -28,6 +30,9 @@ DELAY_1 = 60
 DELAY_3 = 180
 DELAY_OFF = 0
 
+TASK_SCREENSAVER_DELAY = "screensaver.delay"
+TASK_SCREENSAVER_REFRESH = "screensaver.refresh"
+
 WEB_SAVERS = [CLOCK, LOGO, LYRICS, WEATHER, SLIDESHOW, PEXELS, MONITOR, STOCK, HOROSCOPE]
 
 class ScreensaverDispatcher(Component):
@@ -55,12 +60,48 @@ class ScreensaverDispatcher(Component):
         self.current_delay = self.get_delay()
         self.current_screen = None
         self.saver_running = False
-        self.one_cycle_period = 1000 / self.config[SCREEN_INFO][FRAME_RATE]
-        self.counter = 0
-        self.delay_counter = 0
+        self.frame_period = 1 / self.config[SCREEN_INFO][FRAME_RATE]
+        self.scheduler = None
         self.previous_saver = None
         self.internally_refreshed = [VUMETER, SPECTRUM]
 
+    def set_scheduler(self, scheduler):
+        """ Set scheduler of the main event loop and start the screensaver delay timer
+
+        :param scheduler: the scheduler
+        """
+        self.scheduler = scheduler
+        self.restart_delay()
+
+    def restart_delay(self):
+        """ Start counting the delay before the screensaver starts from the beginning """
+
+        if not self.scheduler:
+            return
+
+        if self.saver_running or self.current_delay == DELAY_OFF:
+            self.scheduler.cancel(TASK_SCREENSAVER_DELAY)
+        else:
+            self.scheduler.schedule(TASK_SCREENSAVER_DELAY, self.current_delay, self.start_delayed_screensaver)
+
+    def start_delayed_screensaver(self):
+        """ Start screensaver when the delay has expired """
+
+        if self.saver_running or self.current_delay == DELAY_OFF:
+            return
+
+        self.start_screensaver()
+
+    def get_refresh_period(self):
+        """ Get screensaver refresh period
+
+        :return: refresh period in seconds
+        """
+        if self.current_screensaver.name in self.internally_refreshed:
+            return self.frame_period
+        else:
+            return self.update_period
+
     def get_active_savers(self):
         """ Get all configured savers
 
@@ -144,6 +185,8 @@ class ScreensaverDispatcher(Component):
         self.current_screen.set_visible(False)
         self.current_screensaver.set_visible(True)
         self.current_screensaver.start_callback = self.notify_start_listeners
+        if isinstance(self.current_screensaver, Screensaver):
+            self.current_screensaver.set_scheduler(self.scheduler)
         self.current_screensaver.start()
 
         self.util.run_script(self.config[SCRIPTS][SCRIPT_SCREENSAVER_START])
@@ -153,10 +196,14 @@ class ScreensaverDispatcher(Component):
 
         a = self.current_screensaver.refresh(init=True)
         pygame.display.update(a)
-        self.counter = 0
-        self.delay_counter = 0    
         self.saver_running = True
 
+        if self.scheduler:
+            self.scheduler.cancel(TASK_SCREENSAVER_DELAY)
+            period = self.get_refresh_period()
+            if period:
+                self.scheduler.schedule(TASK_SCREENSAVER_REFRESH, period, self.refresh_screensaver, period)
+
         self.notify_start_listeners(s)
             
     def cancel_screensaver(self, event=None):
@@ -185,6 +232,11 @@ class ScreensaverDispatcher(Component):
         self.current_screen.set_visible(True)
         self.current_screen.clean_draw_update()
         self.saver_running = False
+
+        if self.scheduler:
+            self.scheduler.cancel(TASK_SCREENSAVER_REFRESH)
+        self.restart_delay()
+
         self.notify_stop_listeners(None)
 
         if self.previous_saver != None and self.config[SCREENSAVER][NAME] != self.previous_saver:
@@ -205,6 +257,8 @@ class ScreensaverDispatcher(Component):
             return
 
         self.update_period = self.current_screensaver.get_update_period()
+        if self.scheduler and self.saver_running:
+            self.scheduler.set_period(TASK_SCREENSAVER_REFRESH, self.get_refresh_period())
         self.current_screensaver.set_image(self.current_image)
         try:
             self.current_screensaver.set_util(self.util)
@@ -216,7 +270,15 @@ class ScreensaverDispatcher(Component):
         
         :param state: button state which contains new delay
         """
-        self.current_delay = self.get_delay()
+        self.set_delay(self.get_delay())
+
+    def set_delay(self, delay):
+        """ Set the delay before screensaver starts and restart the delay timer
+
+        :param delay: delay in seconds, 0 - screensaver is disabled
+        """
+        self.current_delay = delay
+        self.restart_delay()
         
     def get_screensaver(self):
         """ Return current screensaver """
@@ -251,39 +313,37 @@ class ScreensaverDispatcher(Component):
         return self.current_screensaver.update()
 
     def refresh(self):
-        """ Refresh screensaver """
-
-        a = None
+        """ Refresh screensaver. Called by the scheduler with the screensaver refresh period. 
+        
+        :return: the refreshed area
+        """
+        if not self.saver_running:
+            return None
 
-        if self.saver_running:
-            self.counter = self.counter + 1
+        if self.current_screensaver.name in self.internally_refreshed:
+            return self.current_screensaver.refresh()
 
-            if self.current_screensaver.name in self.internally_refreshed:
-                return self.current_screensaver.refresh()
+        a = self.current_screensaver.refresh()
+        if self.config[SCREENSAVER][NAME] in WEB_SAVERS:
+            s = State()
+            if isinstance(self.current_screensaver, Component):
+                screen_savers = [WEATHER, CLOCK, LYRICS, LOGO]
+                if self.current_screensaver.name in screen_savers:
+                    s.screen = self.current_screensaver
+                else:
+                    s.screen = Container(self.util)
+                    s.screen.components = [self.current_screensaver]
             else:
-                if int(self.counter * self.one_cycle_period) == self.update_period * 1000:
-                    a = self.current_screensaver.refresh()
-                    self.counter = 0
-                    if self.config[SCREENSAVER][NAME] in WEB_SAVERS:
-                        s = State()
-                        if isinstance(self.current_screensaver, Component):
-                            screen_savers = [WEATHER, CLOCK, LYRICS, LOGO]
-                            if self.current_screensaver.name in screen_savers:
-                                s.screen = self.current_screensaver
-                            else:
-                                s.screen = Container(self.util)
-                                s.screen.components = [self.current_screensaver]
-                        else:
-                            s.screen = self.current_screensaver
-                        self.notify_start_listeners(s)
-                    return a
-        else:
-            if self.current_delay == 0:
-                return a
-            self.delay_counter = self.delay_counter + 1
-            if int(self.delay_counter * self.one_cycle_period) == self.current_delay * 1000:
-                self.start_screensaver()
-        return a                
+                s.screen = self.current_screensaver
+            self.notify_start_listeners(s)
+        return a
+
+    def refresh_screensaver(self):
+        """ Scheduler task which refreshes screensaver and updates display """
+
+        area = self.refresh()
+        if area:
+            compositor.add(area)
         
     def change_image(self, state):
         """ Set new image on screensaver
@@ -343,7 +403,7 @@ class ScreensaverDispatcher(Component):
             if self.saver_running:               
                 self.cancel_screensaver(event)
             else:
-                self.delay_counter = 0                
+                self.restart_delay()
                 
     def add_start_listener(self, listener):
         """ Add start screensaver event listener
@@ -29,6 +29,12 @@ from itertools import cycle
 from screensaverspectrum import ScreensaverSpectrum
 from spectrumutil import SpectrumUtil
 from spectrumconfigparser import *
+from util.pipereader import get_pipe_reader
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class Spectrum(Container, ScreensaverSpectrum):
     """ Spectrum Analyzer screensaver plug-in. """
@@ -62,14 +68,15 @@ class Spectrum(Container, ScreensaverSpectrum):
 
         Container.__init__(self, util, bounding_box=util.screen_rect, background=self.bg[1], content=self.bg[2], image_filename=self.bg[3])
 
-        self.pipe = None
+        self.pipe_reader = None
         self.spectrum_configs = self.config_parser.spectrum_configs
         self.indexes = cycle(range(len(self.spectrum_configs)))
         self.index = next(self.indexes)
         self.test_iterator = 0
         self.init_spectrums()
         self.init_container()
-        self.values = [0] * self.config[SIZE]
+        self.topping_y = None
+        self.reset_values()
         self.update_boxes = [None] * self.config[SIZE]
 
         if "win" in sys.platform:
@@ -77,6 +84,7 @@ class Spectrum(Container, ScreensaverSpectrum):
             self.config[UPDATE_UI_INTERVAL] = 0.1
         else:
             self.windows = False
+            self.pipe_reader = get_pipe_reader(self.config[PIPE_NAME], self.config[PIPE_SIZE])
             thread = Thread(target=self.open_pipe)
             thread.start()
 
@@ -328,22 +336,7 @@ class Spectrum(Container, ScreensaverSpectrum):
     def open_pipe(self):
         """ Open named pipe  """
         
-        try:            
-            self.pipe = os.open(self.config[PIPE_NAME], os.O_RDONLY | os.O_NONBLOCK)
-        except Exception as e:
-            logging.debug("Cannot open named pipe: " + self.config[PIPE_NAME])
-            logging.debug(e)
-
-    def flush_pipe_buffer(self):
-        """ Flush data from the pipe """
-
-        if not self.pipe:
-            return
-
-        try:
-            os.read(self.pipe, self.config[PIPE_BUFFER_SIZE])
-        except Exception as e:
-            logging.debug(e)
+        self.pipe_reader.open()
 
     def start(self):
         """ Start spectrum """ 
@@ -441,6 +434,8 @@ class Spectrum(Container, ScreensaverSpectrum):
 
             self.update_boxes[r].y = c.content_y
 
+        self.topping_y = None
+
     def set_foreground(self):
         """ Set foreground image """
 
@@ -459,7 +454,7 @@ class Spectrum(Container, ScreensaverSpectrum):
     def switch_spectrum(self):
         """ Switch to another spectrum """
         
-        self.values = [0] * self.config[SIZE]
+        self.reset_values()
         self.test_iterator = 0
         self.index = next(self.indexes)
         self.init_variables()
@@ -470,6 +465,14 @@ class Spectrum(Container, ScreensaverSpectrum):
         self.set_foreground()
         self.redraw_background()
 
+    def reset_values(self):
+        """ Set all bar heights to zero """
+
+        if numpy is None:
+            self.values = [0] * self.config[SIZE]
+        else:
+            self.values = numpy.zeros(self.config[SIZE], dtype=numpy.int32)
+
     def redraw_background(self):
         """ Redraw background """
 
@@ -493,6 +496,9 @@ class Spectrum(Container, ScreensaverSpectrum):
         
         self.run_datasource = False
 
+        if self.pipe_reader:
+            self.pipe_reader.stop()
+
         if hasattr(self, "callback_stop"):
             self.callback_stop(self)
 
@@ -502,7 +508,9 @@ class Spectrum(Container, ScreensaverSpectrum):
     def start_data_source(self):
         """ Start data source thread. """
 
-        self.flush_pipe_buffer()
+        if self.pipe_reader:
+            self.pipe_reader.start()
+
         self.run_datasource = True
         thread = Thread(target=self.get_data)
         thread.start()
@@ -512,20 +520,15 @@ class Spectrum(Container, ScreensaverSpectrum):
                
         while self.run_datasource:
             self.set_values()
-            time.sleep(self.config[UPDATE_UI_INTERVAL])
+            if self.windows or not self.pipe_reader or not self.pipe_reader.is_running():
+                time.sleep(self.config[UPDATE_UI_INTERVAL])
     
     def get_latest_pipe_data(self):
-        """ Read from the named pipe until it's empty """
+        """ Wait for the newest frame from the pipe reader """
 
-        data = [0] * self.config[PIPE_SIZE]
-        while True:
-            try:
-                tmp_data = os.read(self.pipe, self.config[PIPE_SIZE])
-                if len(tmp_data) == self.config[PIPE_SIZE]:
-                    data = tmp_data
-                time.sleep(self.config[PIPE_POLLING_INTERVAL])
-            except:
-                break
+        data = self.pipe_reader.wait_frame(self.config[UPDATE_UI_INTERVAL])
+        if data == None:
+            data = [0] * self.config[PIPE_SIZE]
 
         return data
 
@@ -572,7 +575,7 @@ class Spectrum(Container, ScreensaverSpectrum):
             data = self.get_test_data()
         else:
             try:
-                if self.pipe == None:
+                if self.pipe_reader == None or not self.pipe_reader.is_open():
                     return
     			
                 data = self.get_latest_pipe_data()
@@ -583,6 +586,10 @@ class Spectrum(Container, ScreensaverSpectrum):
         length = len(data)
         if length == 0:
             return
+
+        if numpy is not None:
+            self.values = self.get_heights(data)
+            return
             
         words = int(length / 4)
 
@@ -602,6 +609,83 @@ class Spectrum(Container, ScreensaverSpectrum):
 
             self.values[m] = new_height
             
+    def get_heights(self, data):
+        """ Decode all pipe values at once and quantize them to the bar steps
+
+        :param data: the pipe data, 4 bytes (unsigned little-endian integer) per bar
+
+        :return: numpy array of new bar heights
+        """
+        words = min(int(len(data) / 4), self.config[SIZE])
+        if not isinstance(data, (bytes, bytearray)):
+            data = bytes(data)
+
+        v = numpy.frombuffer(data, dtype="<u4", count=words) * self.unit
+        steps = numpy.ceil(v / self.step)
+        steps[v <= 0] = 0
+        heights = (steps * self.step).astype(numpy.int32)
+
+        if words < self.config[SIZE]:
+            heights = numpy.pad(heights, (0, self.config[SIZE] - words))
+
+        return heights
+
+    def set_geometry(self, values):
+        """ Calculate bars, reflections and toppings geometry for all bars at once
+        and apply it to the components
+
+        :param values: numpy array of bar heights
+        """
+        size = self.config[SIZE]
+        y_0 = self.spectrum_y + self.origin_y
+        heights = values.tolist()
+        bar_y = (y_0 - values).tolist()
+        bar_box_y = (self.height - values).tolist()
+
+        for i in range(size):
+            comp = self.components[i + 1]
+            comp.bounding_box.h = heights[i]
+            comp.bounding_box.y = bar_box_y[i]
+            comp.content_y = bar_y[i]
+            comp.visible = True
+
+        if self.reflection != [None]:
+            reflection_y = int(y_0 + self.reflection_gap)
+            for i in range(size):
+                comp = self.components[i + 1 + size]
+                comp.bounding_box.h = heights[i]
+                comp.bounding_box.y = 0
+                comp.content_y = reflection_y
+                comp.visible = True
+
+        if self.topping_height == None or self.topping_step == None:
+            return
+
+        n = 1
+        if self.reflection != [None]:
+            n = 2
+
+        toppings = self.components[1 + size * n : 1 + size * (n + 1)]
+        c_y = numpy.minimum(y_0 - values, y_0)
+
+        if self.topping_y is None:
+            self.topping_y = c_y
+            for comp, y in zip(toppings, c_y.tolist()):
+                comp.bounding_box.h = self.topping_height
+                comp.content_y = y
+                comp.initialized = True
+            return
+
+        falling = c_y > self.topping_y + self.topping_step + self.topping_height
+        self.topping_y = numpy.where(falling, self.topping_y + self.topping_step, c_y - self.topping_height - self.topping_step)
+        topping_box_y = self.height - (y_0 - self.topping_y) + 1
+
+        for comp, y, box_y, visible in zip(toppings, self.topping_y.tolist(), topping_box_y.tolist(), falling.tolist()):
+            comp.content_y = y
+            comp.visible = visible
+            if visible:
+                comp.bounding_box.y = box_y
+
     def set_bar_y(self, index, new_height):
         """ Set bar Y coordinate
 
@@ -680,11 +764,14 @@ class Spectrum(Container, ScreensaverSpectrum):
             self.frames += 1
 
         #set values
-        for i, v in enumerate(self.values):
-            n = i + 1
-            self.set_bar_y(n, v)
-            self.set_reflection_y(n, v)
-            self.set_topping_y(n, v)
+        if numpy is None:
+            for i, v in enumerate(self.values):
+                n = i + 1
+                self.set_bar_y(n, v)
+                self.set_reflection_y(n, v)
+                self.set_topping_y(n, v)
+        else:
+            self.set_geometry(self.values)
 
         # clean
         for b in self.update_boxes:
@@ -28,11 +28,14 @@ from util.keys import USER_EVENT_TYPE, SUB_TYPE_KEYBOARD, SELECT_EVENT_TYPE, \
 
 from util.config import USAGE, USE_LONG_PRESS_TIME, ALIGN_BUTTON_CONTENT_X, CENTER
 from ui.layout.buttonlayout import ButtonLayout
+from ui.text.textlayout import text_layout, ELLIPSES
 
-ELLIPSES = "..."
 
 class Button(Container):
     """ Base class for button objects """
+
+    # handles mouse button down only inside bounding box and ignores mouse motion
+    hit_test = True
     
     def __init__(self, util, state):
         """ Initializer
@@ -181,7 +184,7 @@ class Button(Container):
         else:
             color = state.text_color_normal
 
-        label = font.render(text, 1, color)
+        label = text_layout.render(font, text, color)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
@@ -225,7 +228,7 @@ class Button(Container):
         y_second_line = y_first_line + first_line_height + between_lines_gap - adjustment_y + adjustment_y_second_line
 
         size = font_first.size(first_line)
-        label = font_first.render(first_line, 1, state.text_color_normal)
+        label = text_layout.render(font_first, first_line, state.text_color_normal)
 
         c = Component(self.util, label)
         c.name = state.name + ".label.1"
@@ -244,7 +247,7 @@ class Button(Container):
             self.components[2] = c
         x = c.content_x
 
-        label = font_second.render(second_line, 1, state.text_color_disabled)
+        label = text_layout.render(font_second, second_line, state.text_color_disabled)
 
         c = Component(self.util, label)
         c.name = state.name + ".label.2"
@@ -453,12 +456,12 @@ class Button(Container):
         # Selected
         if num == 4:
             font = self.util.get_font(self.components[2].text_size)
-            self.components[2].content = font.render(self.components[2].text, 1, self.components[2].text_color_current)
+            self.components[2].content = text_layout.render(font, self.components[2].text, self.components[2].text_color_current)
             font = self.util.get_font(self.components[num - 2].text_size)
-            self.components[2].content = font.render(self.components[2].text, 1, self.components[2].text_color_current)
+            self.components[2].content = text_layout.render(font, self.components[2].text, self.components[2].text_color_current)
         else:
             font = self.util.get_font(self.components[2].text_size)
-            self.components[2].content = font.render(self.state.l_name, 1, self.components[2].text_color_current)
+            self.components[2].content = text_layout.render(font, self.state.l_name, self.components[2].text_color_current)
                     
     def handle_event(self, event):
         """ Handle button event
@@ -689,32 +692,15 @@ class Button(Container):
         self.clean_draw_update()
         self.notify_label_listeners(self.state)
     
-    def truncate_long_labels(self, text, bb, font, truncated=False):
+    def truncate_long_labels(self, text, bb, font):
         """ Truncate long labels
         
         :param text: label text
         :param bb: bounding box
         :param font: label font
-        :param truncated: True-truncate, False-don't truncate
-        :return: 
+        :return: text which fits into the bounding box
         """
-        if len(text) < 5:
-            return text
-        
-        size = font.size(text)
-        ellipses_size = font.size(ELLIPSES)
-        text_width = size[0]
-        
-        if text_width >= bb.w:
-            return self.truncate_long_labels(text[0 : -1], bb, font, True)
-        else:
-            if truncated:
-                if size[0] + ellipses_size[0] >= bb.w:
-                    return self.truncate_long_labels(text[0 : -1], bb, font, True)
-                else:
-                    return text + ELLIPSES
-            else:
-                return text 
+        return text_layout.truncate(text, bb.w, font)
 
     def refresh(self):
         """ Return bounding box for screen update """
@@ -22,6 +22,7 @@ from ui.component import Component
 from ui.button.button import Button
 from util.keys import MAXIMUM_FONT_SIZE, V_ALIGN, V_ALIGN_TOP, V_OFFSET, H_ALIGN, H_ALIGN_LEFT
 from util.config import SCREEN_INFO, WIDTH
+from ui.text.textlayout import text_layout
 
 class EpisodeButton(Button):
     """ Podcast episode button """
@@ -58,7 +59,7 @@ class EpisodeButton(Button):
         text = self.truncate_long_labels(state.l_name, r, font)
         state.l_name = text
         size = font.size(text)
-        label = font.render(text, 1, state.text_color_normal)
+        label = text_layout.render(font, text, state.text_color_normal)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
@@ -117,7 +118,7 @@ class EpisodeButton(Button):
         
         for n, line in enumerate(lines[0:3]):
             try:
-                label = font.render(line, 1, state.text_color_normal)
+                label = text_layout.render(font, line, state.text_color_normal)
             except:
                 continue
             c = Component(self.util, label)
@@ -27,6 +27,8 @@ BAR_HEIGHT_PERCENT = 22
 
 class ImageButton(Button):
     """ Image button with two states: On/Off """
+
+    hit_test = False
     
     def __init__(self, util, state, folder, bb, action):
         """ Initializer
@@ -21,6 +21,7 @@ from ui.component import Component
 from ui.button.button import Button
 from ui.layout.multilinebuttonlayout import LINES
 from util.keys import USER_EVENT_TYPE
+from ui.text.textlayout import text_layout
 
 class MultiLineButton(Button):
     """ Multi-line button class """
@@ -115,7 +116,7 @@ class MultiLineButton(Button):
         
         text = self.truncate_long_labels(label, bb, font)
         size = font.size(text)
-        rendered_label = font.render(text, 1, self.text_color_normal)
+        rendered_label = text_layout.render(font, text, self.text_color_normal)
         c = Component(self.util, rendered_label)
         c.name = label + ".label"
         c.text = text
@@ -195,5 +196,5 @@ class MultiLineButton(Button):
             else:
                 comp.text_color_current = comp.text_color_normal                          
             font = self.util.get_font(comp.text_size)
-            comp.content = font.render(comp.text, 1, comp.text_color_current)
+            comp.content = text_layout.render(font, comp.text, comp.text_color_current)
         
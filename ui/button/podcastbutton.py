@@ -21,6 +21,7 @@ from ui.component import Component
 from ui.button.button import Button
 from util.keys import MAXIMUM_FONT_SIZE, V_ALIGN, V_ALIGN_TOP, V_OFFSET, H_ALIGN, H_ALIGN_LEFT
 from util.config import SCREEN_INFO, WIDTH
+from ui.text.textlayout import text_layout
 
 class PodcastButton(Button):
     """ Podcast button """
@@ -56,7 +57,7 @@ class PodcastButton(Button):
         text = self.truncate_long_labels(state.l_name, bb, font)
         state.l_name = text
         size = font.size(text)
-        label = font.render(text, 1, state.text_color_normal)
+        label = text_layout.render(font, text, state.text_color_normal)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
@@ -114,7 +115,7 @@ class PodcastButton(Button):
         lines = textwrap.wrap(desc, line_length)
         
         for n, line in enumerate(lines[0:5]):
-            label = font.render(line, 1, state.text_color_normal)
+            label = text_layout.render(font, line, state.text_color_normal)
             c = Component(self.util, label)
             c.name = "desc." + str(title_y) + str(n)
             c.text = line
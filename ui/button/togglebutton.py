@@ -22,6 +22,9 @@ from util.keys import kbd_keys, USER_EVENT_TYPE, SELECT_EVENT_TYPE, KEY_SELECT,
 
 class ToggleButton(Button):
     """ Toggle button class (e.g. Shutdown button) """
+
+    # cancels action on mouse button down outside of the button
+    hit_test = False
     
     def __init__(self, util, state):
         """ Initializer
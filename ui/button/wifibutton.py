@@ -21,6 +21,7 @@ from ui.component import Component
 from ui.button.button import Button
 from util.keys import MAXIMUM_FONT_SIZE, V_ALIGN, V_ALIGN_TOP, V_OFFSET, H_ALIGN, H_ALIGN_LEFT, H_OFFSET
 from util.config import SCREEN_INFO, WIDTH
+from ui.text.textlayout import text_layout
 
 class WiFiButton(Button):
     """ Wi-Fi button """
@@ -48,7 +49,7 @@ class WiFiButton(Button):
         text = self.truncate_long_labels(state.l_name, bb, font)
         state.l_name = text
         size = font.size(text)
-        label = font.render(text, 1, state.text_color_normal)
+        label = text_layout.render(font, text, state.text_color_normal)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
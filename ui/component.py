@@ -17,6 +17,8 @@
 
 import pygame
 
+from ui.compositor import compositor
+
 class Component(object):
     """ Represent the lowest UI component level.    
     This is the only class which knows how to draw on Pygame Screen.
@@ -100,9 +102,7 @@ class Component(object):
                 f = getattr(f, "bgr", (0,0,0))
 
             if len(f) == 4:
-                s = pygame.Surface((r.w, r.h))
-                s.set_alpha(f[3])
-                s.fill((f[0], f[1], f[2]))
+                s = compositor.get_alpha_surface(r.w, r.h, f)
                 self.screen.blit(s, (r.x, r.y))
             else:
                 try:
@@ -146,20 +146,20 @@ class Component(object):
                     self.screen.blit(comp, (x, y))
  
     def update(self, update_area=None):
-        """ Update Pygame Screen """
+        """ Update Pygame Screen. During the frame the area is collected by compositor. """
         
         if not self.visible: return
 
         if update_area:
-            pygame.display.update(update_area)
+            compositor.add(update_area)
         else:
-            pygame.display.update(self.bounding_box)
+            compositor.add(self.bounding_box)
         
     def update_rectangle(self, r):
         """ Update Pygame Screen """
         
         if not self.visible: return
-        pygame.display.update(r)      
+        compositor.add(r)      
         
     def set_visible(self, flag):
         """ Set component visibility 
@@ -0,0 +1,129 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import pygame
+
+from threading import RLock, get_ident
+from util.cache import LruCache, MEGABYTE
+
+ALPHA_SURFACES_CACHE_SIZE = 2 * MEGABYTE
+
+class Compositor(object):
+    """ Collects dirty rectangles during the frame and updates display once per frame.
+    Overlapping rectangles are merged. Rectangles are collected only in the thread which
+    started the frame, updates from other threads and outside of the frame go to the display
+    immediately. The number of updates is counted, so the event loop can detect that the screen
+    is animated.
+    """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.lock = RLock()
+        self.rects = []
+        self.frame_thread = None
+        self.update_count = 0
+        self.alpha_surfaces = LruCache("alpha.surfaces", ALPHA_SURFACES_CACHE_SIZE)
+
+    def begin(self):
+        """ Start collecting dirty rectangles for the current thread """
+
+        with self.lock:
+            self.frame_thread = get_ident()
+
+    def end(self):
+        """ Stop collecting dirty rectangles and update display """
+
+        with self.lock:
+            self.frame_thread = None
+            self.flush()
+
+    def add(self, area):
+        """ Add dirty area
+
+        :param area: rectangle or list of rectangles
+        """
+        if not area:
+            return
+
+        self.update_count += 1
+
+        if self.frame_thread != get_ident():
+            pygame.display.update(area)
+            return
+
+        with self.lock:
+            if isinstance(area, list):
+                for r in area:
+                    if r: self.add_rect(r)
+            else:
+                self.add_rect(area)
+
+    def add_rect(self, rect):
+        """ Add rectangle and merge it with overlapping rectangles
+
+        :param rect: rectangle
+        """
+        r = pygame.Rect(rect)
+        if r.w <= 0 or r.h <= 0:
+            return
+
+        merged = True
+        while merged:
+            merged = False
+            for i, d in enumerate(self.rects):
+                if d.contains(r):
+                    return
+                if d.colliderect(r):
+                    r.union_ip(d)
+                    del self.rects[i]
+                    merged = True
+                    break
+
+        self.rects.append(r)
+
+    def flush(self):
+        """ Update display with all collected rectangles """
+
+        with self.lock:
+            if not self.rects:
+                return
+
+            rects = self.rects
+            self.rects = []
+
+        pygame.display.update(rects)
+
+    def get_alpha_surface(self, w, h, color):
+        """ Get surface filled by semi-transparent color
+
+        :param w: surface width
+        :param h: surface height
+        :param color: color with alpha (Red, Green, Blue, Alpha)
+
+        :return: cached surface
+        """
+        key = (w, h, color)
+        s = self.alpha_surfaces.get(key)
+        if s == None:
+            s = pygame.Surface((w, h))
+            s.set_alpha(color[3])
+            s.fill((color[0], color[1], color[2]))
+            self.alpha_surfaces[key] = s
+        return s
+
+compositor = Compositor()
@@ -15,7 +15,10 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
+import pygame
+
 from ui.component import Component
+from ui.hitindex import HitIndex, layout_version
 
 class Container(Component):
     """ This container class keeps the list of components and executes group methods on them """
@@ -34,6 +37,7 @@ class Container(Component):
             cnt = bounding_box
             
         Component.__init__(self, util, c=cnt, bb=bounding_box, bgr=background, v=visible)
+        self.hit_index = None
         self.components = list()
         if image_filename:
             self.image_filename = image_filename
@@ -46,6 +50,23 @@ class Container(Component):
         :param component: component to add
         """
         self.components.append(component)
+        layout_version.increment()
+
+    @property
+    def components(self):
+        """ The list of container components """
+
+        return self.component_list
+
+    @components.setter
+    def components(self, components):
+        """ Replace the list of components. The layout of all hit indexes is changed
+        because the components could be buttons of another container.
+
+        :param components: new list of components
+        """
+        self.component_list = components
+        layout_version.increment()
 
     def set_parent_screen(self, scr):
         """ Add parent screen
@@ -96,7 +117,16 @@ class Container(Component):
         """
         if not self.visible or len(self.components) == 0: return
 
-        for i in range(len(self.components) - 1, -1, -1):
+        indexes = None
+        if event.type == pygame.MOUSEMOTION:
+            indexes = self.get_hit_index().others
+        elif event.type == pygame.MOUSEBUTTONDOWN and hasattr(event, "pos"):
+            indexes = self.get_hit_index().get_indexes(event.pos)
+
+        if indexes == None:
+            indexes = range(len(self.components))
+
+        for i in reversed(indexes):
             try:
                 comp = self.components[i]
 
@@ -112,6 +142,17 @@ class Container(Component):
             except:
                 pass
     
+    def get_hit_index(self):
+        """ Get spatial index of components. The index is rebuilt when the layout changes.
+
+        :return: hit index
+        """
+        hit_index = getattr(self, "hit_index", None)
+        if hit_index == None or not hit_index.is_valid(self.components):
+            hit_index = HitIndex(self.components)
+            self.hit_index = hit_index
+        return hit_index
+
     def set_current(self, state=None):
         """ Set container as current. Used by screens 
         
@@ -0,0 +1,130 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+CELL_SIZE = 64
+
+class LayoutVersion(object):
+    """ Layout version counter. It's incremented when the list of container components
+    is replaced or changed by the container. All hit indexes built for the previous version
+    become invalid.
+    """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.value = 0
+
+    def increment(self):
+        """ Increment layout version """
+
+        self.value += 1
+
+layout_version = LayoutVersion()
+
+class HitIndex(object):
+    """ Uniform grid over the bounding boxes of container components. Only components with
+    hit_test flag are indexed. Such components handle mouse button down events inside
+    their bounding boxes only and ignore mouse motion events. All other components are
+    returned for any position. The index is valid until the layout version changes.
+    """
+
+    def __init__(self, components):
+        """ Initializer
+
+        :param components: list of container components
+        """
+        self.components = components
+        self.size = len(components)
+        self.version = layout_version.value
+        self.rects = {}
+        self.cells = {}
+        self.others = []
+
+        for i, comp in enumerate(components):
+            r = self.get_rect(comp)
+            if r == None:
+                self.others.append(i)
+                continue
+
+            self.rects[i] = r
+            x, y, w, h = r
+            for col in range(x // CELL_SIZE, (x + w - 1) // CELL_SIZE + 1):
+                for row in range(y // CELL_SIZE, (y + h - 1) // CELL_SIZE + 1):
+                    self.cells.setdefault((col, row), []).append(i)
+
+    def get_rect(self, comp):
+        """ Get the area where component handles mouse events
+
+        :param comp: component
+
+        :return: tuple (x, y, w, h) or None if component cannot be indexed
+        """
+        if not comp or not getattr(comp, "hit_test", False):
+            return None
+
+        bb = comp.bounding_box
+        state_bb = getattr(getattr(comp, "state", None), "bounding_box", None)
+        if bb == None:
+            return None
+
+        if state_bb != None and state_bb is not bb:
+            bb = bb.union(state_bb)
+
+        if bb.w <= 0 or bb.h <= 0:
+            return None
+
+        return (bb.x, bb.y, bb.w, bb.h)
+
+    def is_valid(self, components):
+        """ Check if the index was built for the current list of components and layout
+
+        :param components: list of container components
+
+        :return: True - valid, False - the index should be rebuilt
+        """
+        return self.version == layout_version.value and components is self.components \
+            and len(components) == self.size
+
+    def get_hits(self, pos):
+        """ Get indexes of the indexed components which contain the position
+
+        :param pos: position (x, y)
+
+        :return: list of indexes
+        """
+        x, y = pos
+        hits = []
+
+        for i in self.cells.get((int(x) // CELL_SIZE, int(y) // CELL_SIZE), []):
+            r = self.rects[i]
+            if r[0] <= x < r[0] + r[2] and r[1] <= y < r[1] + r[3]:
+                hits.append(i)
+
+        return hits
+
+    def get_indexes(self, pos):
+        """ Get indexes of components which should handle mouse button down event
+
+        :param pos: position (x, y)
+
+        :return: sorted list of indexes
+        """
+        hits = self.get_hits(pos)
+        if not hits:
+            return self.others
+
+        return sorted(self.others + hits)
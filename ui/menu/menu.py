@@ -728,10 +728,21 @@ class Menu(Container):
             self.select_by_index(clicked_button.state.index)
 
     def get_clicked_menu_button(self, x, y):
-        if self.buttons:
-            for button in self.buttons.values():
-                if button.bounding_box.collidepoint((x, y)):
-                    return button
+        """ Get menu button by coordinates
+
+        :param x: x coordinate
+        :param y: y coordinate
+
+        :return: button or None
+        """
+        if not self.buttons:
+            return None
+
+        hit_index = self.get_hit_index()
+        for i in sorted(hit_index.get_hits((x, y)) + hit_index.others):
+            c = self.components[i]
+            if isinstance(c, Button) and c.bounding_box.collidepoint((x, y)):
+                return c
         return None
 
     def add_button_observers(self):
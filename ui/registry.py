@@ -0,0 +1,137 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import logging
+import importlib
+
+from threading import RLock
+
+lock = RLock()
+load_times = []
+
+class LazyClass(object):
+    """ Placeholder for the screen class which imports the class module on the first use.
+    Calling the placeholder creates the instance of the class. This way the screen modules
+    and their dependencies are loaded only when the screen is opened for the first time.
+    """
+
+    def __init__(self, module_name, class_name):
+        """ Initializer
+
+        :param module_name: module name
+        :param class_name: class name
+        """
+        self.module_name = module_name
+        self.class_name = class_name
+        self.cls = None
+
+    def get_class(self):
+        """ Import module and get the class
+
+        :return: class
+        """
+        if self.cls != None:
+            return self.cls
+
+        with lock:
+            if self.cls == None:
+                start = time.monotonic()
+                module = importlib.import_module(self.module_name)
+                self.cls = getattr(module, self.class_name)
+                duration = time.monotonic() - start
+                load_times.append((self.module_name, duration))
+                logging.debug("Loaded %s in %.3f s", self.module_name, duration)
+            return self.cls
+
+    def __call__(self, *args, **kwargs):
+        """ Create class instance
+
+        :param args: positional arguments
+        :param kwargs: keyword arguments
+
+        :return: class instance
+        """
+        return self.get_class()(*args, **kwargs)
+
+def get_load_times():
+    """ Get load times of the modules loaded so far
+
+    :return: list of tuples (module name, load time in seconds)
+    """
+    with lock:
+        return list(load_times)
+
+RadioGroupScreen = LazyClass("ui.screen.radiogroup", "RadioGroupScreen")
+HomeScreen = LazyClass("ui.screen.home", "HomeScreen")
+LanguageScreen = LazyClass("ui.screen.language", "LanguageScreen")
+SaverScreen = LazyClass("ui.screen.saver", "SaverScreen")
+AboutScreen = LazyClass("ui.screen.about", "AboutScreen")
+BlackScreen = LazyClass("ui.screen.black", "BlackScreen")
+RadioPlayerScreen = LazyClass("ui.player.radioplayer", "RadioPlayerScreen")
+StreamPlayerScreen = LazyClass("ui.player.streamplayer", "StreamPlayerScreen")
+RadioBrowserScreen = LazyClass("ui.browser.radio", "RadioBrowserScreen")
+StreamBrowserScreen = LazyClass("ui.browser.stream", "StreamBrowserScreen")
+FileBrowserScreen = LazyClass("ui.browser.file", "FileBrowserScreen")
+FilePlayerScreen = LazyClass("ui.player.fileplayer", "FilePlayerScreen")
+EqualizerScreen = LazyClass("ui.screen.equalizer", "EqualizerScreen")
+TimerScreen = LazyClass("ui.screen.timer", "TimerScreen")
+BookPlayer = LazyClass("ui.player.bookplayer", "BookPlayer")
+BookTrack = LazyClass("ui.screen.booktrack", "BookTrack")
+BookGenre = LazyClass("ui.screen.bookgenre", "BookGenre")
+BookGenreBooks = LazyClass("ui.screen.bookgenrebooks", "BookGenreBooks")
+BookNew = LazyClass("ui.screen.booknew", "BookNew")
+LoyalBooksParser = LazyClass("websiteparser.loyalbooks.loyalbooksparser", "LoyalBooksParser")
+PodcastsScreen = LazyClass("ui.screen.podcasts", "PodcastsScreen")
+PodcastEpisodesScreen = LazyClass("ui.screen.podcastepisodes", "PodcastEpisodesScreen")
+PodcastPlayerScreen = LazyClass("ui.player.podcastplayer", "PodcastPlayerScreen")
+AirplayPlayerScreen = LazyClass("ui.player.airplayplayer", "AirplayPlayerScreen")
+SpotifyConnectScreen = LazyClass("ui.player.spotifyconnect", "SpotifyConnectScreen")
+NetworkScreen = LazyClass("ui.screen.network", "NetworkScreen")
+WiFiScreen = LazyClass("ui.screen.wifi", "WiFiScreen")
+BluetoothScreen = LazyClass("ui.screen.bluetooth", "BluetoothScreen")
+KeyboardScreen = LazyClass("ui.screen.keyboard", "KeyboardScreen")
+CollectionScreen = LazyClass("ui.screen.collection", "CollectionScreen")
+TopicScreen = LazyClass("ui.screen.topic", "TopicScreen")
+TopicDetailScreen = LazyClass("ui.screen.topicdetail", "TopicDetailScreen")
+LatinAbcScreen = LazyClass("ui.screen.latinabc", "LatinAbcScreen")
+CollectionPlayerScreen = LazyClass("ui.screen.collectionplayer", "CollectionPlayerScreen")
+CollectionBrowserScreen = LazyClass("ui.screen.collectionbrowser", "CollectionBrowserScreen")
+InfoScreen = LazyClass("ui.screen.info", "InfoScreen")
+SwitchScreen = LazyClass("ui.screen.switch", "SwitchScreen")
+ImageViewer = LazyClass("ui.screen.imageviewer", "ImageViewer")
+BluetoothSinkScreen = LazyClass("ui.player.bluetoothsink", "BluetoothSinkScreen")
+YaStreamScreen = LazyClass("ui.screen.yastream", "YaStreamScreen")
+YaPlaylistPlayerScreen = LazyClass("ui.player.yaplaylistplayer", "YaPlaylistPlayerScreen")
+YaSearchPlayerScreen = LazyClass("ui.player.yasearchplayer", "YaSearchPlayerScreen")
+YaPlaylistScreen = LazyClass("ui.browser.yaplaylist", "YaPlaylistScreen")
+YaSearchScreen = LazyClass("ui.browser.yasearch", "YaSearchScreen")
+ArchiveFilesBrowserScreen = LazyClass("ui.browser.archivefiles", "ArchiveFilesBrowserScreen")
+ArchiveItemsBrowserScreen = LazyClass("ui.browser.archiveitems", "ArchiveItemsBrowserScreen")
+JukeboxBrowserScreen = LazyClass("ui.browser.jukebox", "JukeboxBrowserScreen")
+ArchivePlayerScreen = LazyClass("ui.player.archiveplayer", "ArchivePlayerScreen")
+BrowserScreen = LazyClass("ui.browser.browser", "BrowserScreen")
+RadioSearchScreen = LazyClass("ui.browser.search", "RadioSearchScreen")
+RadioBrowserPlayerScreen = LazyClass("ui.player.radiobrowserplayer", "RadioBrowserPlayerScreen")
+SearchByScreen = LazyClass("ui.screen.searchby", "SearchByScreen")
+FavoritesScreen = LazyClass("ui.browser.favorites", "FavoritesScreen")
+CatalogScreen = LazyClass("ui.screen.catalog", "CatalogScreen")
+CatalogBase = LazyClass("ui.browser.catalogbase", "CatalogBase")
+CatalogAlbumTracks = LazyClass("ui.browser.catalogalbumtracks", "CatalogAlbumTracks")
+CatalogPlayerScreen = LazyClass("ui.player.catalogplayer", "CatalogPlayerScreen")
+CatalogGenres = LazyClass("ui.browser.cataloggenres", "CatalogGenres")
+CatalogGenreArtists = LazyClass("ui.browser.cataloggenreartists", "CatalogGenreArtists")
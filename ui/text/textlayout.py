@@ -0,0 +1,83 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+from util.cache import LruCache, MEGABYTE
+
+ELLIPSES = "..."
+MIN_TRUNCATED_LENGTH = 5
+LABELS_CACHE_SIZE = 4 * MEGABYTE
+
+class TextLayout(object):
+    """ Fits labels into the available width and caches rendered labels. The font should
+    have the 'key' attribute (font file and size) to cache the labels rendered by this font.
+    """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.labels = LruCache("labels", LABELS_CACHE_SIZE)
+
+    def truncate(self, text, width, font):
+        """ Truncate text and add ellipses if text is wider than the available width.
+        The longest fitting prefix is found by binary search.
+
+        :param text: text
+        :param width: available width
+        :param font: text font
+
+        :return: text which fits into the available width
+        """
+        if len(text) < MIN_TRUNCATED_LENGTH or font.size(text)[0] < width:
+            return text
+
+        ellipses_width = font.size(ELLIPSES)[0]
+        low = MIN_TRUNCATED_LENGTH
+        high = len(text) - 1
+
+        if high < low or font.size(text[0 : low])[0] + ellipses_width >= width:
+            return text[0 : MIN_TRUNCATED_LENGTH - 1]
+
+        while low < high:
+            middle = (low + high + 1) // 2
+            if font.size(text[0 : middle])[0] + ellipses_width < width:
+                low = middle
+            else:
+                high = middle - 1
+
+        return text[0 : low] + ELLIPSES
+
+    def render(self, font, text, color):
+        """ Render antialiased text or get it from cache
+
+        :param font: text font
+        :param text: text
+        :param color: text color
+
+        :return: rendered text surface
+        """
+        font_key = getattr(font, "key", None)
+        if font_key == None:
+            return font.render(text, 1, color)
+
+        key = (text, font_key, tuple(color))
+        label = self.labels.get(key)
+        if label == None:
+            label = font.render(text, 1, color)
+            self.labels[key] = label
+        return label
+
+text_layout = TextLayout()
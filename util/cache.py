@@ -16,11 +16,170 @@
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
 from threading import RLock
+from collections import OrderedDict
+
+MEGABYTE = 1024 * 1024
+DEFAULT_ITEM_SIZE = 64
+
+CACHE_IMAGES = "images"
+CACHE_BASE64_IMAGES = "base64.images"
+CACHE_SVG_IMAGES = "svg.images"
+CACHE_BACKGROUNDS = "backgrounds"
+CACHE_ALBUM_ART_URLS = "album.art.urls"
+CACHE_THUMBNAILS = "thumbnails"
+CACHE_MENU_IMAGES = "menu.images"
+
+# percentage of the total image cache size defined in the configuration
+CACHE_BUDGETS = {
+    CACHE_IMAGES: 35,
+    CACHE_BASE64_IMAGES: 10,
+    CACHE_SVG_IMAGES: 5,
+    CACHE_BACKGROUNDS: 25,
+    CACHE_ALBUM_ART_URLS: 1,
+    CACHE_THUMBNAILS: 12,
+    CACHE_MENU_IMAGES: 12
+}
+
+class LruCache(object):
+    """ Dictionary-like cache with memory budget. The least recently used items are evicted
+    when the total size of the items exceeds the budget. The size of pygame Surface is 
+    calculated as width * height * bytes per pixel.
+    """
+
+    def __init__(self, name, max_size):
+        """ Initializer
+
+        :param name: cache name used in statistics
+        :param max_size: cache budget in bytes
+        """
+        self.name = name
+        self.max_size = max_size
+        self.lock = RLock()
+        self.items = OrderedDict()
+        self.sizes = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_item_size(self, item):
+        """ Estimate item size in bytes
+
+        :param item: cached item
+
+        :return: item size
+        """
+        if hasattr(item, "get_bytesize"):
+            return item.get_width() * item.get_height() * item.get_bytesize()
+        elif isinstance(item, (str, bytes)):
+            return len(item)
+        elif isinstance(item, (tuple, list)):
+            return sum([self.get_item_size(i) for i in item])
+        else:
+            return DEFAULT_ITEM_SIZE
+
+    def __getitem__(self, key):
+        """ Get item and mark it as the most recently used
+
+        :param key: item key
+
+        :return: item
+        """
+        with self.lock:
+            try:
+                item = self.items[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self.items.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def __setitem__(self, key, item):
+        """ Put item to cache and evict the least recently used items if budget exceeded.
+        The last added item is never evicted.
+
+        :param key: item key
+        :param item: item
+        """
+        with self.lock:
+            if key in self.items:
+                self.size -= self.sizes[key]
+            size = self.get_item_size(item)
+            self.items[key] = item
+            self.items.move_to_end(key)
+            self.sizes[key] = size
+            self.size += size
+
+            while self.size > self.max_size and len(self.items) > 1:
+                k, _ = self.items.popitem(last=False)
+                self.size -= self.sizes.pop(k)
+                self.evictions += 1
+
+    def __delitem__(self, key):
+        """ Remove item
+
+        :param key: item key
+        """
+        with self.lock:
+            del self.items[key]
+            self.size -= self.sizes.pop(key)
+
+    def __contains__(self, key):
+        """ Check if item is in cache. It doesn't change the order of items.
+
+        :param key: item key
+
+        :return: True - item in cache, False - item not in cache
+        """
+        with self.lock:
+            return key in self.items
+
+    def __len__(self):
+        """ Return the number of cached items """
+
+        with self.lock:
+            return len(self.items)
+
+    def get(self, key, default=None):
+        """ Get item
+
+        :param key: item key
+        :param default: value returned if item is not in cache
+
+        :return: item or default value
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self):
+        """ Remove all items """
+
+        with self.lock:
+            self.items.clear()
+            self.sizes.clear()
+            self.size = 0
+
+    def get_stats(self):
+        """ Get cache statistics
+
+        :return: dictionary with statistics
+        """
+        with self.lock:
+            return {
+                "name": self.name,
+                "items": len(self.items),
+                "size": self.size,
+                "max.size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
 
 class Cache(object):
-    """ Image cache """
-    
-    lock = RLock()
+    """ Image cache. All instances share the menu images cache of the image utility """
     
     def __init__(self, util):
         """ Initializer 
@@ -28,8 +187,7 @@ class Cache(object):
         :param util: utility object 
         """
         self.util = util
-        self.cached_images_hashes = []
-        self.image_cache = {}
+        self.image_cache = util.image_util.menu_image_cache
     
     def get_image(self, url):
         """ Get image from cache by specified url 
@@ -37,11 +195,7 @@ class Cache(object):
         :param url: image url 
         :return: image if in cache, None if not in cache
         """
-        with self.lock:
-            try:
-                return self.image_cache[url]
-            except:
-                return None
+        return self.image_cache.get(url)
         
     def cache_image(self, img, url):
         """ Save image in cache 
@@ -49,11 +203,6 @@ class Cache(object):
         :param img: image to cache
         :param url: image url 
         """
-        with self.lock:
-            new_url = url.encode("utf-8")
-            h = self.util.get_hash(new_url)
-            if h in self.cached_images_hashes:
-                return
-            self.image_cache[url] = img
-            self.cached_images_hashes.append(h)
-            
+        if url in self.image_cache:
+            return
+        self.image_cache[url] = img
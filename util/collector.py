@@ -22,6 +22,8 @@ import sqlite3
 
 from timeit import default_timer as timer
 from datetime import timedelta
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from mutagen import File
 from mutagen.mp4 import MP4
 
@@ -29,6 +31,8 @@ from mutagen.mp4 import MP4
 
 DEFAULT_TABLE_NAME = "metadata"
 DEFAULT_SUMMARY_TABLE_NAME = "summary"
+DEFAULT_FOLDERS_TABLE_NAME = "folders"
+DEFAULT_SEARCH_TABLE_NAME = "search"
 FOLDER = "folder"
 FILENAME = "filename"
 TYPE = "type"
@@ -41,13 +45,19 @@ TITLE = "title"
 DATE = "date"
 BASEFOLDER = "basefolder"
 ORIGINOS = "originos"
+SIZE = "size"
+MTIME = "mtime"
 EXTENSIONS = (".aac", ".ac3", ".aiff", ".ape", ".flac", ".m4a", ".mp3", ".ogg", ".opus", ".wav", ".wma", ".wv")
 METADATA = [GENRE, ALBUM, COMPOSER, ARTIST, PERFORMER, TITLE, DATE]
 MP4_METADATA = ["\xa9gen", "\xa9alb", "\xa9wrt", "\xa9ART", "aART", "\xa9nam", "\xa9day"]
 INFO = ["sample_rate", "channels", "bits_per_sample", "length", "bitrate"]
 ALL_METADATA = [FOLDER, FILENAME, TYPE]
 ALL_METADATA.extend(METADATA + INFO)
+FILE_INFO = [SIZE, MTIME]
 SUMMARY = [BASEFOLDER, ORIGINOS, GENRE, ARTIST, COMPOSER, ALBUM, TITLE, DATE, TYPE, FOLDER, FILENAME]
+INDEXED_METADATA = [GENRE, ARTIST, COMPOSER, ALBUM, TITLE, DATE, TYPE, FILENAME]
+SEARCH_METADATA = [GENRE, ARTIST, COMPOSER, ALBUM, TITLE, FOLDER, FILENAME]
+PRAGMAS = ["journal_mode=WAL", "synchronous=NORMAL", "cache_size=-8192", "mmap_size=67108864", "temp_store=MEMORY"]
 
 # Collector constants
 
@@ -74,11 +84,15 @@ PROGRESS_BAR_PREFIX = "Progress:"
 PROGRESS_BAR_SUFFIX = "Complete"
 PROGRESS_BAR_LENGTH = 50
 BATCH_SIZE = 300
+DEFAULT_WORKERS = 1
+TASKS_PER_WORKER = 16
 FILE_BATCH_SIZE = 50
 FULL_BLOCK_CHARACTER = chr(9608)
 ADDED_PREFIX = "Added:"
 ADDED_SUFFIX = "file"
 UPDATE_TIME = "Update time (h:mm:ss):"
+UPDATED_FILES = "Updated files: "
+DELETED_FILES = "Deleted files: "
 
 class DbUtil(object):
     """ Database utility class. Keeps the connection to the database and provides utility SQL functions. """
@@ -91,18 +105,46 @@ class DbUtil(object):
         self.db_path = db_filename
         self.table_name = DEFAULT_TABLE_NAME
         self.summary_table_name = DEFAULT_SUMMARY_TABLE_NAME
+        self.folders_table_name = DEFAULT_FOLDERS_TABLE_NAME
+        self.search_table_name = DEFAULT_SEARCH_TABLE_NAME
+        self.search_available = False
         self.metadata_keys = METADATA
         self.info_keys = INFO
 
-        csv = ",".join([m + " text" for m in ALL_METADATA])
+        csv = ",".join([m + " text" for m in ALL_METADATA] + [m + " numeric" for m in FILE_INFO])
         self.CREATE_METADATA_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.table_name} (id integer PRIMARY KEY,{csv});"""
+        self.CREATE_FILE_INDEX = f"""CREATE INDEX IF NOT EXISTS {self.table_name}_{FOLDER}_{FILENAME} ON {self.table_name}({FOLDER},{FILENAME});"""
 
         csv = ",".join([m + " text" for m in SUMMARY])
         self.CREATE_SUMMARY_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.summary_table_name} ({csv});"""
 
-        csv = ",".join([m for m in ALL_METADATA])
-        values = ",".join(["?" for _ in ALL_METADATA])
+        self.CREATE_FOLDERS_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.folders_table_name} ({FOLDER} text PRIMARY KEY,{MTIME} numeric);"""
+
+        self.CREATE_INDEXES = [f"""CREATE INDEX IF NOT EXISTS {self.table_name}_{m} ON {self.table_name}({m},{FOLDER});""" for m in INDEXED_METADATA]
+        self.CREATE_INDEXES += [f"""CREATE INDEX IF NOT EXISTS {self.table_name}_{m}_key ON {self.table_name}(LOWER(TRIM({m})));""" for m in INDEXED_METADATA]
+
+        csv = ",".join(SEARCH_METADATA)
+        new_csv = ",".join(["new." + m for m in SEARCH_METADATA])
+        old_csv = ",".join(["old." + m for m in SEARCH_METADATA])
+        self.CREATE_SEARCH_TABLE = f"""CREATE VIRTUAL TABLE IF NOT EXISTS {self.search_table_name} USING fts5({csv},
+            content='{self.table_name}', content_rowid='id', tokenize='trigram');"""
+        self.REBUILD_SEARCH_TABLE = f"""INSERT INTO {self.search_table_name}({self.search_table_name}) VALUES('rebuild');"""
+        insert_search = f"""INSERT INTO {self.search_table_name}(rowid,{csv}) VALUES(new.id,{new_csv});"""
+        delete_search = f"""INSERT INTO {self.search_table_name}({self.search_table_name},rowid,{csv}) VALUES('delete',old.id,{old_csv});"""
+        self.CREATE_SEARCH_TRIGGERS = [
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table_name}_insert AFTER INSERT ON {self.table_name} BEGIN {insert_search} END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table_name}_delete AFTER DELETE ON {self.table_name} BEGIN {delete_search} END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table_name}_update AFTER UPDATE OF {csv} ON {self.table_name}
+                BEGIN {delete_search} {insert_search} END;"""
+        ]
+
+        csv = ",".join([m for m in ALL_METADATA + FILE_INFO])
+        values = ",".join(["?" for _ in ALL_METADATA + FILE_INFO])
         self.INSERT_DATA = f"""INSERT INTO {self.table_name}({csv}) VALUES({values});"""
+        self.UPDATE_FILE_INFO = f"""UPDATE {self.table_name} SET {SIZE} = ?, {MTIME} = ? WHERE id = ?;"""
+        self.DELETE_DATA = f"""DELETE FROM {self.table_name} WHERE id = ?;"""
+        self.INSERT_FOLDER = f"""INSERT OR REPLACE INTO {self.folders_table_name}({FOLDER},{MTIME}) VALUES(?,?);"""
+        self.DELETE_FOLDER = f"""DELETE FROM {self.folders_table_name} WHERE {FOLDER} = ?;"""
 
         csv = ",".join([m for m in SUMMARY])
         values = ",".join(["?" for _ in SUMMARY])
@@ -127,7 +169,16 @@ class DbUtil(object):
 
         :return: True - table exists, False - table doesn't exist
         """
-        query = f"""SELECT name FROM sqlite_master WHERE type='table' AND name='{self.table_name}';"""
+        return self.is_table_available(self.table_name)
+
+    def is_table_available(self, table_name):
+        """ Check if table exists
+
+        :param table_name: table name
+
+        :return: True - table exists, False - table doesn't exist
+        """
+        query = f"""SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';"""
         if self.run_query(query):
             return True
         else:
@@ -139,11 +190,64 @@ class DbUtil(object):
         try:
             self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             logging.debug(f"""Connected to the collection database {self.db_path}""")
+            self.set_pragmas()
             if not self.is_metadata_available():
                 logging.debug("Collection tables don't exist")
                 self.run_command(self.CREATE_METADATA_TABLE)
                 self.run_command(self.CREATE_SUMMARY_TABLE)
                 logging.debug("Created collection tables")
+            self.upgrade_tables()
+        except Exception as e:
+            logging.debug(e)
+
+    def set_pragmas(self):
+        """ Switch to WAL journal and set cache and memory mapping sizes """
+
+        for pragma in PRAGMAS:
+            try:
+                self.conn.execute("PRAGMA " + pragma)
+            except Exception as e:
+                logging.debug(e)
+
+    def upgrade_tables(self):
+        """ Add file info columns, folders table, indexes and search table to the database created by previous versions """
+
+        columns = self.run_query(f"""PRAGMA table_info({self.table_name})""")
+        if columns:
+            names = [c[1] for c in columns]
+            for c in FILE_INFO:
+                if c not in names:
+                    self.run_command(f"""ALTER TABLE {self.table_name} ADD COLUMN {c} numeric""")
+                    logging.debug(f"""Added column {c}""")
+
+        self.run_command(self.CREATE_FOLDERS_TABLE)
+        self.run_command(self.CREATE_FILE_INDEX)
+        for command in self.CREATE_INDEXES:
+            self.run_command(command)
+        self.create_search_table()
+
+    def create_search_table(self):
+        """ Create full text search table and triggers which keep it in sync with the metadata table.
+        The search is not available if SQLite was built without FTS5 or trigram tokenizer.
+        """
+        if not self.is_table_available(self.search_table_name):
+            self.run_command(self.CREATE_SEARCH_TABLE)
+            if not self.is_table_available(self.search_table_name):
+                logging.debug("Full text search is not available")
+                self.search_available = False
+                return
+            self.run_command(self.REBUILD_SEARCH_TABLE)
+            logging.debug("Created search table")
+
+        for command in self.CREATE_SEARCH_TRIGGERS:
+            self.run_command(command)
+        self.search_available = True
+
+    def optimize(self):
+        """ Update query planner statistics """
+
+        try:
+            self.conn.execute("PRAGMA optimize")
         except Exception as e:
             logging.debug(e)
 
@@ -175,14 +279,49 @@ class DbUtil(object):
 
         :param params: list of values for multiple inserts
         """
+        self.run_batch_command(self.INSERT_DATA, params)
+
+    def run_batch_command(self, command, params):
+        """ Run the same SQL command for multiple values in transaction. Rollback if exception.
+
+        :param command: SQL command
+        :param params: list of values
+        """
         try:
             self.conn.execute("begin")
-            self.conn.executemany(self.INSERT_DATA, params)
+            self.conn.executemany(command, params)
             self.conn.commit()
         except Exception as e:
             self.conn.execute("rollback")
             logging.debug(e)
 
+    def get_files_info(self):
+        """ Load ID, size and modification time for all files in the metadata table
+
+        :return: dictionary where key - folder, value - dictionary with key - filename, value - (id, size, mtime)
+        """
+        result = self.run_query(f"""SELECT id, {FOLDER}, {FILENAME}, {SIZE}, {MTIME} FROM {self.table_name}""")
+        files = {}
+
+        if not result:
+            return files
+
+        for r in result:
+            folder = files.setdefault(r[1], {})
+            folder[r[2]] = (r[0], r[3], r[4])
+
+        return files
+
+    def get_folders_mtimes(self):
+        """ Load modification times of the scanned folders
+
+        :return: dictionary where key - folder, value - modification time
+        """
+        result = self.run_query(f"""SELECT {FOLDER}, {MTIME} FROM {self.folders_table_name}""")
+        if not result:
+            return {}
+        return {r[0]: r[1] for r in result}
+
     def run_query(self, query):
         """ Run SELECT query
 
@@ -265,8 +404,13 @@ class DbUtil(object):
         self.run_command(command)
         command = f"""DROP TABLE IF EXISTS {self.summary_table_name}"""
         self.run_command(command)
+        command = f"""DROP TABLE IF EXISTS {self.folders_table_name}"""
+        self.run_command(command)
+        command = f"""DROP TABLE IF EXISTS {self.search_table_name}"""
+        self.run_command(command)
         self.run_command(self.CREATE_METADATA_TABLE)
         self.run_command(self.CREATE_SUMMARY_TABLE)
+        self.upgrade_tables()
         logging.debug("Collection deleted")
 
     def delete_summary_data(self):
@@ -276,6 +420,117 @@ class DbUtil(object):
         self.run_command(command)
         logging.debug("Summary data deleted")
 
+def get_file_metadata(folder, filename, ext, meta, file_stat=None):
+    """ Prepare audio file metadata
+
+    :param folder: file folder
+    :param filename: file name
+    :param ext: file extension
+    :param meta: file metadata from mutagen
+    :param file_stat: file stat result used to get size and modification time
+
+    :return: file metadata list of values for insert
+    """
+    metadata = get_tags(folder, filename, ext, meta)
+
+    if file_stat:
+        metadata.extend([file_stat.st_size, file_stat.st_mtime])
+    else:
+        metadata.extend([None for _ in FILE_INFO])
+
+    return metadata
+
+def get_tags(folder, filename, ext, meta):
+    """ Prepare audio file tags and info
+
+    :param folder: file folder
+    :param filename: file name
+    :param ext: file extension
+    :param meta: file metadata from mutagen
+
+    :return: list of values for all ALL_METADATA columns
+    """
+    metadata = []
+
+    if not folder: # file in the base folder
+        folder = os.sep
+
+    metadata.append(folder)
+    metadata.append(filename)
+    metadata.append(ext)
+
+    if meta == None:
+        for _ in range(len(ALL_METADATA) - len(metadata)):
+            metadata.append(None)
+        return metadata
+
+    if filename.lower().endswith(".mp4") or filename.lower().endswith(".m4a"):
+        m = MP4_METADATA
+    else:
+        m = METADATA
+
+    for key in m:
+        if meta and (key not in meta.keys() or len(meta[key][0].replace(" ", "").strip()) == 0):
+            v = None
+        else:
+            v = meta[key][0].strip()
+        metadata.append(v)
+
+    if hasattr(meta, "info"):
+        for key in INFO:
+            metadata.append(getattr(meta.info, key, None))
+    else:
+        for _ in INFO:
+            metadata.append(None)
+
+    return metadata
+
+def parse_file(path, ext, errors):
+    """ Parse audio file metadata with mutagen
+
+    :param path: file path
+    :param ext: file extension
+    :param errors: list of errors to add parsing error to
+
+    :return: mutagen metadata or None if parsing failed
+    """
+    try:
+        if ext == "mp4" or ext == "m4a":
+            return MP4(path)
+        else:
+            return File(path, easy=True)
+    except Exception as e:
+        msg = f"""Metadata parsing error in file {os.path.basename(path)}: {e}"""
+        errors.append(msg)
+        return None
+
+def get_stat(path):
+    """ Get file or folder stat
+
+    :param path: file or folder path
+
+    :return: stat result or None if not available
+    """
+    try:
+        return os.stat(path)
+    except Exception as e:
+        logging.debug(e)
+        return None
+
+def extract_file_metadata(task):
+    """ Parse metadata of one audio file. Module level function is used by the process pool workers.
+
+    :param task: tuple (folder path, folder name in collection, filename)
+
+    :return: tuple (metadata row for insert, list of errors)
+    """
+    current_folder, folder, file = task
+    errors = []
+    ext = file[file.rfind('.') + 1:].lower()
+    p = os.path.join(current_folder, file)
+    meta = parse_file(p, ext, errors)
+    return (get_file_metadata(folder, file, ext, meta, get_stat(p)), errors)
+
 class Collector(object):
     """ Collects audio files metadata and inserts into the database. Reports statistics. """
 
@@ -363,58 +618,83 @@ class Collector(object):
 
         return collection_stats
 
-    def get_file_metadata(self, folder, filename, ext, meta):
-        """ Prepare audio file metadata
+    def extract_metadata(self, tasks, workers=DEFAULT_WORKERS, threads=False):
+        """ Extract metadata for the audio files using pool of workers. The results are returned
+        in the same order as tasks. Generator.
 
-        :param folder: file folder
-        :param filename: file name
-        :param ext: file extension
-        :param meta: file metadata from mutagen
+        :param tasks: iterable of (task, tag) tuples. Task is the input for extract_file_metadata function
+            or None if item is used only to pass the tag through the pipeline
+        :param workers: number of workers, 1 - parse files in the current thread
+        :param threads: True - use thread pool (better for network disks), False - use process pool
 
-        :return: file metadata list of values for insert
+        :return: (tag, result) tuples, result is the output of extract_file_metadata function or None
         """
-        metadata = []
+        if workers <= 1:
+            for task, tag in tasks:
+                if task:
+                    yield (tag, extract_file_metadata(task))
+                else:
+                    yield (tag, None)
+            return
 
-        if not folder: # file in the base folder
-            folder = os.sep
+        if threads:
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
 
-        metadata.append(folder)
-        metadata.append(filename)
-        metadata.append(ext)
+        pending = deque()
+        max_pending = workers * TASKS_PER_WORKER
 
-        if meta == None:
-            for _ in range(len(ALL_METADATA) - len(metadata)):
-                metadata.append(None)
-            return metadata
+        with pool:
+            for task, tag in tasks:
+                if task:
+                    pending.append((pool.submit(extract_file_metadata, task), tag))
+                else:
+                    pending.append((None, tag))
 
-        if filename.lower().endswith(".mp4") or filename.lower().endswith(".m4a"):
-            m = MP4_METADATA
-        else:
-            m = METADATA
+                while len(pending) > max_pending:
+                    future, t = pending.popleft()
+                    yield (t, future.result() if future else None)
 
-        for key in m:
-            if meta and (key not in meta.keys() or len(meta[key][0].replace(" ", "").strip()) == 0):
-                v = None
-            else:
-                v = meta[key][0].strip()
-            metadata.append(v)
+            while pending:
+                future, t = pending.popleft()
+                yield (t, future.result() if future else None)
 
-        if hasattr(meta, "info"):
-            for key in INFO:
-                metadata.append(getattr(meta.info, key, None))
-        else:
-            for _ in INFO:
-                metadata.append(None)
+    def get_collection_tasks(self, base_folder, folders):
+        """ Walk through the base folder and prepare metadata extraction tasks. Generator.
 
-        return metadata
+        :param base_folder: base folder
+        :param folders: list to add (folder, modification time) values to
+
+        :return: (task, None) tuple for each audio file, (None, folder number) after each folder
+        """
+        scanned_folders = 0
+
+        for current_folder, _, files in os.walk(base_folder, followlinks=True):
+            scanned_folders += 1
+            meta_folder = current_folder[len(base_folder):]
+            folder_stat = get_stat(current_folder)
+            if folder_stat:
+                folders.append((meta_folder or os.sep, folder_stat.st_mtime))
 
-    def collect_metadata(self, base_folder, total_folders, metadata_callback=None, progress_callback=None):
+            for file in files:
+                if not file.lower().endswith(EXTENSIONS):
+                    continue
+                yield ((current_folder, meta_folder, file), None)
+
+            yield (None, scanned_folders)
+
+    def collect_metadata(self, base_folder, total_folders, metadata_callback=None, progress_callback=None, folders_callback=None,
+        workers=DEFAULT_WORKERS, threads=False):
         """ Collect audio file metadata
 
         :param base_folder: base folder
         :param base_folder: total number of subfolders
         :param metadata_callback: callback for reporting progress, called when BATCH_SIZE reached
         :param progress_callback: callback for reporting progress, called for each new folder
+        :param folders_callback: callback which receives the list of (folder, modification time) values
+        :param workers: number of metadata extraction workers
+        :param threads: True - use threads for metadata extraction, False - use processes
 
         :return: dictionary with statistics
         """
@@ -431,49 +711,37 @@ class Collector(object):
             logging.debug(f"""Folder {base_folder} not found""")
             return
 
-        for current_folder, _, files in os.walk(base_folder, followlinks=True):
-            scanned_folders += 1
-            for file in files:
-                if not file.lower().endswith(EXTENSIONS):
-                    continue
+        folders = []
+        tasks = self.get_collection_tasks(base_folder, folders)
 
-                ext = file[file.rfind('.') + 1:]
-                ext = ext.lower()
-                meta = None
-                try:
-                    p = os.path.join(current_folder, file)
-                    if ext == "mp4" or ext == "m4a":
-                        meta = MP4(p)
-                    else:
-                        meta = File(p, easy=True)
-                except Exception as e:
-                    msg = f"""Metadata parsing error in file {file}: {e}"""
-                    errors.append(msg)
-
-                meta_folder = current_folder[len(base_folder):]
-                if meta:
-                    m = self.get_file_metadata(meta_folder, file, ext, meta)
-                    metadata.append(m)
-                else:
-                    metadata.append(self.get_file_metadata(meta_folder, file, ext, None))
+        for tag, result in self.extract_metadata(tasks, workers, threads):
+            if result == None:
+                scanned_folders = tag
+                if progress_callback:
+                    progress_callback(scanned_folders, total_folders)
+                continue
 
-                num += 1
-                total_files += 1
+            row, file_errors = result
+            metadata.append(row)
+            errors.extend(file_errors)
 
-                if num == BATCH_SIZE:
-                    if metadata_callback:
-                        metadata_callback(metadata)
-                    metadata = []
-                    num = 0
+            num += 1
+            total_files += 1
 
-            if progress_callback:
-                progress_callback(scanned_folders, total_folders)
+            if num == BATCH_SIZE:
+                if metadata_callback:
+                    metadata_callback(metadata)
+                metadata = []
+                num = 0
 
         end = timer()
 
         if metadata_callback and metadata:
             metadata_callback(metadata)
 
+        if folders_callback and folders:
+            folders_callback(folders)
+
         stats = {
             SCANNED_FOLDERS: scanned_folders,
             TOTAL_FILES: total_files,
@@ -506,13 +774,15 @@ class Collector(object):
         self.dbutil.run_command(self.dbutil.INSERT_SUMMARY_DATA, values)
         logging.debug("Summary created")
 
-    def create_collection(self, base_folder, total_folders, db_filename, progress_callback=None):
+    def create_collection(self, base_folder, total_folders, db_filename, progress_callback=None, workers=DEFAULT_WORKERS, threads=False):
         """ Create the database collection with audio files metadata
 
         :param base_folder: collection base folder
         :param total_folders: total number of the subfolders in the base folder
         :param db_filename: collection database filename
         :param progress_callback: callback for reporting progress
+        :param workers: number of metadata extraction workers
+        :param threads: True - use threads for metadata extraction, False - use processes
 
         :return: dictionary with collection database statistics
         """
@@ -524,19 +794,34 @@ class Collector(object):
         self.dbutil.connect()
 
         logging.debug("Creating collection")
-        stats = self.collect_metadata(base_folder, total_folders, self.dbutil.run_batch_insert, progress_callback)
+        stats = self.collect_metadata(base_folder, total_folders, self.dbutil.run_batch_insert, progress_callback, self.save_folders,
+            workers, threads)
         logging.debug("Collection created")
         self.create_summary(base_folder)
+        self.dbutil.optimize()
         logging.debug("Creation process completed")
         return stats
 
-    def update_collection(self, base_folder, total_folders, progress_callback=None):
-        """ Go through the base folder/sub-folders and check if the files exist in the database. 
-            If not add the audio files metadata to the database.
+    def save_folders(self, folders):
+        """ Save folders modification times
+
+        :param folders: list of (folder, modification time) values
+        """
+        self.dbutil.run_batch_command(self.dbutil.INSERT_FOLDER, folders)
+
+    def update_collection(self, base_folder, total_folders, progress_callback=None, check_files=False, workers=DEFAULT_WORKERS,
+        threads=False):
+        """ Incremental update of the collection database. Go through the base folder/sub-folders and
+            compare files with the files in the database using size and modification time.
+            Only new and modified files are parsed. Deleted files are removed from the database.
 
         :param base_folder: collection base folder
         :param total_folders: total number of the subfolders in the base folder
         :param progress_callback: callback for reporting progress
+        :param check_files: False - skip folders which modification time didn't change,
+            True - check all files (detects files modified in place)
+        :param workers: number of metadata extraction workers
+        :param threads: True - use threads for metadata extraction, False - use processes
 
         :return: dictionary with collection database statistics
         """
@@ -546,10 +831,15 @@ class Collector(object):
 
         metadata = []
         errors = []
-        num = 0
         scanned_folders = 0
         start = timer()
         new_files_added = 0
+        updated_files = 0
+        deleted_files = 0
+        file_info_updates = []
+        deleted_ids = []
+        folders = []
+        tasks = []
 
         if not base_folder:
             base_folder = os.getcwd()
@@ -557,69 +847,102 @@ class Collector(object):
             logging.debug(f"""Folder {base_folder} not found""")
             return None
 
-        query = f"""
-            SELECT COUNT(DISTINCT ID)
-            FROM {self.dbutil.table_name} 
-            WHERE FOLDER = ? AND FILENAME = ?
-        """
+        known_files = self.dbutil.get_files_info()
+        known_folders = self.dbutil.get_folders_mtimes()
+        visited_folders = set()
 
         for current_folder, _, files in os.walk(base_folder, followlinks=True):
             scanned_folders += 1
+            folder = current_folder[len(base_folder):] or os.sep
+            visited_folders.add(folder)
+            db_files = known_files.pop(folder, {})
+            folder_stat = get_stat(current_folder)
+
+            if not check_files and folder_stat and known_folders.get(folder, None) == folder_stat.st_mtime:
+                if progress_callback:
+                    progress_callback(scanned_folders, total_folders + len(tasks))
+                continue
+
             for file in files:
                 if not file.lower().endswith(EXTENSIONS):
                     continue
 
-                ext = file[file.rfind('.') + 1:]
-                ext = ext.lower()
-                meta = None
+                p = os.path.join(current_folder, file)
+                file_stat = get_stat(p)
+                db_file = db_files.pop(file, None)
+
+                if db_file and file_stat:
+                    id, size, mtime = db_file
+                    if size == None and mtime == None:
+                        file_info_updates.append((file_stat.st_size, file_stat.st_mtime, id))
+                        continue
+                    elif size == file_stat.st_size and mtime == file_stat.st_mtime:
+                        continue
+                    deleted_ids.append((id,))
+                    updated_files += 1
+                else:
+                    new_files_added += 1
 
-                folder = current_folder[len(base_folder):]
-                filename = file
+                tasks.append(((current_folder, folder, file), None))
 
-                result = self.dbutil.run_parameterized_query(query, (folder, filename))
-                if result and int(result[0][0]) == 1:
-                    continue
+            for id, _, _ in db_files.values():
+                deleted_ids.append((id,))
+                deleted_files += 1
 
-                try:
-                    p = os.path.join(current_folder, file)
-                    if ext == "mp4" or ext == "m4a":
-                        meta = MP4(p)
-                    else:
-                        meta = File(p, easy=True)
-                except Exception as e:
-                    msg = f"""Metadata parsing error in file {file}: {e}"""
-                    errors.append(msg)
-
-                if meta:
-                    m = self.get_file_metadata(folder, file, ext, meta)
-                    metadata.append(m)
-                else:
-                    metadata.append(self.get_file_metadata(folder, file, ext, None))
+            if folder_stat:
+                folders.append((folder, folder_stat.st_mtime))
+
+            if progress_callback:
+                progress_callback(scanned_folders, total_folders + len(tasks))
+
+        for db_files in known_files.values():
+            for id, _, _ in db_files.values():
+                deleted_ids.append((id,))
+                deleted_files += 1
+
+        if deleted_ids:
+            self.dbutil.run_batch_command(self.dbutil.DELETE_DATA, deleted_ids)
 
-                num += 1
+        parsed_files = 0
+        total = scanned_folders + len(tasks) # the work is the walked folders and the files to parse
 
-                if num == BATCH_SIZE:
-                    self.dbutil.run_batch_insert(metadata)
-                    logging.debug(metadata)
-                    new_files_added += len(metadata)
-                    metadata = []
-                    num = 0
+        for _, result in self.extract_metadata(tasks, workers, threads):
+            row, file_errors = result
+            metadata.append(row)
+            errors.extend(file_errors)
+            parsed_files += 1
 
             if progress_callback:
-                progress_callback(scanned_folders, total_folders)
+                progress_callback(scanned_folders + parsed_files, total)
 
-        end = timer()
+            if len(metadata) == BATCH_SIZE:
+                self.dbutil.run_batch_insert(metadata)
+                metadata = []
 
         if metadata:
             self.dbutil.run_batch_insert(metadata)
-            new_files_added += len(metadata)
 
-        if new_files_added > 0:
+        if file_info_updates:
+            self.dbutil.run_batch_command(self.dbutil.UPDATE_FILE_INFO, file_info_updates)
+
+        vanished_folders = [(f,) for f in known_folders.keys() if f not in visited_folders]
+        if vanished_folders:
+            self.dbutil.run_batch_command(self.dbutil.DELETE_FOLDER, vanished_folders)
+
+        if folders:
+            self.save_folders(folders)
+
+        end = timer()
+
+        if new_files_added > 0 or updated_files > 0 or deleted_files > 0:
             self.dbutil.delete_summary_data()
             self.create_summary(base_folder)
+            self.dbutil.optimize()
 
         stats = {
             TOTAL_FILES: new_files_added,
+            UPDATED_FILES: updated_files,
+            DELETED_FILES: deleted_files,
             PARSING_TIME: timedelta(seconds=(end - start)),
             ERRORS: errors
         }
@@ -689,7 +1012,7 @@ class Collector(object):
         n = int((STARS - 2 - len(header)) / 2)
         s = "\n\n" + "*" * n + " " + header + " " + "*" * n
 
-        if not stats or int(stats[TOTAL_FILES]) == 0:
+        if not stats or (int(stats[TOTAL_FILES]) == 0 and not stats.get(UPDATED_FILES) and not stats.get(DELETED_FILES)):
             s += f"""\n\n{UP_TO_DATE}\n"""
             s += "\n" + "*" * STARS
             logging.debug(s)
@@ -701,6 +1024,8 @@ class Collector(object):
             suffix = ADDED_SUFFIX
 
         s += f"""\n\n{ADDED_PREFIX} {stats[TOTAL_FILES]} {suffix}"""
+        s += f"""\n{UPDATED_FILES}{stats.get(UPDATED_FILES, 0)}"""
+        s += f"""\n{DELETED_FILES}{stats.get(DELETED_FILES, 0)}"""
         s += f"""\n{UPDATE_TIME} {stats[PARSING_TIME]}"""
         s += f"""\n{ERRORS} {len(stats[ERRORS])}\n"""
         s += "\n" + "*" * STARS
@@ -793,6 +1118,12 @@ def main():
         create collection database using specified folder and database filename
     python collector.py update -i c:\\music -o c:\peppy.db
         update collection database using specified folder and database filename
+    python collector.py update -i c:\\music -o c:\peppy.db -c
+        update collection database checking all files, not only files in modified folders
+    python collector.py create -i c:\\music -o c:\peppy.db -w 4
+        create collection database parsing files in 4 processes
+    python collector.py create -i z:\\music -o c:\peppy.db -w 8 -t
+        create collection database parsing files in 8 threads (network disk)
     """
     parser = argparse.ArgumentParser(
         usage=usage,
@@ -810,10 +1141,15 @@ def main():
     p = subparsers.add_parser("create", help="create collection database")
     p.add_argument("-i", help="audio files root folder", required=True)
     p.add_argument("-o", help="collection database filename", required=True)
+    p.add_argument("-w", help="number of metadata parsing workers", type=int, default=DEFAULT_WORKERS)
+    p.add_argument("-t", help="use threads instead of processes for parsing", action="store_true")
 
     p = subparsers.add_parser("update", help="update collection database")
     p.add_argument("-i", help="audio files root folder", required=True)
     p.add_argument("-o", help="collection database filename", required=True)
+    p.add_argument("-c", help="check all files", action="store_true")
+    p.add_argument("-w", help="number of metadata parsing workers", type=int, default=DEFAULT_WORKERS)
+    p.add_argument("-t", help="use threads instead of processes for parsing", action="store_true")
 
     try:
         args = parser.parse_args()
@@ -853,7 +1189,7 @@ def main():
         coll.dbutil.connect()
         n = coll.count_folders(base_folder)
         if n:
-            stats = coll.create_collection(base_folder, n[0], db_filename, coll.print_progress_bar)
+            stats = coll.create_collection(base_folder, n[0], db_filename, coll.print_progress_bar, args.w, args.t)
             coll.print_metadata_statistics(stats)
     elif command == "update":        
         base_folder = args.i
@@ -869,7 +1205,7 @@ def main():
         coll.dbutil.connect()        
         n = coll.count_folders(base_folder)
         if n:
-            stats = coll.update_collection(base_folder, n[0], coll.print_progress_bar)
+            stats = coll.update_collection(base_folder, n[0], coll.print_progress_bar, args.c, args.w, args.t)
             coll.print_update_statistics(stats, UPDATE_STATISTICS)
         
 if __name__ == '__main__':
@@ -36,6 +36,7 @@ FOLDER_LANGUAGES = "languages"
 FOLDER_RADIO_STATIONS = "radio-stations"
 FOLDER_BACKGROUNDS = "backgrounds"
 FOLDER_PLAYLISTS = "playlists"
+FOLDER_CACHE = "cache"
 
 FILE_LABELS = "labels.properties"
 FILE_VOICE_COMMANDS = "voice-commands.properties"
@@ -82,6 +83,7 @@ USE_CHECK_FOR_UPDATES = "check.for.updates"
 USE_BLUETOOTH = "bluetooth"
 USE_SAMBA = "samba"
 USE_DNS_IP = "dns.ip"
+USE_IMAGE_CACHE_SIZE = "image.cache.size"
 USE_CLOCK_SCREENSAVER_IN_TIMER = "use.clock.screensaver.in.timer"
 
 LOGGING = "logging"
@@ -915,6 +917,7 @@ class Config(object):
         c[USE_BLUETOOTH] = config_file.getboolean(USAGE, USE_BLUETOOTH)
         c[USE_SAMBA] = config_file.getboolean(USAGE, USE_SAMBA)
         c[USE_DNS_IP] = config_file.get(USAGE, USE_DNS_IP)
+        c[USE_IMAGE_CACHE_SIZE] = config_file.getint(USAGE, USE_IMAGE_CACHE_SIZE)
         c[USE_CLOCK_SCREENSAVER_IN_TIMER] = config_file.getboolean(USAGE, USE_CLOCK_SCREENSAVER_IN_TIMER)
         config[USAGE] = c
         
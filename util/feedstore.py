@@ -0,0 +1,100 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+
+from threading import RLock
+from util.cache import MEGABYTE
+from util.httpcache import HttpCache
+
+FEEDS_CACHE_SIZE = 16 * MEGABYTE
+FEEDS_REVALIDATION_PERIOD = 60 * 60
+FEEDS_THREADS = 4
+VARIANT_PARSED = "parsed.json"
+
+class FeedStore(object):
+    """ Persistent store of the parsed feeds. The feeds are downloaded by HTTP cache which
+    revalidates them using conditional requests. Each feed version is parsed once, the result
+    is saved on disk next to the feed and kept in memory.
+    """
+
+    def __init__(self, folder, parse):
+        """ Initializer
+
+        :param folder: store folder
+        :param parse: function which converts feed content into JSON serializable object or None
+        """
+        self.parse = parse
+        self.http_cache = HttpCache(folder, FEEDS_CACHE_SIZE, FEEDS_REVALIDATION_PERIOD, FEEDS_THREADS)
+        self.lock = RLock()
+        self.feeds = {}
+
+    def load(self, urls):
+        """ Download concurrently the feeds which are not in the store yet.
+        The stored feeds are revalidated in background when they get old.
+
+        :param urls: list of feed URLs
+        """
+        missing = [url for url in urls if url and self.http_cache.get_hash(url) == None]
+        if missing:
+            self.http_cache.refresh(missing)
+
+    def refresh(self, urls):
+        """ Revalidate all feeds concurrently and wait for completion
+
+        :param urls: list of feed URLs
+        """
+        self.http_cache.refresh(urls)
+
+    def get_feed(self, url):
+        """ Get parsed feed
+
+        :param url: feed URL
+
+        :return: parsed feed or None
+        """
+        content_hash = self.http_cache.check(url)
+        if content_hash != None:
+            with self.lock:
+                cached = self.feeds.get(url, None)
+                if cached and cached[0] == content_hash:
+                    return cached[1]
+
+        feed = None
+        if content_hash != None:
+            parsed = self.http_cache.get_variant(url, VARIANT_PARSED)
+            if parsed != None:
+                try:
+                    feed = json.loads(parsed.decode("utf-8"))
+                except Exception as e:
+                    logging.debug(e)
+
+        if feed == None:
+            data = self.http_cache.get(url)
+            if data == None:
+                return None
+            feed = self.parse(data)
+            if feed == None:
+                return None
+            content_hash = self.http_cache.get_hash(url)
+            self.http_cache.put_variant(url, VARIANT_PARSED, json.dumps(feed).encode("utf-8"))
+
+        with self.lock:
+            self.feeds[url] = (content_hash, feed)
+
+        return feed
@@ -21,6 +21,8 @@ import re
 import codecs
 import logging
 
+from threading import RLock
+from collections import OrderedDict
 from operator import attrgetter
 from re import compile
 from ui.state import State
@@ -46,6 +48,9 @@ WINDOWS = "windows"
 WINDOWS_DISK_SUFFIX = ":\\"
 HIDDEN_FOLDER_PREFIXES = [".", "$", "System Volume Information"]
 RE_HIDDEN_FOLDER_PREFIXES = "|".join(re.escape(p) for p in HIDDEN_FOLDER_PREFIXES)
+MAX_CACHED_FOLDERS = 32
+MAX_CACHED_FOLDER_IMAGES = 1024
+MAX_CACHED_EMBEDDED_IMAGES = 4096
 
 class FileUtil(object):
     """ Utility class containing methods necessary for file playback """
@@ -70,6 +75,123 @@ class FileUtil(object):
 
         self.current_folder = self.config[FILE_PLAYBACK][CURRENT_FOLDER] or self.USER_HOME
         self.cre = compile(r'(\d+)') # compiled regular expression
+        self.lock = RLock()
+        self.folders_cache = OrderedDict()
+        self.folder_images_cache = OrderedDict()
+        self.embedded_images_cache = OrderedDict()
+
+    def put_in_cache(self, cache, key, value, max_size):
+        """ Put value in bounded cache and remove the oldest items
+
+        :param cache: cache dictionary
+        :param key: item key
+        :param value: item value
+        :param max_size: maximum number of items
+        """
+        with self.lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+
+    def get_folder_entries(self, folder_name):
+        """ Get folder entries. The names and types of the entries returned by os.scandir()
+        are cached until the folder modification time changes. The stat data is not cached
+        because the folder modification time doesn't change when the file is modified in place.
+
+        :param folder_name: folder name
+
+        :return: list of tuples (name, path, real path, is folder, is file)
+        """
+        mtime = os.stat(folder_name).st_mtime_ns
+
+        with self.lock:
+            cached = self.folders_cache.get(folder_name, None)
+            if cached and cached[0] == mtime:
+                self.folders_cache.move_to_end(folder_name)
+                return cached[1]
+
+        real_folder = os.path.realpath(folder_name)
+        entries = []
+        with os.scandir(folder_name) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    is_file = not is_dir and entry.is_file()
+                except OSError:
+                    continue
+                if entry.is_symlink():
+                    real_path = os.path.realpath(entry.path)
+                else:
+                    real_path = os.path.join(real_folder, entry.name)
+                entries.append((entry.name, entry.path, real_path, is_dir, is_file))
+
+        self.put_in_cache(self.folders_cache, folder_name, (mtime, entries), MAX_CACHED_FOLDERS)
+        return entries
+
+    def get_folder_image_path(self, folder, mtime):
+        """ Get the path to the image representing folder. The result is cached
+        until the folder modification time changes.
+
+        :param folder: folder path
+        :param mtime: folder modification time
+
+        :return: path to image file or None
+        """
+        with self.lock:
+            cached = self.folder_images_cache.get(folder, None)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        image_path = None
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.lower() in self.config[FOLDER_IMAGES]:
+                    image_path = os.path.realpath(entry.path)
+                    break
+
+        self.put_in_cache(self.folder_images_cache, folder, (mtime, image_path), MAX_CACHED_FOLDER_IMAGES)
+        return image_path
+
+    def has_embedded_image(self, file_path, mtime=None):
+        """ Check if audio file has embedded image. Only the tags are parsed, 
+        the image itself is not decoded. The result is cached by file modification time.
+
+        :param file_path: audio file path
+        :param mtime: file modification time
+
+        :return: True - file has embedded image, False - otherwise
+        """
+        if mtime == None:
+            try:
+                mtime = os.stat(file_path).st_mtime_ns
+            except Exception as e:
+                logging.debug(e)
+                return False
+
+        key = (file_path, mtime)
+        with self.lock:
+            result = self.embedded_images_cache.get(key, None)
+            if result != None:
+                return result
+
+        result = self.image_util.get_image_from_audio_file(file_path, return_buffer=True) != None
+        self.put_in_cache(self.embedded_images_cache, key, result, MAX_CACHED_EMBEDDED_IMAGES)
+        return result
+
+    def probe_embedded_images(self, states):
+        """ Set 'has_embedded_image' flag for audio files which were not probed yet.
+        It's used to probe only the items which are going to be shown.
+
+        :param states: list of state objects
+        """
+        if not states:
+            return
+
+        for s in states:
+            if getattr(s, "file_type", None) != FILE_AUDIO or getattr(s, "has_embedded_image", None) != None:
+                continue
+            s.has_embedded_image = self.has_embedded_image(os.path.join(s.folder, s.file_name))
     
     def get_windows_disks(self):
         """ Return disks available on Windows machine
@@ -143,12 +265,24 @@ class FileUtil(object):
                 return True
         return False
     
+    def normalize_folder_name(self, folder_name):
+        """ Add separator to the Windows disk name
+        
+        :param folder_name: folder name
+
+        :return: normalized folder name
+        """
+        if folder_name.endswith(":") and WINDOWS in self.platform:
+            return folder_name + "\\"
+        return folder_name
+
     def get_folder_content(self, folder_name, store_folder_name=True, load_images=True, show_file_details=False):
         """ Return the list representing folder content 
         
         :param folder_name: folder name
         :param store_folder_name: remember folder name
-        :param load_images: show if file has embedded image
+        :param load_images: True - embedded images can be probed later by probe_embedded_images(), 
+            False - files without embedded images
         :param show_file_details: show file details like size, time created and time modified
 
         :return:  
@@ -158,8 +292,7 @@ class FileUtil(object):
         if not os.path.exists(folder_name):
             return
         
-        if folder_name.endswith(":") and WINDOWS in self.platform:
-            folder_name += "\\"
+        folder_name = self.normalize_folder_name(folder_name)
         
         if store_folder_name:
             self.current_folder = folder_name
@@ -191,55 +324,44 @@ class FileUtil(object):
         if d:
             sort_order.reverse()
         
-        for f in os.listdir(folder_name):
+        for f, path, real_path, is_dir, is_file in self.get_folder_entries(folder_name):
             # hide folder images in icon view
             if f.lower() in self.config[FOLDER_IMAGES] and self.config[ENABLE_FOLDER_IMAGES]:
                 continue
 
-            file_path = os.path.join(folder_name, f)
-            real_path = os.path.realpath(file_path)
-            
             state = State()
             state.folder = folder_name
             state.file_type = FOLDER
             state.file_name = f
             state.url = real_path
-            
-            if os.path.isdir(file_path) and not re.match(RE_HIDDEN_FOLDER_PREFIXES, f) and FOLDERS in sort_order: # folder
+
+            if is_dir and not re.match(RE_HIDDEN_FOLDER_PREFIXES, f) and FOLDERS in sort_order: # folder
                 try:
                     if self.config[ENABLE_FOLDER_IMAGES]:
-                        folder_image_path = self.util.get_folder_image_path(real_path)
+                        folder_image_path = self.get_folder_image_path(real_path, os.stat(real_path).st_mtime_ns)
                         if folder_image_path:
                             state.file_type = FOLDER_WITH_ICON
                             state.file_image_path = folder_image_path
                     folders.append(state)
                 except PermissionError:
                     pass
-            elif os.path.isfile(file_path) and not f.startswith("."): # audio file
+                except OSError as e:
+                    logging.debug(e)
+                    folders.append(state)
+            elif is_file and not f.startswith("."): # audio file
                 if show_file_details:
-                    stats = os.stat(file_path)
-                    state.file_size = stats.st_size
-
-                    if WINDOWS in self.platform:
-                        state.file_created_time = stats.st_ctime
-                        state.file_modified_time = stats.st_mtime
-                    else:
-                        state.file_created_time = stats.st_mtime
-                        state.file_modified_time = stats.st_ctime
-
-                    state.file_accessed_time = stats.st_atime
+                    try:
+                        self.set_file_stats(state, os.stat(path))
+                    except OSError as e:
+                        logging.debug(e)
 
                 if self.is_audio_file(f) and  FILES in sort_order:
                     state.file_type = FILE_AUDIO
-                    if load_images and self.image_util.get_image_from_audio_file(file_path):
-                        state.has_embedded_image = True
-                    else:
+                    if not load_images:
                         state.has_embedded_image = False
 
                     if show_file_details:
-                        meta = self.util.get_audio_file_metadata(file_path)
-                        if meta:
-                            state.length = meta["length"]
+                        self.set_audio_file_length(state, path)
 
                     audio_files.append(state)
                 elif self.is_playlist_file(f) and PLAYLISTS in sort_order: # playlist
@@ -281,6 +403,53 @@ class FileUtil(object):
         
         return files
     
+    def set_file_stats(self, state, stats):
+        """ Set file size and times
+
+        :param state: file state object
+        :param stats: file stats
+        """
+        state.file_size = stats.st_size
+
+        if WINDOWS in self.platform:
+            state.file_created_time = stats.st_ctime
+            state.file_modified_time = stats.st_mtime
+        else:
+            state.file_created_time = stats.st_mtime
+            state.file_modified_time = stats.st_ctime
+
+        state.file_accessed_time = stats.st_atime
+
+    def set_audio_file_length(self, state, path):
+        """ Set audio file length from its metadata
+
+        :param state: file state object
+        :param path: file path
+        """
+        meta = self.util.get_audio_file_metadata(path)
+        if meta:
+            state.length = meta["length"]
+
+    def add_file_details(self, states):
+        """ Add details like size, time created and time modified and audio file length.
+        It's used to get details only for the requested part of the folder content.
+
+        :param states: list of state objects returned by get_folder_content()
+        """
+        for s in states:
+            if s.file_type == FOLDER or s.file_type == FOLDER_WITH_ICON:
+                continue
+
+            path = os.path.join(s.folder, s.file_name)
+            try:
+                self.set_file_stats(s, os.stat(path))
+            except Exception as e:
+                logging.debug(e)
+                continue
+
+            if s.file_type == FILE_AUDIO:
+                self.set_audio_file_length(s, path)
+
     def get_first_folder_with_audio_files(self, start_folder):
         """ Find the first folder with audio files
         
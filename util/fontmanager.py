@@ -0,0 +1,148 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pygame
+import logging
+
+from threading import RLock
+from collections import OrderedDict
+from util.config import FOLDER_LANGUAGES, CURRENT, LANGUAGE, FONT_KEY
+
+FOLDER_FONT = "font"
+MAX_FONTS = 64
+MAX_TEXT_SIZES = 1024
+EXT_TTF = ".ttf"
+
+class CachedFont(pygame.font.Font):
+    """ Font which remembers the sizes of the rendered strings """
+
+    def __init__(self, filename, size):
+        """ Initializer
+
+        :param filename: font file
+        :param size: font size
+        """
+        pygame.font.Font.__init__(self, filename, size)
+        self.key = (filename, size)
+        self.text_sizes = OrderedDict()
+        self.text_sizes_lock = RLock()
+
+    def size(self, text):
+        """ Get the size of the rendered text
+
+        :param text: text
+
+        :return: tuple (width, height)
+        """
+        with self.text_sizes_lock:
+            try:
+                s = self.text_sizes[text]
+                self.text_sizes.move_to_end(text)
+                return s
+            except KeyError:
+                pass
+
+            s = pygame.font.Font.size(self, text)
+            self.text_sizes[text] = s
+            if len(self.text_sizes) > MAX_TEXT_SIZES:
+                self.text_sizes.popitem(last=False)
+            return s
+
+class FontManager(object):
+    """ Resolves the font file for the current language and caches font objects by
+    font file and size. The language folder is scanned only when the language changes.
+    """
+
+    def __init__(self, util):
+        """ Initializer
+
+        :param util: utility object
+        """
+        self.config = util.config
+        self.base_folder = util.CURRENT_WORKING_DIRECTORY
+        self.lock = RLock()
+        self.fonts = OrderedDict()
+        self.font_file_key = None
+        self.font_file = None
+
+    def get_language_font(self, language):
+        """ Find language specific font
+
+        :param language: language name
+
+        :return: path to the language font file or None if language uses default font
+        """
+        path = os.path.join(self.base_folder, FOLDER_LANGUAGES, language)
+        try:
+            for file in os.listdir(path):
+                if file.lower().endswith(EXT_TTF):
+                    return os.path.join(path, file)
+        except Exception as e:
+            logging.debug(e)
+        return None
+
+    def get_font_file(self):
+        """ Get font file for the current language. The file is resolved again only if
+        the language or the default font were changed.
+
+        :return: path to the font file
+        """
+        language = self.config[CURRENT][LANGUAGE]
+        font_name = self.config[FONT_KEY]
+        key = (language, font_name)
+
+        with self.lock:
+            if key != self.font_file_key:
+                filename = self.get_language_font(language)
+                if filename == None:
+                    filename = os.path.join(self.base_folder, FOLDER_FONT, font_name)
+                self.font_file = filename
+                self.font_file_key = key
+            return self.font_file
+
+    def get_font(self, size):
+        """ Get font for the current language
+
+        :param size: font size
+
+        :return: font object
+        """
+        filename = self.get_font_file()
+        key = (filename, size)
+
+        with self.lock:
+            try:
+                font = self.fonts[key]
+                self.fonts.move_to_end(key)
+                return font
+            except KeyError:
+                pass
+
+            font = CachedFont(filename, size)
+            self.fonts[key] = font
+            if len(self.fonts) > MAX_FONTS:
+                self.fonts.popitem(last=False)
+            return font
+
+    def clear(self):
+        """ Remove all cached fonts """
+
+        with self.lock:
+            self.fonts.clear()
+            self.font_file_key = None
+            self.font_file = None
@@ -0,0 +1,449 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import json
+import hashlib
+import logging
+import requests
+
+from threading import RLock, Lock, get_ident
+from concurrent.futures import ThreadPoolExecutor, wait
+from util.cache import MEGABYTE
+
+FOLDER_HTTP_CACHE = "http"
+FOLDER_DATA = "data"
+FILE_INDEX = "index.json"
+EXT_TMP = ".tmp"
+
+HTTP_CACHE_SIZE = 64 * MEGABYTE
+REVALIDATION_PERIOD = 24 * 60 * 60
+DOWNLOAD_THREADS = 3
+HTTP_TIMEOUT = 12
+USER_AGENT = "PeppyPlayer + https://github.com/project-owner/Peppy"
+
+URLS = "urls"
+BLOBS = "blobs"
+HASH = "hash"
+ETAG = "etag"
+LAST_MODIFIED = "modified"
+CHECKED = "checked"
+SIZE = "size"
+ACCESSED = "accessed"
+
+class HttpCache(object):
+    """ Persistent cache of the files downloaded by HTTP. The content is stored on disk
+    by its hash, so the same image referenced by different URLs is stored once. The files
+    can have derived variants (e.g. scaled images) which are removed together with the file.
+    The cached content is returned immediately, if it's older than revalidation period
+    it's revalidated in background using ETag/Last-Modified headers. The least recently
+    used files are removed when the total size exceeds the limit.
+    """
+
+    def __init__(self, folder, max_size=HTTP_CACHE_SIZE, revalidation_period=REVALIDATION_PERIOD, threads=DOWNLOAD_THREADS):
+        """ Initializer
+
+        :param folder: cache folder
+        :param max_size: maximum size of the cached files in bytes
+        :param revalidation_period: period in seconds after which the cached content is revalidated
+        :param threads: number of background download threads
+        """
+        self.folder = folder
+        self.revalidation_period = revalidation_period
+        self.data_folder = os.path.join(folder, FOLDER_DATA)
+        self.index_path = os.path.join(folder, FILE_INDEX)
+        self.max_size = max_size
+        self.lock = RLock()
+        self.index_lock = Lock()
+        self.pending = set()
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.index = self.load_index()
+        self.size = sum([b[SIZE] for b in self.index[BLOBS].values()])
+        self.remove_orphans()
+
+    def load_index(self):
+        """ Load cache index from disk
+
+        :return: index dictionary
+        """
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if URLS in index and BLOBS in index:
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug("Cannot load HTTP cache index %s", e)
+
+        return {URLS: {}, BLOBS: {}}
+
+    def remove_orphans(self):
+        """ Remove files which are not in the index (e.g. left after crash) """
+
+        try:
+            names = os.listdir(self.data_folder)
+        except FileNotFoundError:
+            return
+
+        for name in names:
+            if name.split(".")[0] in self.index[BLOBS] and not name.endswith(EXT_TMP):
+                continue
+            try:
+                os.remove(os.path.join(self.data_folder, name))
+            except Exception as e:
+                logging.debug("Cannot remove cache file %s %s", name, e)
+
+    def save_index(self):
+        """ Save cache index to disk. Writers are serialized, so the older copy
+        of the index cannot replace the newer one.
+        """
+        tmp_path = self.index_path + EXT_TMP
+        try:
+            with self.index_lock:
+                with self.lock:
+                    s = json.dumps(self.index)
+                os.makedirs(self.folder, exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    f.write(s)
+                os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logging.debug("Cannot save HTTP cache index %s", e)
+
+    def get_path(self, content_hash, variant=None):
+        """ Get path to the cached file or its variant
+
+        :param content_hash: content hash
+        :param variant: variant name
+
+        :return: file path
+        """
+        if variant:
+            return os.path.join(self.data_folder, content_hash + "." + variant)
+        return os.path.join(self.data_folder, content_hash)
+
+    def write_file(self, path, data):
+        """ Write file atomically
+
+        :param path: file path
+        :param data: file content
+
+        :return: True - success, False - failure
+        """
+        tmp_path = path + "." + str(get_ident()) + EXT_TMP
+        try:
+            os.makedirs(self.data_folder, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logging.debug("Cannot write cache file %s %s", path, e)
+            return False
+
+    def read_file(self, path):
+        """ Read file
+
+        :param path: file path
+
+        :return: file content or None
+        """
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except Exception:
+            return None
+
+    def get(self, url):
+        """ Get URL content. Cached content is returned without network request.
+
+        :param url: URL
+
+        :return: content bytes or None
+        """
+        if not url:
+            return None
+
+        with self.lock:
+            entry = self.index[URLS].get(url, None)
+
+        if entry:
+            data = self.read_file(self.get_path(entry[HASH]))
+            if data != None:
+                self.touch(entry[HASH])
+                if time.time() - entry.get(CHECKED, 0) > self.revalidation_period:
+                    self.submit(url)
+                return data
+            self.remove_blob(entry[HASH])
+
+        return self.download(url)
+
+    def check(self, url):
+        """ Mark cached URL content as used without reading it. If the content is older
+        than revalidation period it's revalidated in background.
+
+        :param url: URL
+
+        :return: content hash or None if URL is not cached
+        """
+        with self.lock:
+            entry = self.index[URLS].get(url, None)
+            if not entry:
+                return None
+            content_hash = entry[HASH]
+            stale = time.time() - entry.get(CHECKED, 0) > self.revalidation_period
+
+        self.touch(content_hash)
+        if stale:
+            self.submit(url)
+        return content_hash
+
+    def get_hash(self, url):
+        """ Get the hash of the cached URL content
+
+        :param url: URL
+
+        :return: content hash or None if URL is not cached
+        """
+        with self.lock:
+            entry = self.index[URLS].get(url, None)
+            return entry[HASH] if entry else None
+
+    def touch(self, content_hash):
+        """ Mark content as recently used
+
+        :param content_hash: content hash
+        """
+        with self.lock:
+            blob = self.index[BLOBS].get(content_hash, None)
+            if blob:
+                blob[ACCESSED] = time.time()
+
+    def fetch(self, url):
+        """ Download URL content without storing it in cache. Used for the content
+        which is rarely reused (e.g. random screensaver photos).
+
+        :param url: URL
+
+        :return: content bytes or None
+        """
+        try:
+            response = self.session.get(url, timeout=HTTP_TIMEOUT)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        if response.status_code != 200 or not response.content:
+            logging.debug("Cannot download %s status %s", url, response.status_code)
+            return None
+
+        return response.content
+
+    def download(self, url):
+        """ Download URL content and store it in cache. The cached content is revalidated
+        using conditional request.
+
+        :param url: URL
+
+        :return: content bytes or None
+        """
+        headers = {}
+        with self.lock:
+            entry = self.index[URLS].get(url, None)
+        if entry:
+            if entry.get(ETAG, None):
+                headers["If-None-Match"] = entry[ETAG]
+            if entry.get(LAST_MODIFIED, None):
+                headers["If-Modified-Since"] = entry[LAST_MODIFIED]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        if response.status_code == 304 and entry:
+            with self.lock:
+                entry[CHECKED] = time.time()
+            self.save_index()
+            return self.read_file(self.get_path(entry[HASH]))
+
+        if response.status_code != 200 or not response.content:
+            logging.debug("Cannot download %s status %s", url, response.status_code)
+            return None
+
+        self.put(url, response.content, response.headers.get("ETag", None), response.headers.get("Last-Modified", None))
+        return response.content
+
+    def put(self, url, data, etag=None, last_modified=None):
+        """ Store URL content
+
+        :param url: URL
+        :param data: content bytes
+        :param etag: ETag header
+        :param last_modified: Last-Modified header
+        """
+        content_hash = hashlib.sha1(data).hexdigest()
+
+        with self.lock:
+            exists = content_hash in self.index[BLOBS]
+
+        if not exists and not self.write_file(self.get_path(content_hash), data):
+            return
+
+        with self.lock:
+            old = self.index[URLS].get(url, None)
+            self.index[URLS][url] = {HASH: content_hash, ETAG: etag, LAST_MODIFIED: last_modified, CHECKED: time.time()}
+            if not exists:
+                self.index[BLOBS][content_hash] = {SIZE: len(data), ACCESSED: time.time()}
+                self.size += len(data)
+            if old and old[HASH] != content_hash:
+                self.remove_unused_blob(old[HASH])
+            self.evict()
+
+        self.save_index()
+
+    def get_variant(self, url, variant):
+        """ Get variant of the cached content
+
+        :param url: URL
+        :param variant: variant name
+
+        :return: variant bytes or None
+        """
+        with self.lock:
+            entry = self.index[URLS].get(url, None)
+        if not entry:
+            return None
+
+        data = self.read_file(self.get_path(entry[HASH], variant))
+        if data != None:
+            self.touch(entry[HASH])
+            if time.time() - entry.get(CHECKED, 0) > self.revalidation_period:
+                self.submit(url)
+        return data
+
+    def put_variant(self, url, variant, data):
+        """ Store variant of the cached content
+
+        :param url: URL
+        :param variant: variant name
+        :param data: variant bytes
+        """
+        content_hash = self.get_hash(url)
+        if content_hash == None or not self.write_file(self.get_path(content_hash, variant), data):
+            return
+
+        with self.lock:
+            blob = self.index[BLOBS].get(content_hash, None)
+            if blob:
+                blob[SIZE] += len(data)
+                self.size += len(data)
+                self.evict()
+
+    def remove_unused_blob(self, content_hash):
+        """ Remove content which is not referenced by any URL
+
+        :param content_hash: content hash
+        """
+        with self.lock:
+            for entry in self.index[URLS].values():
+                if entry[HASH] == content_hash:
+                    return
+            self.remove_blob(content_hash)
+
+    def remove_blob(self, content_hash):
+        """ Remove content, its variants and all URLs referencing it
+
+        :param content_hash: content hash
+        """
+        with self.lock:
+            blob = self.index[BLOBS].pop(content_hash, None)
+            if blob:
+                self.size -= blob[SIZE]
+            urls = [u for u, e in self.index[URLS].items() if e[HASH] == content_hash]
+            for u in urls:
+                del self.index[URLS][u]
+
+        try:
+            with os.scandir(self.data_folder) as it:
+                for entry in it:
+                    if entry.name.startswith(content_hash):
+                        os.remove(entry.path)
+        except Exception as e:
+            logging.debug(e)
+
+    def evict(self):
+        """ Remove the least recently used content if the cache size exceeds the limit """
+
+        with self.lock:
+            if self.size <= self.max_size:
+                return
+            blobs = sorted(self.index[BLOBS].items(), key=lambda b: b[1][ACCESSED])
+            for content_hash, _ in blobs[:-1]:
+                if self.size <= self.max_size:
+                    break
+                self.remove_blob(content_hash)
+
+    def submit(self, url):
+        """ Download URL in background if it's not being downloaded already
+
+        :param url: URL
+        """
+        with self.lock:
+            if url in self.pending:
+                return
+            self.pending.add(url)
+
+        self.executor.submit(self.download_in_background, url)
+
+    def download_in_background(self, url):
+        """ Background download task
+
+        :param url: URL
+        """
+        try:
+            self.download(url)
+        except Exception as e:
+            logging.debug(e)
+        finally:
+            with self.lock:
+                self.pending.discard(url)
+
+    def prefetch(self, urls):
+        """ Download URLs which are not cached yet in background
+
+        :param urls: list of URLs
+        """
+        for url in urls:
+            if not url or not url.startswith("http"):
+                continue
+            with self.lock:
+                cached = url in self.index[URLS]
+            if not cached:
+                self.submit(url)
+
+    def refresh(self, urls):
+        """ Download or revalidate URLs concurrently and wait until all requests are completed
+
+        :param urls: list of URLs
+        """
+        futures = [self.executor.submit(self.download, url) for url in urls if url]
+        wait(futures)
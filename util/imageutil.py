@@ -22,15 +22,17 @@ import logging
 import codecs
 import random
 import io
+import hashlib
 
 from util.config import *
+from util.cache import LruCache, CACHE_IMAGES, CACHE_BASE64_IMAGES, CACHE_SVG_IMAGES, CACHE_BACKGROUNDS, \
+    CACHE_ALBUM_ART_URLS, CACHE_THUMBNAILS, CACHE_MENU_IMAGES, MEGABYTE
 from PIL import Image, ImageFilter
 from PIL.ImageColor import getcolor, getrgb
 from PIL.ImageOps import grayscale
 from io import BytesIO
 from util.fileutil import FOLDER, FOLDER_WITH_ICON, FILE_AUDIO, FILE_PLAYLIST, FILE_IMAGE, FILE_CD_DRIVE
-from urllib import request
-from urllib.request import urlopen
+from util.httpcache import HttpCache, FOLDER_HTTP_CACHE
 from mutagen.id3 import ID3
 from mutagen.flac import FLAC
 from mutagen.mp4 import MP4
@@ -64,7 +66,11 @@ GRADIENT = "gradient"
 
 CATEGORY_ORIGINAL = "original"
 
-HTTP_CONNECTION_TIMEOUT_SEC = 12
+
+FOLDER_ICONS_CACHE = "icons"
+ICONS_CACHE_SIZE = 16 * MEGABYTE
+ICONS_CACHE_PRUNE_RATIO = 0.75
+EXT_TMP = ".tmp"
 
 class ImageUtil(object):
     """ Image Utility class """
@@ -92,17 +98,31 @@ class ImageUtil(object):
         self.COLOR_OFF = self.color_to_hex(self.config[COLORS][COLOR_DARK_LIGHT])
         self.COLOR_MUTE = self.color_to_hex(self.config[COLORS][COLOR_MUTE])        
 
-        self.image_cache = {}
-        self.image_cache_base64 = {}
-        self.svg_cache = {}
-        self.background_cache = {}
-        self.album_art_url_cache = {}
-        self.thumbnail_cache = {}
+        self.image_cache = LruCache(CACHE_IMAGES, util.get_cache_size(CACHE_IMAGES))
+        self.image_cache_base64 = LruCache(CACHE_BASE64_IMAGES, util.get_cache_size(CACHE_BASE64_IMAGES))
+        self.svg_cache = LruCache(CACHE_SVG_IMAGES, util.get_cache_size(CACHE_SVG_IMAGES))
+        self.background_cache = LruCache(CACHE_BACKGROUNDS, util.get_cache_size(CACHE_BACKGROUNDS))
+        self.album_art_url_cache = LruCache(CACHE_ALBUM_ART_URLS, util.get_cache_size(CACHE_ALBUM_ART_URLS))
+        self.thumbnail_cache = LruCache(CACHE_THUMBNAILS, util.get_cache_size(CACHE_THUMBNAILS))
+        self.menu_image_cache = LruCache(CACHE_MENU_IMAGES, util.get_cache_size(CACHE_MENU_IMAGES))
+
+        self.icons_cache_folder = os.path.join(os.getcwd(), FOLDER_CACHE, FOLDER_ICONS_CACHE)
+        self.icons_cache_size = None
+        self.http_cache = HttpCache(os.path.join(os.getcwd(), FOLDER_CACHE, FOLDER_HTTP_CACHE))
 
         self.FILE_EXTENSIONS_EMBEDDED_IMAGES = None
         if self.config[SHOW_EMBEDDED_IMAGES]:
             self.FILE_EXTENSIONS_EMBEDDED_IMAGES = ["." + s for s in self.config[SHOW_EMBEDDED_IMAGES]]
 
+    def get_cache_stats(self):
+        """ Get statistics of all image caches
+
+        :return: list of dictionaries with cache statistics
+        """
+        caches = [self.image_cache, self.image_cache_base64, self.svg_cache, self.background_cache, 
+            self.album_art_url_cache, self.thumbnail_cache, self.menu_image_cache]
+        return [c.get_stats() for c in caches]
+
     def load_image(self, path, base64=False, bounding_box=None):
         """ Load and return image
         
@@ -134,7 +154,10 @@ class ImageUtil(object):
             key = cache_key
         
         if EXT_SVG in path:
-            svg_image = self.svg_cache[path]
+            svg_image = self.svg_cache.get(path)
+            if svg_image == None:
+                logging.debug(f"SVG image {path} not in cache")
+                return None
             img = base64.b64encode(svg_image.encode()).decode()
             self.image_cache_base64[key] = img
             return img
@@ -618,7 +641,13 @@ class ImageUtil(object):
         except KeyError:
             pass
         
-        s = codecs.open(path, "r").read()
+        try:
+            s = codecs.open(path, "r").read()
+        except Exception as e:
+            logging.debug("Cannot read SVG file %s %s", path, e)
+            return None
+
+        disk_cache_key = self.get_icon_cache_key(s, color_1, color_2, gradient, scale, bounding_box)
 
         if gradient:
             g = "url(#gradient)"
@@ -636,23 +665,118 @@ class ImageUtil(object):
         try:
             s = self.increment_size(s, "width=\"")
             s = self.increment_size(s, "height=\"")
-
-            bytes = io.BytesIO(s.encode())
-            bitmap_image =  pygame.image.load(bytes).convert_alpha()
         except Exception as e:
             logging.debug("Problem parsing SVG file %s %s", path, e)
             return None
-        
+
         if self.config[USAGE][USE_WEB]:
             self.svg_cache[cache_path] = s
 
-        img = self.scale_svg_image(cache_path, bitmap_image, bounding_box, scale)
+        img = self.load_cached_icon(cache_path, disk_cache_key)
+
+        if img == None:
+            try:
+                bytes = io.BytesIO(s.encode())
+                bitmap_image =  pygame.image.load(bytes).convert_alpha()
+            except Exception as e:
+                logging.debug("Problem parsing SVG file %s %s", path, e)
+                return None
+
+            img = self.scale_svg_image(cache_path, bitmap_image, bounding_box, scale)
+            self.save_cached_icon(img[1], disk_cache_key)
 
         if output == "svg":
             return s
         else:
             return img
 
+    def get_icon_cache_key(self, svg, *args):
+        """ Get the key for rasterized icon in the disk cache
+
+        :param svg: SVG file content
+        :param args: parameters used for rasterization (colors, scale, bounding box etc)
+
+        :return: key which is used as a filename
+        """
+        # only the size of bounding box matters, the same icon can be drawn at different positions
+        s = svg + "".join([str((a.w, a.h)) if isinstance(a, pygame.Rect) else str(a) for a in args])
+        return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+    def load_cached_icon(self, cache_path, key):
+        """ Load rasterized icon from the disk cache and put it to the memory cache
+
+        :param cache_path: memory cache key
+        :param key: disk cache key
+
+        :return: tuple (cache path, image) or None if icon is not in the disk cache
+        """
+        path = os.path.join(self.icons_cache_folder, key + EXT_PNG)
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            image = pygame.image.load(path).convert_alpha()
+            os.utime(path) # the least recently used icons are pruned first
+        except Exception as e:
+            logging.debug("Cannot load cached icon %s %s", path, e)
+            return None
+
+        self.image_cache[cache_path] = image
+        return (cache_path, image)
+
+    def save_cached_icon(self, image, key):
+        """ Save rasterized icon to the disk cache. The file is written to the temporary file first
+        and then renamed to avoid partially written files.
+
+        :param image: icon image
+        :param key: disk cache key
+        """
+        path = os.path.join(self.icons_cache_folder, key + EXT_PNG)
+        tmp_path = path + EXT_TMP
+
+        try:
+            os.makedirs(self.icons_cache_folder, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pygame.image.save(image, f, EXT_PNG)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.debug("Cannot save cached icon %s %s", path, e)
+            return
+
+        if self.icons_cache_size == None:
+            self.prune_icons_cache()
+        else:
+            self.icons_cache_size += os.path.getsize(path)
+            if self.icons_cache_size > ICONS_CACHE_SIZE:
+                self.prune_icons_cache()
+
+    def prune_icons_cache(self):
+        """ Calculate the size of the icons disk cache. If it exceeds the limit remove
+        the least recently used icons until the size is below the limit.
+        """
+        files = []
+        try:
+            with os.scandir(self.icons_cache_folder) as it:
+                for entry in it:
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError as e:
+            logging.debug("Cannot read icons cache %s", e)
+
+        size = sum([f[1] for f in files])
+        if size > ICONS_CACHE_SIZE:
+            files.sort()
+            for _, file_size, path in files:
+                if size <= ICONS_CACHE_SIZE * ICONS_CACHE_PRUNE_RATIO:
+                    break
+                try:
+                    os.remove(path)
+                    size -= file_size
+                except Exception as e:
+                    logging.debug("Cannot remove cached icon %s %s", path, e)
+
+        self.icons_cache_size = size
+
     def increment_size(self, svg, token):
         """ Increment SVG image size
 
@@ -704,21 +828,33 @@ class ImageUtil(object):
         
         try:
             s = codecs.open(path, "r").read()
-            s = self.increment_size(s, "width=\"")
-            s = self.increment_size(s, "height=\"")
-            bytes = io.BytesIO(s.encode())
-            svg_image =  pygame.image.load(bytes)
         except Exception as e:
-            logging.debug("Problem parsing SVG file %s %s", path, e)
+            logging.debug("Cannot read SVG file %s %s", path, e)
             return None
 
         if self.config[USAGE][USE_WEB]:
             try:
                 self.svg_cache[cache_path]
             except KeyError:
-                self.svg_cache[cache_path] = codecs.open(path, "r").read()
+                self.svg_cache[cache_path] = s
+
+        disk_cache_key = self.get_icon_cache_key(s, scale, bounding_box)
+        img = self.load_cached_icon(cache_path, disk_cache_key)
+        if img:
+            return img
+
+        try:
+            s = self.increment_size(s, "width=\"")
+            s = self.increment_size(s, "height=\"")
+            bytes = io.BytesIO(s.encode())
+            svg_image =  pygame.image.load(bytes)
+        except Exception as e:
+            logging.debug("Problem parsing SVG file %s %s", path, e)
+            return None
         
-        return self.scale_svg_image(cache_path, svg_image, bounding_box, scale)
+        img = self.scale_svg_image(cache_path, svg_image, bounding_box, scale)
+        self.save_cached_icon(img[1], disk_cache_key)
+        return img
 
     def scale_svg_image(self, cache_path, svg_image, bounding_box=None, scale=1.0):
         """ Scale SVG image
@@ -1068,25 +1204,67 @@ class ImageUtil(object):
         else:
             return "#%06x" % ((color[0] << 16) + (color[1] << 8) + color[2])
 
-    def load_image_from_url(self, url):
-        """ Load image from specified URL
+    def load_image_from_url(self, url, use_cache=True):
+        """ Load image from specified URL. The image is taken from the disk cache if available.
         
         :param url: image url
+        :param use_cache: True - use disk cache, False - download image without caching
         
         :return: image from url
         """
-        try:
-            hdrs = {'User-Agent': 'PeppyPlayer + https://github.com/project-owner/Peppy'}
-            req = request.Request(url, headers=hdrs)
-            stream = urlopen(req, timeout=HTTP_CONNECTION_TIMEOUT_SEC).read()
+        if use_cache:
+            data = self.http_cache.get(url)
+        else:
+            data = self.http_cache.fetch(url)
+        if data == None:
+            return None
 
-            buf = BytesIO(stream)
+        try:
+            buf = BytesIO(data)
             image = pygame.image.load(buf).convert_alpha()
             return (url, image)
         except Exception as e:
             logging.debug(e)
             return None
 
+    def load_scaled_image_from_url(self, url, w, h, padding=0, fit_height=False):
+        """ Load image from specified URL and scale it. The scaled image is stored 
+        in the disk cache next to the original image.
+
+        :param url: image url
+        :param w: bounding box width
+        :param h: bounding box height
+        :param padding: padding
+        :param fit_height: True - fit image height to bounding box
+
+        :return: scaled image
+        """
+        variant = "%dx%d.%d.%d%s" % (w, h, padding, int(fit_height), EXT_PNG)
+        data = self.http_cache.get_variant(url, variant)
+        if data != None:
+            try:
+                return pygame.image.load(BytesIO(data), variant).convert_alpha()
+            except Exception as e:
+                logging.debug(e)
+
+        img = self.load_image_from_url(url)
+        if img == None:
+            return None
+
+        scale_ratio = self.get_scale_ratio((w - (padding * 2), h - (padding * 2)), img[1], fit_height=fit_height)
+        scaled_img = self.scale_image(img, scale_ratio)
+        if scaled_img == None:
+            return None
+
+        try:
+            buf = BytesIO()
+            pygame.image.save(scaled_img, buf, variant)
+            self.http_cache.put_variant(url, variant, buf.getvalue())
+        except Exception as e:
+            logging.debug(e)
+
+        return scaled_img
+
     def scale_image_with_padding(self, w, h, img, padding=0, scale_factor=1):
         """ Scale image using specified padding and scale factor
         
@@ -1112,11 +1290,8 @@ class ImageUtil(object):
         
         :return: hash of the input string
         """
-        img_scaled = None
-        img = self.load_image_from_url(url)
         image_padding = 4 
-        if img:
-            img_scaled = self.scale_image_with_padding(w, h, img[1], image_padding, 1.0)                
+        img_scaled = self.load_scaled_image_from_url(url, w, h, image_padding)
         
         if not img_scaled:
             return None
@@ -1410,10 +1585,9 @@ class ImageUtil(object):
         if thumbnail != None:
             return thumbnail
 
-        image = self.load_image_from_url(img_name)
+        image = self.load_scaled_image_from_url(img_name, bb.w * f, bb.h * f, fit_height=True)
         if image != None:
-            scale_ratio = self.get_scale_ratio((bb.w * f, bb.h * f), image[1], fit_height=True)
-            thumbnail = (img_name, self.scale_image(image, scale_ratio))
+            thumbnail = (img_name, image)
 
         self.thumbnail_cache[cache_key] = thumbnail
         return thumbnail
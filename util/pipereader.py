@@ -0,0 +1,262 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import select
+import logging
+
+from threading import Thread, RLock, Condition
+
+FRAMES_IN_BUFFER = 256
+POLL_TIMEOUT = 0.5
+PIPE_BUFFER_SIZE = 1048576 # as defined for Raspberry OS in /proc/sys/fs/pipe-max-size
+
+class PipeReader(object):
+    """ Reads fixed size frames from the named pipe in a separate thread. The thread waits
+    for the data using poll() instead of the sleep-poll loop. The data is read into
+    a preallocated buffer and only the newest complete frame is kept. The pipe stays open
+    when the reader is stopped, so the writer doesn't see the pipe without reader.
+    """
+
+    def __init__(self, pipe_name, frame_size):
+        """ Initializer
+
+        :param pipe_name: named pipe path
+        :param frame_size: frame size in bytes
+        """
+        self.pipe_name = pipe_name
+        self.frame_size = frame_size
+        self.buffer = bytearray(frame_size * FRAMES_IN_BUFFER)
+        self.view = memoryview(self.buffer)
+        self.pending = 0
+        self.frame = None
+        self.pipe = None
+        self.users = 0
+        self.run_flag = False
+        self.thread = None
+        self.lock = RLock()
+        self.condition = Condition(self.lock)
+
+    def open_pipe(self):
+        """ Open named pipe
+
+        :return: True - pipe was opened, False - otherwise
+        """
+        try:
+            fd = os.open(self.pipe_name, os.O_RDONLY | os.O_NONBLOCK)
+            self.pipe = os.fdopen(fd, "rb", buffering=0)
+            self.pending = 0
+            return True
+        except Exception as e:
+            logging.debug("Cannot open named pipe: " + self.pipe_name)
+            logging.debug(e)
+            self.pipe = None
+            return False
+
+    def open(self):
+        """ Open named pipe if it's not open yet
+
+        :return: True - pipe is open, False - otherwise
+        """
+        with self.lock:
+            if self.pipe != None:
+                return True
+            return self.open_pipe()
+
+    def close_pipe(self):
+        """ Close named pipe """
+
+        if self.pipe == None:
+            return
+
+        try:
+            self.pipe.close()
+        except Exception as e:
+            logging.debug(e)
+
+        self.pipe = None
+
+    def is_open(self):
+        """ Check if the pipe is open
+
+        :return: True - pipe is open, False - otherwise
+        """
+        return self.pipe != None
+
+    def start(self):
+        """ Register pipe user and start reader thread if it's not running yet """
+
+        with self.lock:
+            self.users += 1
+            self.frame = None
+
+            if self.thread != None:
+                self.run_flag = True
+                return
+
+            if self.pipe == None:
+                if not self.open_pipe():
+                    self.users -= 1
+                    return
+            else:
+                self.flush_pipe_buffer()
+
+            self.run_flag = True
+            self.thread = Thread(target=self.read_frames, daemon=True)
+            self.thread.start()
+
+    def flush_pipe_buffer(self):
+        """ Drop the data accumulated in the pipe while the reader was stopped """
+
+        self.pending = 0
+        try:
+            self.pipe.read(PIPE_BUFFER_SIZE)
+        except Exception as e:
+            logging.debug(e)
+
+    def stop(self):
+        """ Unregister pipe user and stop reader thread when there are no more users """
+
+        with self.lock:
+            if self.users > 0:
+                self.users -= 1
+            if self.users == 0:
+                self.run_flag = False
+                self.condition.notify_all()
+
+    def is_running(self):
+        """ Check if reader thread is running
+
+        :return: True - running, False - otherwise
+        """
+        return self.run_flag
+
+    def continue_reading(self):
+        """ Check if reader thread should continue
+
+        :return: True - continue reading, False - stop thread
+        """
+        with self.lock:
+            if self.run_flag:
+                return True
+
+            self.thread = None
+            self.condition.notify_all()
+            return False
+
+    def read_frames(self):
+        """ Reader thread method """
+
+        poller = select.poll()
+        poller.register(self.pipe, select.POLLIN)
+        timeout = int(POLL_TIMEOUT * 1000)
+
+        while self.continue_reading():
+            try:
+                events = poller.poll(timeout)
+            except InterruptedError:
+                continue
+
+            if not events:
+                continue
+
+            try:
+                n = self.pipe.readinto(self.view[self.pending:])
+            except BlockingIOError:
+                continue
+            except Exception as e:
+                logging.debug(e)
+                self.close_pipe()
+                self.run_flag = False
+                continue
+
+            if not n:
+                # all writers closed the pipe, reopen it to block in poll() until the next writer
+                poller.unregister(self.pipe)
+                self.close_pipe()
+                if self.open_pipe():
+                    poller.register(self.pipe, select.POLLIN)
+                else:
+                    self.run_flag = False
+                continue
+
+            self.keep_newest_frame(self.pending + n)
+
+    def keep_newest_frame(self, length):
+        """ Store the newest complete frame from the buffer and move incomplete frame
+        to the beginning of the buffer
+
+        :param length: number of bytes in the buffer
+        """
+        frames = length // self.frame_size
+        self.pending = length - frames * self.frame_size
+
+        if frames:
+            end = frames * self.frame_size
+            with self.lock:
+                self.frame = bytes(self.view[end - self.frame_size : end])
+                self.condition.notify_all()
+
+            if self.pending:
+                self.view[0 : self.pending] = self.view[end : length]
+
+    def get_frame(self):
+        """ Get the newest frame which was not consumed yet
+
+        :return: frame bytes or None if there is no new frame
+        """
+        with self.lock:
+            frame = self.frame
+            self.frame = None
+            return frame
+
+    def wait_frame(self, timeout):
+        """ Wait for the new frame
+
+        :param timeout: waiting timeout in seconds
+
+        :return: frame bytes or None if there was no new frame during timeout period
+        """
+        with self.lock:
+            if self.frame == None and self.run_flag:
+                self.condition.wait(timeout)
+            return self.get_frame()
+
+    def flush(self):
+        """ Drop the frame which was not consumed yet """
+
+        with self.lock:
+            self.frame = None
+
+readers = {}
+readers_lock = RLock()
+
+def get_pipe_reader(pipe_name, frame_size):
+    """ Get reader shared by all users of the named pipe
+
+    :param pipe_name: named pipe path
+    :param frame_size: frame size in bytes
+
+    :return: pipe reader
+    """
+    key = (pipe_name, frame_size)
+    with readers_lock:
+        reader = readers.get(key, None)
+        if reader == None:
+            reader = PipeReader(pipe_name, frame_size)
+            readers[key] = reader
+        return reader
@@ -30,12 +30,23 @@ from ui.screen.screen import PERCENT_TOP_HEIGHT, PERCENT_TITLE_FONT
 from ui.screen.menuscreen import PERCENT_TOP_HEIGHT as PERCENT_TOP_HEIGHT_MENU_SCREEN
 from ui.menu.menu import Menu
 from util.config import PODCASTS, AUDIO_FILES, LOADING, PODCASTS_FOLDER, COLORS, COLOR_DARK, \
-    UTF8, FOLDER_PLAYLISTS
+    UTF8, FOLDER_PLAYLISTS, FOLDER_CACHE
+from util.feedstore import FeedStore
 from bs4 import BeautifulSoup
 
 FILE_PODCASTS = "podcasts.m3u"
 FILE_DEFAULT_PODCAST = "podcasts.svg"
 FILE_PODCASTS_JSON = "podcasts.json"
+FOLDER_FEEDS = "feeds"
+
+FEED_TITLE = "title"
+FEED_SUBTITLE = "subtitle"
+FEED_IMAGE = "image"
+FEED_ENTRIES = "entries"
+FEED_URL = "url"
+FEED_LENGTH = "length"
+FEED_TYPE = "type"
+FEED_SUMMARY = "summary"
 
 STATUS_AVAILABLE = "available"
 STATUS_LOADING = "loading"
@@ -68,6 +79,7 @@ class PodcastsUtil(object):
         self.loaded_icon = None
         self.podcast_image_cache = {}
         self.podcasts_json = []
+        self.feed_store = FeedStore(os.path.join(os.getcwd(), FOLDER_CACHE, FOLDER_FEEDS), self.parse_feed)
         
         layout = BorderLayout(util.screen_rect)
         layout.set_percent_constraints(PERCENT_TOP_HEIGHT, PERCENT_TOP_HEIGHT_MENU_SCREEN, 0, 0)
@@ -215,6 +227,8 @@ class PodcastsUtil(object):
         except:
             pass              
         
+        self.feed_store.load([link for link in links[start_index : end_index] if link not in self.summary_cache])
+
         for i, link in enumerate(links[start_index : end_index]):
             try:
                 p = self.summary_cache[link]
@@ -241,12 +255,13 @@ class PodcastsUtil(object):
             return []
 
         result = []
+        self.feed_store.load([link for link in links if link not in self.summary_cache])
 
         for i, link in enumerate(links):
             try:
                 p = self.summary_cache[link]
                 p.index = i
-                result[link] = p
+                result.append(p)
                 continue
             except:
                 pass
@@ -273,21 +288,15 @@ class PodcastsUtil(object):
         except:
             pass
 
-        try:
-            response = requests.get(podcast_url, timeout=(2, 2))
-            if response.status_code == 404:
-                return None
-            rss = feedparser.parse(response.content)
-            if rss and getattr(rss, "bozo_exception", None):
-                return None
-        except Exception as e:
+        feed = self.feed_store.get_feed(podcast_url)
+        if feed == None:
             return None
             
         s = State()
         s.index = index
-        s.name = rss.feed.title
+        s.name = feed[FEED_TITLE]
         s.l_name = s.name
-        s.description = rss.feed.subtitle
+        s.description = feed[FEED_SUBTITLE]
         s.url = podcast_url
         s.online = True
         s.fixed_height = int(self.podcast_button_font_size * 0.8)
@@ -296,11 +305,7 @@ class PodcastsUtil(object):
         s.bgr = self.config[COLORS][COLOR_DARK]
         s.show_bgr = True
             
-        if 'image' in rss.feed and 'href' in rss.feed.image:
-            img = rss.feed.image.href.strip()
-        else:
-            img = ''
-            
+        img = feed[FEED_IMAGE]
         s.image_name = img
         if include_icon:
             s.icon_base = self.get_podcast_image(img, 0.48, 0.8, self.podcast_button_bb)
@@ -395,13 +400,15 @@ class PodcastsUtil(object):
         cache_key = PODCASTS + str(k) + str(f) 
         if len(img_name) != 0:
             if online:
-                image = self.image_util.load_image_from_url(img_name)
+                image = self.image_util.load_scaled_image_from_url(img_name, bb.w * f, bb.h * f, fit_height=True)
             else:
                 image = self.image_util.load_image(img_name)
+                if image != None:
+                    scale_ratio = self.image_util.get_scale_ratio((bb.w * f, bb.h * f), image[1], fit_height=True)
+                    image = self.image_util.scale_image(image, scale_ratio)
                 
             if image != None:
-                scale_ratio = self.image_util.get_scale_ratio((bb.w * f, bb.h * f), image[1], fit_height=True)
-                podcast_image = (img_name, self.image_util.scale_image(image, scale_ratio))
+                podcast_image = (img_name, image)
                 cache_key = img_name + str(k) + str(f) 
                 
         self.podcast_image_cache[cache_key] = podcast_image                
@@ -482,6 +489,54 @@ class PodcastsUtil(object):
             s.status = STATUS_AVAILABLE
             s.file_name = s.url
 
+    def parse_feed(self, data):
+        """ Parse RSS feed
+
+        :param data: feed content
+
+        :return: dictionary with feed properties and episodes or None if feed cannot be parsed
+        """
+        try:
+            rss = feedparser.parse(data)
+            if not rss or getattr(rss, "bozo_exception", None):
+                return None
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        if 'image' in rss.feed and 'href' in rss.feed.image:
+            img = rss.feed.image.href.strip()
+        else:
+            img = ''
+
+        entries = []
+        for entry in rss.entries:
+            try:
+                enclosure = entry.enclosures[0]
+            except:
+                continue
+
+            url = getattr(enclosure, "href", None)
+            if url == None:
+                url = getattr(enclosure, "url", None)
+            if url == None:
+                continue
+
+            entries.append({
+                FEED_TITLE: getattr(entry, "title", ""),
+                FEED_URL: url,
+                FEED_LENGTH: getattr(enclosure, "length", None),
+                FEED_TYPE: getattr(enclosure, "type", None),
+                FEED_SUMMARY: self.clean_summary(getattr(entry, "summary", ""))
+            })
+
+        return {
+            FEED_TITLE: getattr(rss.feed, "title", ""),
+            FEED_SUBTITLE: getattr(rss.feed, "subtitle", ""),
+            FEED_IMAGE: img,
+            FEED_ENTRIES: entries
+        }
+
     def clean_summary(self, summary):
         """ Clean provide summary from special characters
         
@@ -509,8 +564,8 @@ class PodcastsUtil(object):
             pass
         
         episodes = []
-        rss = feedparser.parse(podcast_url)
-        if rss == None:
+        feed = self.feed_store.get_feed(podcast_url)
+        if feed == None:
             return episodes
 
         if podcast == None:
@@ -518,26 +573,19 @@ class PodcastsUtil(object):
             podcast = self.get_podcast_info(index, podcast_url)
             podcast_image_url = podcast.image_name
         
-        entries = rss.entries
         i = 0
         
-        for entry in entries:
-            try:
-                enclosure = entry.enclosures[0]
-            except:
-                continue
+        for entry in feed[FEED_ENTRIES]:
             s = State()
             s.index = i
-            s.name = entry.title
+            s.name = entry[FEED_TITLE]
             s.l_name = s.name
 
-            s.url = getattr(enclosure, "href", None)
-            if s.url == None:
-                s.url = getattr(enclosure, "url", None)
-            s.length = getattr(enclosure, "length", None)
-            s.type = enclosure.type
+            s.url = entry[FEED_URL]
+            s.length = entry[FEED_LENGTH]
+            s.type = entry[FEED_TYPE]
 
-            s.description = self.clean_summary(entry.summary)
+            s.description = entry[FEED_SUMMARY]
             s.fixed_height = int(self.episode_button_font_size * 0.8)
             s.file_type = PODCASTS
             s.online = podcast.online
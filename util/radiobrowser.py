@@ -17,10 +17,8 @@
 
 import os
 import codecs
-import socket
 import logging
 import math
-import requests
 
 from operator import itemgetter
 from urllib.parse import quote
@@ -28,8 +26,8 @@ from util.config import *
 from util.keys import *
 from ui.state import State
 from copy import copy
+from util.radiobrowserclient import RadioBrowserClient
 
-BASE_URL = "all.api.radio-browser.info"
 PAGE_SIZE = 10
 NAME = "name"
 STATIONCOUNT = "stationcount"
@@ -41,6 +39,9 @@ LANGUAGE_CODE = "iso_639"
 BUFFER_PAGE_SIZE = 100
 MAX_BUFFER_PAGES = 100
 FILE_RADIO_BROWSER_FAVORITES = "radiobrowser.m3u"
+FOLDER_RADIO_BROWSER_CACHE = "radiobrowser"
+LISTS_TTL = 24 * 60 * 60
+STATIONS_TTL = 60 * 60
 
 class RadioBrowser(object):
     """ Radio Browser Utility class """
@@ -57,7 +58,7 @@ class RadioBrowser(object):
         self.countries = None
         self.config = util.config
         self.radio_browser_playlist_cache = {}
-        self.urls = None
+        self.client = RadioBrowserClient(os.path.join(os.getcwd(), FOLDER_CACHE, FOLDER_RADIO_BROWSER_CACHE), LISTS_TTL)
         self.initial_favorites_size = 0
 
         self.buffers = {
@@ -85,52 +86,15 @@ class RadioBrowser(object):
             KEY_SEARCH_BY_NAME: "byname"
         }
 
-    def get_urls(self):
-        """ Get all available service URLs
-        
-        :return: the list of available URLs
-        """
-        urls = []
-
-        try:
-            info = socket.getaddrinfo(BASE_URL, 80, family=socket.AF_INET, proto=socket.IPPROTO_TCP)
-            for i in info:
-                ip = i[4][0]
-                urls.append("https://" + socket.gethostbyaddr(ip)[0])
-        except Exception as e:
-            logging.debug(e)
-
-        return urls
-
-    def get_data(self, resource):
-        """ Get data from the Radio Browser server
+    def get_data(self, resource, ttl=STATIONS_TTL):
+        """ Get data from the Radio Browser server or from the cache
         
         :param resource: resource to get
+        :param ttl: time to live of the cached data in seconds
 
         :return: data dictionary
         """
-        if not self.urls:
-            self.urls = self.get_urls()
-            if not self.urls:
-                return None
-        
-        d = None
-        
-        for url in self.urls:
-            try:
-                headers = {"User-Agent": "Peppy Player", "Content-Type": "application/json"}
-                link = url + resource
-                logging.debug(link)
-                data = requests.get(link, headers=headers, timeout=(10, 10))
-                if data.status_code != 200:
-                    logging.debug(f"Error code: {data.status_code} reason: {data.reason} for url: {link}")
-                    continue
-                d = data.json()
-                break
-            except Exception as e:
-                logging.debug(e)
-
-        return d
+        return self.client.get(resource, ttl)
     
     def get_server_stats(self):
         """ Get radio browser statistics
@@ -149,13 +113,14 @@ class RadioBrowser(object):
             return self.countries
 
         uri = f"/json/countries?hidebroken=true"
-        self.countries = self.get_data(uri)
-        self.countries = [c for c in self.countries if c["name"]]
+        data = self.get_data(uri, LISTS_TTL)
 
-        if self.countries == None:
+        if data == None:
             logging.debug("No countries found")
             return None
 
+        self.countries = [c for c in data if c["name"]]
+
         cache = self.cache_num[KEY_SEARCH_BY_COUNTRY]
         for c in self.countries:
             cache[c[COUNTRY_CODE]] = c[STATIONCOUNT]
@@ -171,7 +136,7 @@ class RadioBrowser(object):
             return self.languages
 
         uri = f"/json/languages?hidebroken=true"
-        data = self.get_data(uri)
+        data = self.get_data(uri, LISTS_TTL)
 
         if data == None:
             logging.debug("No languages found")
@@ -195,8 +160,21 @@ class RadioBrowser(object):
 
         :return: page dictionary
         """
-        uri = f"/json/stations/{resource}/{quote(item)}?offset={offset}&limit={BUFFER_PAGE_SIZE}&hidebroken=true"
-        return self.get_data(uri)
+        data = self.get_data(self.get_page_uri(resource, item, offset))
+        if data and len(data) == BUFFER_PAGE_SIZE:
+            self.client.prefetch(self.get_page_uri(resource, item, offset + BUFFER_PAGE_SIZE), STATIONS_TTL)
+        return data
+
+    def get_page_uri(self, resource, item, offset):
+        """ Get stations page URI
+
+        :param resource: search resource
+        :param item: search item
+        :param offset: page offset
+
+        :return: page URI
+        """
+        return f"/json/stations/{resource}/{quote(item)}?offset={offset}&limit={BUFFER_PAGE_SIZE}&hidebroken=true"
     
     def get_items_num(self, search_by, item):
         """ Get the number of items
@@ -321,6 +299,8 @@ class RadioBrowser(object):
             state = self.get_state_from_item(item, bgr, search_by, search_item, i)
             menu_items.append(state)
 
+        self.util.image_util.http_cache.prefetch([getattr(s, "image_path", None) for s in menu_items])
+
         return menu_items
 
     def get_state_from_item(self, item, bgr, search_by=None, search_item=None, index=0):
@@ -0,0 +1,271 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import json
+import socket
+import hashlib
+import logging
+import requests
+
+from threading import RLock, get_ident
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = "all.api.radio-browser.info"
+STATS_RESOURCE = "/json/stats"
+HEADERS = {"User-Agent": "Peppy Player", "Content-Type": "application/json"}
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 10
+FAILURE_PENALTY = 10.0
+LATENCY_WEIGHT = 0.3
+PREFETCH_THREADS = 2
+EXT_JSON = ".json"
+EXT_TMP = ".tmp"
+TIME = "time"
+DATA = "data"
+
+class RadioBrowserClient(object):
+    """ Radio Browser API client. The requests go through the persistent session to the mirror
+    with the lowest latency. If the mirror fails the next one is used and the failed mirror
+    is moved down in the ranking. The responses are cached on disk for the specified time.
+    """
+
+    def __init__(self, cache_folder, max_age):
+        """ Initializer
+
+        :param cache_folder: response cache folder
+        :param max_age: the longest time to live in seconds, older responses are removed from cache
+        """
+        self.cache_folder = cache_folder
+        self.max_age = max_age
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.lock = RLock()
+        self.mirrors = None
+        self.latencies = {}
+        self.pending = {}
+        self.executor = ThreadPoolExecutor(max_workers=PREFETCH_THREADS)
+        self.executor.submit(self.remove_expired)
+
+    def resolve_mirror(self, ip):
+        """ Get mirror URL by IP address
+
+        :param ip: IP address
+
+        :return: mirror URL or None
+        """
+        try:
+            return "https://" + socket.gethostbyaddr(ip)[0]
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+    def measure_latency(self, url):
+        """ Measure mirror latency
+
+        :param url: mirror URL
+
+        :return: latency in seconds
+        """
+        start = time.monotonic()
+        try:
+            response = self.session.get(url + STATS_RESOURCE, timeout=(CONNECT_TIMEOUT, CONNECT_TIMEOUT))
+            if response.status_code == 200:
+                return time.monotonic() - start
+        except Exception as e:
+            logging.debug(e)
+        return FAILURE_PENALTY
+
+    def get_mirrors(self):
+        """ Find all mirrors and rank them by latency. Reverse lookups and latency
+        measurements are made concurrently.
+
+        :return: the list of mirror URLs sorted by latency
+        """
+        with self.lock:
+            if self.mirrors:
+                return self.mirrors
+
+        try:
+            info = socket.getaddrinfo(BASE_URL, 80, family=socket.AF_INET, proto=socket.IPPROTO_TCP)
+            ips = list(dict.fromkeys([i[4][0] for i in info]))
+        except Exception as e:
+            logging.debug(e)
+            return []
+
+        with ThreadPoolExecutor(max_workers=max(len(ips), 1)) as executor:
+            urls = [u for u in executor.map(self.resolve_mirror, ips) if u]
+            latencies = list(executor.map(self.measure_latency, urls))
+
+        with self.lock:
+            self.latencies = dict(zip(urls, latencies))
+            self.mirrors = sorted(urls, key=lambda u: self.latencies[u])
+            logging.debug("Radio Browser mirrors: %s", self.latencies)
+            return self.mirrors
+
+    def update_latency(self, url, latency):
+        """ Update mirror latency and the mirrors ranking
+
+        :param url: mirror URL
+        :param latency: the last request latency
+        """
+        with self.lock:
+            old = self.latencies.get(url, latency)
+            self.latencies[url] = old + (latency - old) * LATENCY_WEIGHT
+            if self.mirrors:
+                self.mirrors = sorted(self.mirrors, key=lambda u: self.latencies[u])
+
+    def get_cache_path(self, resource):
+        """ Get the path to the cached response
+
+        :param resource: resource
+
+        :return: file path
+        """
+        key = hashlib.sha1(resource.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_folder, key + EXT_JSON)
+
+    def get_cached(self, resource, ttl):
+        """ Get cached response
+
+        :param resource: resource
+        :param ttl: time to live in seconds, None - any age
+
+        :return: response data or None if not cached or expired
+        """
+        try:
+            with open(self.get_cache_path(resource)) as f:
+                cached = json.load(f)
+            if ttl == None or time.time() - cached[TIME] <= ttl:
+                return cached[DATA]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(e)
+        return None
+
+    def put_cached(self, resource, data):
+        """ Save response in cache
+
+        :param resource: resource
+        :param data: response data
+        """
+        path = self.get_cache_path(resource)
+        tmp_path = path + "." + str(get_ident()) + EXT_TMP
+        try:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({TIME: time.time(), DATA: data}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.debug(e)
+
+    def remove_expired(self):
+        """ Remove cached responses and temporary files which are older than the maximum age """
+
+        now = time.time()
+        try:
+            with os.scandir(self.cache_folder) as it:
+                for entry in it:
+                    try:
+                        if now - entry.stat().st_mtime > self.max_age:
+                            os.remove(entry.path)
+                    except OSError as e:
+                        logging.debug(e)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(e)
+
+    def fetch(self, resource):
+        """ Request resource from the mirrors in the ranking order
+
+        :param resource: resource
+
+        :return: response data or None
+        """
+        for url in list(self.get_mirrors()):
+            link = url + resource
+            logging.debug(link)
+            start = time.monotonic()
+            try:
+                response = self.session.get(link, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+                if response.status_code != 200:
+                    logging.debug(f"Error code: {response.status_code} reason: {response.reason} for url: {link}")
+                    self.update_latency(url, FAILURE_PENALTY)
+                    continue
+                data = response.json()
+                self.update_latency(url, time.monotonic() - start)
+                return data
+            except Exception as e:
+                logging.debug(e)
+                self.update_latency(url, FAILURE_PENALTY)
+
+        return None
+
+    def get(self, resource, ttl):
+        """ Get resource from cache or from server. If the server is not available
+        the expired cached response is used.
+
+        :param resource: resource
+        :param ttl: time to live of the cached response in seconds
+
+        :return: response data or None
+        """
+        with self.lock:
+            future = self.pending.get(resource, None)
+        if future != None:
+            future.result()
+
+        data = self.get_cached(resource, ttl)
+        if data != None:
+            return data
+
+        data = self.fetch(resource)
+        if data != None:
+            self.put_cached(resource, data)
+            return data
+
+        return self.get_cached(resource, None)
+
+    def prefetch(self, resource, ttl):
+        """ Get resource in background if it's not cached
+
+        :param resource: resource
+        :param ttl: time to live of the cached response in seconds
+        """
+        with self.lock:
+            if resource in self.pending or self.get_cached(resource, ttl) != None:
+                return
+            self.pending[resource] = self.executor.submit(self.prefetch_resource, resource, ttl)
+
+    def prefetch_resource(self, resource, ttl):
+        """ Background prefetch task
+
+        :param resource: resource
+        :param ttl: time to live of the cached response in seconds
+        """
+        try:
+            data = self.fetch(resource)
+            if data != None:
+                self.put_cached(resource, data)
+        except Exception as e:
+            logging.debug(e)
+        finally:
+            with self.lock:
+                self.pending.pop(resource, None)
@@ -18,6 +18,8 @@
 from util.collector import DbUtil
 from util.keys import KEY_ABC, KEY_SEARCH
 
+MAX_CHARACTER = chr(0x10FFFF)
+
 class Selector(object):
     """ Collection of the SQL select statements and helper functions """
 
@@ -74,6 +76,34 @@ class Selector(object):
                     result.append((n[0], n[1]))
         return result
 
+    def get_char_ranges(self, column, ch):
+        """ Get condition and parameters which allow to use LOWER(TRIM(column)) index for the first character filter.
+        The range is used for one character only. Values in the range should be additionally filtered by LIKE.
+
+        :param column: column name
+        :param ch: character
+
+        :return: tuple (condition, parameters)
+        """
+        if len(ch) != 1 or ch in "%_":
+            return ("", ())
+
+        lower = ch.lower()
+        condition = f"""LOWER(TRIM({column})) >= ? AND LOWER(TRIM({column})) < ? AND"""
+        return (condition, (lower, lower + MAX_CHARACTER))
+
+    def get_search_condition(self, column):
+        """ Get condition for the pattern search. Full text search table is used if available.
+
+        :param column: column name
+
+        :return: condition string
+        """
+        if self.dbutil.search_available:
+            return f"""id IN (SELECT rowid FROM {self.dbutil.search_table_name} WHERE {column} like ?)"""
+        else:
+            return f"""LOWER(TRIM({column})) like ?"""
+
     def get_offset(self, page, next, page_size):
         """ Get offset clause
 
@@ -214,14 +244,16 @@ class Selector(object):
 
         :return: page count
         """
+        ranges, params = self.get_char_ranges(column, ch)
         query = f"""
             SELECT COUNT(DISTINCT {column})
             FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
+            WHERE {ranges}
+            LENGTH(TRIM({column})) > 2 AND 
             LOWER(TRIM({column})) like ?
             ORDER BY {column} ASC
         """
-        return self.get_count(self.dbutil.run_parameterized_query(query, (ch.lower() + "%",)), page_size)
+        return self.get_count(self.dbutil.run_parameterized_query(query, params + (ch.lower() + "%",)), page_size)
 
     def get_page_by_char(self, column, ch, value="", page=None, next=True, page_size=10):
         """ Get values for the page filtered by the first character
@@ -235,16 +267,18 @@ class Selector(object):
 
         :return: list of values
         """
+        ranges, params = self.get_char_ranges(column, ch)
         query = f"""
             SELECT DISTINCT {column}
             FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
+            WHERE {ranges}
+            LENGTH(TRIM({column})) > 2 AND 
             LOWER(TRIM({column})) like ? AND 
             {column} {self.get_sign(next)} ?
             ORDER BY {column} ASC 
             LIMIT {page_size} {self.get_offset(page, next, page_size)}
         """
-        return self.get_list(self.dbutil.run_parameterized_query(query, (ch.lower() + "%", value)))
+        return self.get_list(self.dbutil.run_parameterized_query(query, params + (ch.lower() + "%", value)))
 
     def get_page_count_by_pattern(self, column, pattern, page_size):
         """ Get page count filtered by the search pattern
@@ -259,7 +293,7 @@ class Selector(object):
             SELECT COUNT(DISTINCT {column})
             FROM {self.dbutil.table_name} 
             WHERE LENGTH(LOWER(TRIM({column}))) > 0 AND 
-            LOWER(TRIM({column})) like ?
+            {self.get_search_condition(column)}
             ORDER BY {column} ASC
         """
         return self.get_count(self.dbutil.run_parameterized_query(query, ("%" + pattern.lower() + "%",)), page_size)
@@ -280,7 +314,7 @@ class Selector(object):
             SELECT DISTINCT {column}
             FROM {self.dbutil.table_name} 
             WHERE LENGTH(TRIM({column})) > 2 AND 
-            LOWER(TRIM({column})) like ? AND 
+            {self.get_search_condition(column)} AND 
             {column} {self.get_sign(next)} ?
             ORDER BY {column} ASC 
             LIMIT {page_size} {self.get_offset(page, next, page_size)}
@@ -0,0 +1,63 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import logging
+
+class StartupTimer(object):
+    """ Measures duration of the startup phases and reports them to the log """
+
+    def __init__(self, start_time=None):
+        """ Initializer
+
+        :param start_time: process start time (time.monotonic), current time if not defined
+        """
+        if start_time == None:
+            start_time = time.monotonic()
+
+        self.start_time = start_time
+        self.phase_start = start_time
+        self.phases = []
+
+    def phase(self, name):
+        """ Finish the current phase
+
+        :param name: phase name
+        """
+        now = time.monotonic()
+        self.phases.append((name, now - self.phase_start))
+        self.phase_start = now
+
+    def get_total(self):
+        """ Get time passed since the start
+
+        :return: time in seconds
+        """
+        return time.monotonic() - self.start_time
+
+    def report(self, details=None):
+        """ Write phase durations to the log
+
+        :param details: optional list of (name, duration) tuples reported after the phases
+        """
+        logging.info("Startup time: %.3f s", self.get_total())
+        for name, duration in self.phases:
+            logging.info("  %-20s %.3f s", name, duration)
+
+        if details:
+            for name, duration in details:
+                logging.info("  %-40s %.3f s", name, duration)
@@ -42,6 +42,8 @@ from util.discogsutil import DiscogsUtil
 from util.collector import DbUtil, INFO, METADATA, MP4_METADATA
 from util.bluetoothutil import BluetoothUtil
 from util.imageutil import ImageUtil, EXT_MP4, EXT_M4A
+from util.cache import CACHE_BUDGETS, MEGABYTE
+from util.fontmanager import FontManager, FOLDER_FONT
 from util.switchutil import SwitchUtil
 from util.sambautil import SambaUtil
 from util.yastreamutil import YaStreamUtil
@@ -100,7 +102,6 @@ FOLDER_SLIDES = "slides"
 FOLDER_STATIONS = "stations"
 FOLDER_HOME = "home"
 FOLDER_GENRES = "genres"
-FOLDER_FONT = "font"
 FOLDER_PLAYLIST = "playlist"
 
 PACKAGE_SCREENSAVER = "screensaver"    
@@ -122,7 +123,6 @@ class Util(object):
         """ Initializer. Prepares Config object. """
 
         self.connected_to_internet = False
-        self.font_cache = {}
         self.voice_commands_cache = {}
         self.cd_titles = {}
         self.cd_track_names_cache = {}
@@ -140,6 +140,7 @@ class Util(object):
         self.pygame_screen = self.config_class.pygame_screen
         self.CURRENT_WORKING_DIRECTORY = os.getcwd()
         self.read_storage()
+        self.font_manager = FontManager(self)
                 
         if (not os.environ.get('PYTHONHTTPSVERIFY', '') and getattr(ssl, '_create_unverified_context', None)): 
             ssl._create_default_https_context = ssl._create_unverified_context
@@ -149,6 +150,15 @@ class Util(object):
         self.radio_browser = None
         self.default_radio_icon_path = os.path.join(os.getcwd(), FOLDER_ICONS, FILE_DEFAULT_STATION)
     
+    def get_cache_size(self, name):
+        """ Get cache budget
+
+        :param name: cache name
+
+        :return: cache size in bytes
+        """
+        return int(self.config[USAGE][USE_IMAGE_CACHE_SIZE] * MEGABYTE * CACHE_BUDGETS[name] / 100)
+
     def init_utilities(self):
         """ Initialize utilities """
 
@@ -313,35 +323,11 @@ class Util(object):
         return fonts        
 
     def get_font(self, size):
-        """ Return font from cache if not in cache load, place in cache and return.
+        """ Return font for the current language from cache, if not in cache load, place in cache and return.
         
         :param size: font size 
         """
-        if os.getcwd() != self.CURRENT_WORKING_DIRECTORY:
-            os.chdir(self.CURRENT_WORKING_DIRECTORY)
-        
-        current_language = self.config[CURRENT][LANGUAGE]
-        path = os.path.join(os.getcwd(), FOLDER_LANGUAGES, current_language)
-        language_specific_font = None
-        for file in os.listdir(path):
-            if file.lower().endswith(".ttf"):
-                language_specific_font = file
-                break
-        
-        if language_specific_font:
-            key = language_specific_font + str(size)
-            filename = os.path.join(path, language_specific_font)
-        else:
-            font_name = self.config[FONT_KEY]
-            key = font_name + str(size)
-            filename = os.path.join(FOLDER_FONT, font_name)
-            
-        if key in self.font_cache:
-            return self.font_cache[key]
-        
-        font = pygame.font.Font(filename, size)
-        self.font_cache[key] = font
-        return font
+        return self.font_manager.get_font(size)
 
     def get_current_font_name(self):
         """ Return the current font name
@@ -42,6 +42,9 @@ export default class Usage extends React.Component {
           {Factory.createNumberTextField("dns.ip", params, updateState,
             "", {width: "10rem", marginTop: "1rem"}, classes, labels
           )}
+          {Factory.createNumberTextField("image.cache.size", params, updateState,
+            "MB", {width: "10rem", marginTop: "1rem"}, classes, labels
+          )}
         </FormControl>
         <FormControl component="fieldset">
           <FormGroup column="true">
@@ -17,6 +17,7 @@ along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 */
 
 DEBUG = false; // global
+uiVersion = null; // global, version of the server UI tree shown in the client
 
 if(!DEBUG || typeof(console.log) == 'undefined') {
    console.log = function() {};
@@ -59,9 +60,21 @@ function dispatchMessageFromServer(msg) {
 	var comps = d["components"];
 	
 	if(isScreensaverRunning() && c != "stop_screensaver" && c !== "vumeter") {
+		uiVersion = null;
 		return;
 	}
 
+	if(Object.hasOwn(d, "base") && d["base"] !== uiVersion) {
+		// delta for another version of the screen, request the full screen
+		uiVersion = null;
+		initializeWebUi();
+		return;
+	}
+
+	if(Object.hasOwn(d, "version")) {
+		uiVersion = d["version"];
+	}
+
 	console.log("command: " + c);
 	
 	if(c == "update_screen" || c== "update_screensaver") {
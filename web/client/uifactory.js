@@ -169,8 +169,8 @@ function createComponent(d) {
 			sliderWidth = d.w;
 		}
 	} else if(d.type == "image") {
-		let data = Object.hasOwn(d, "data") ? d.data : null;
-		comp = createImage(d.name, data, d.filename, d.x, d.y, d.w, d.h);
+		let url = Object.hasOwn(d, "url") ? d.url : null;
+		comp = createImage(d.name, url, d.filename, d.x, d.y, d.w, d.h);
 		if (comp != null) {
 			if(d.name == volumeKnobId || d.name == timerKnobId) {
 				comp.setAttribute("style", "cursor: move;");
@@ -409,7 +409,7 @@ function createPanel(id, width, height, fgr, bgr, bgrType) {
 
 	if((bgrType == "image" || bgrType == "album.art") && bgr) {
 		console.log(bgrType);
-		var img = createImage(bgr.filename, bgr.data, bgr.filename, bgr.x, bgr.y, bgr.w, bgr.h);
+		var img = createImage(bgr.filename, bgr.url, bgr.filename, bgr.x, bgr.y, bgr.w, bgr.h);
 		panel.appendChild(img);
 	} else {	
 		var rect = createRectangle(id + ".rect", 0, 0, width, height, fgr, bgr, 0);
@@ -468,7 +468,7 @@ function createRectangle(id, x, y, w, h, lineColor, fillColor, border) {
 * Creates SVG image component
 *
 * @param id - the name of component
-* @param data image data
+* @param url - url of the image in the image store
 * @param filename - image filename
 * @param x - image X coordinate
 * @param y - image Y coordinate
@@ -477,22 +477,16 @@ function createRectangle(id, x, y, w, h, lineColor, fillColor, border) {
 * 
 * @return new SVG image
 */
-function createImage(id, data, filename, x, y, w, h) {
+function createImage(id, url, filename, x, y, w, h) {
 	console.log("image id:" + id + " filename:" + filename + " x:" + x + " y:" + y + " w:" + w + " h:" + h);
 	var img = document.createElementNS(SVG_URL, 'image');
 	if (filename.startsWith("http")) {
 		img.setAttributeNS(XLINK_URL, 'href', decodeURIComponent(filename));
 	} else {
-		if (data == null) {
+		if (url == null) {
 			return null;
 		}
-
-		if(filename.endsWith(".svg")) {
-			img.setAttributeNS(XLINK_URL, 'href', "data:image/svg+xml;base64," + data);
-		} else {
-			console.log(data.length);
-			img.setAttributeNS(XLINK_URL, 'href', "data:image/png;base64," + data);
-		}
+		img.setAttributeNS(XLINK_URL, 'href', url);
 	}
 
 	img.setAttribute('width', w);
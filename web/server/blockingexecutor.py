@@ -0,0 +1,34 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+from concurrent.futures import ThreadPoolExecutor
+from tornado.ioloop import IOLoop
+
+BLOCKING_WORKERS = 4
+
+executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="web")
+
+def run_blocking(target, *args):
+    """ Run blocking function in the bounded thread pool, so it doesn't block the IOLoop thread.
+    Should be called from the IOLoop thread.
+
+    :param target: function to execute
+    :param args: function arguments
+
+    :return: awaitable future with the function result
+    """
+    return IOLoop.current().run_in_executor(executor, target, *args)
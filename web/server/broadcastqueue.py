@@ -0,0 +1,278 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+
+from threading import RLock
+from collections import OrderedDict
+from web.server.uitree import COMMAND, COMPONENTS, NAME, VERSION, UPDATE_ELEMENT, SCREEN_COMMANDS
+
+FRAME_WINDOW = 0.05
+UPDATE_SCREENSAVER = "update_screensaver"
+KEY_SCREEN = "screen"
+
+class BroadcastQueue(object):
+    """ Collects web UI updates during the frame window and sends them to the web clients
+    at once in the IOLoop thread. The updates of the same component and the repeated commands
+    are coalesced, so only the latest state is sent. If the client didn't receive the previous
+    message yet the new message is not buffered. Superseded commands are replaced and
+    skipped screen updates are replaced by the full screen when the client catches up.
+    """
+
+    def __init__(self, ui_tree, web_clients):
+        """ Initializer
+
+        :param ui_tree: versioned tree of web UI components
+        :param web_clients: the list of web clients
+        """
+        self.ui_tree = ui_tree
+        self.web_clients = web_clients
+        self.lock = RLock()
+        self.pending = OrderedDict()
+        self.instance = None
+        self.scheduled = False
+        self.received = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def start(self, instance):
+        """ Start sending updates
+
+        :param instance: IOLoop instance
+        """
+        self.instance = instance
+
+    def put(self, j):
+        """ Add message to the queue. Can be called from any thread.
+
+        :param j: Json object
+        """
+        if self.instance == None:
+            return
+
+        with self.lock:
+            self.received += 1
+            command = j[COMMAND]
+
+            if command in SCREEN_COMMANDS:
+                if self.pending.pop(KEY_SCREEN, None) != None:
+                    self.coalesced += 1
+                self.coalesced += len(self.pending.pop(UPDATE_ELEMENT, {}))
+                self.pending[KEY_SCREEN] = j
+            elif command == UPDATE_ELEMENT:
+                elements = self.pending.get(UPDATE_ELEMENT)
+                if elements == None:
+                    elements = self.pending[UPDATE_ELEMENT] = OrderedDict()
+                else:
+                    # keep the order relative to the commands queued after the first update
+                    self.pending.move_to_end(UPDATE_ELEMENT)
+                self.coalesced += self.merge_elements(elements, j[COMPONENTS])
+            else:
+                if command in self.pending:
+                    self.coalesced += 1
+                    del self.pending[command]
+                self.pending[command] = j
+
+            if not self.scheduled:
+                self.scheduled = True
+                self.instance.add_callback(self.instance.call_later, FRAME_WINDOW, self.flush)
+
+    def merge_elements(self, elements, components):
+        """ Merge updated components, the latest update of the component replaces the previous one
+
+        :param elements: dictionary where key - component name, value - component
+        :param components: list of updated components
+
+        :return: the number of replaced components
+        """
+        replaced = 0
+        for c in components:
+            if not c:
+                continue
+            key = c.get(NAME) or id(c)
+            if key in elements:
+                replaced += 1
+                del elements[key]
+            elements[key] = c
+        return replaced
+
+    def get_messages(self):
+        """ Take pending messages from the queue
+
+        :return: list of Json objects
+        """
+        with self.lock:
+            pending = self.pending
+            self.pending = OrderedDict()
+            self.scheduled = False
+
+        messages = []
+        for key, value in pending.items():
+            if key == UPDATE_ELEMENT:
+                messages.append({COMMAND: UPDATE_ELEMENT, COMPONENTS: list(value.values())})
+            else:
+                messages.append(value)
+        return messages
+
+    def flush(self):
+        """ Send pending messages to the web clients. Called in the IOLoop thread. """
+
+        busy = [c for c in list(self.web_clients) if self.is_busy(c)]
+        for j in self.get_messages():
+            try:
+                self.broadcast(j, busy)
+            except Exception as e:
+                logging.debug(e)
+
+    def broadcast(self, j, busy):
+        """ Send message to all web clients
+
+        :param j: Json object
+        :param busy: clients which didn't receive messages of the previous frames yet
+        """
+        with self.ui_tree.lock:
+            base, message = self.ui_tree.update(j)
+            version = self.ui_tree.version
+            full_screen = None
+            encoded = {}
+
+            for c in list(self.web_clients):
+                m = message
+                if base != None and c.version != base:
+                    if full_screen == None:
+                        full_screen = self.ui_tree.get_full_screen()
+                    m = full_screen
+                if m == None:
+                    continue
+                # custom - alternative UI e.g. minimalist
+                if m[COMMAND] == UPDATE_SCREENSAVER and getattr(c, "custom", False):
+                    continue
+
+                if c in busy:
+                    self.drop(c, m)
+                    continue
+
+                if VERSION in m:
+                    c.version = version
+                e = encoded.get(id(m))
+                if e == None:
+                    e = json.dumps(m).encode(encoding="utf-8")
+                    encoded[id(m)] = e
+                self.write(c, e)
+
+    def is_busy(self, client):
+        """ Check if the client didn't receive the last message yet
+
+        :param client: web client
+
+        :return: True - busy, False - ready for the next message
+        """
+        f = getattr(client, "write_future", None)
+        return f != None and not f.done()
+
+    def drop(self, client, m):
+        """ Drop message for the busy client. Versioned messages are dropped completely,
+        the client will get the full screen later. Unversioned component updates are merged
+        by component name. Other commands replace the previous command of the same type.
+
+        :param client: web client
+        :param m: Json object
+        """
+        self.dropped += 1
+        if VERSION in m:
+            client.version = None
+            return
+
+        backlog = client.backlog
+        command = m[COMMAND]
+        if command == UPDATE_ELEMENT:
+            elements = backlog.get(UPDATE_ELEMENT)
+            if elements == None:
+                elements = backlog[UPDATE_ELEMENT] = OrderedDict()
+            else:
+                backlog.move_to_end(UPDATE_ELEMENT)
+            self.merge_elements(elements, m[COMPONENTS])
+            return
+
+        if command in backlog:
+            del backlog[command]
+        backlog[command] = m
+
+    def write(self, client, e):
+        """ Write message to the client
+
+        :param client: web client
+        :param e: encoded message
+        """
+        try:
+            client.write_future = client.write_message(e)
+            client.write_future.add_done_callback(lambda f: self.catch_up(client))
+            self.sent += 1
+        except Exception as ex:
+            client.write_future = None
+            logging.debug(ex)
+
+    def catch_up(self, client):
+        """ Send messages skipped while the client was busy. Called in the IOLoop thread.
+
+        :param client: web client
+        """
+        if client not in self.web_clients or self.is_busy(client):
+            return
+
+        if client.backlog:
+            command, m = client.backlog.popitem(last=False)
+            if command == UPDATE_ELEMENT:
+                m = {COMMAND: UPDATE_ELEMENT, COMPONENTS: list(m.values())}
+            self.write(client, json.dumps(m).encode(encoding="utf-8"))
+            return
+
+        with self.ui_tree.lock:
+            if client.version != None:
+                return
+            full_screen = self.ui_tree.get_full_screen()
+            if full_screen == None:
+                return
+            if full_screen[COMMAND] == UPDATE_SCREENSAVER and getattr(client, "custom", False):
+                return
+            client.version = self.ui_tree.version
+            self.write(client, json.dumps(full_screen).encode(encoding="utf-8"))
+
+    def get_stats(self):
+        """ Get queue statistics
+
+        :return: dictionary with statistics
+        """
+        with self.lock:
+            pending = 0
+            for key, value in self.pending.items():
+                if key == UPDATE_ELEMENT:
+                    pending += len(value)
+                else:
+                    pending += 1
+            clients = [{"busy": self.is_busy(c), "backlog": len(c.backlog)} for c in list(self.web_clients)]
+
+            return {
+                "pending": pending,
+                "received": self.received,
+                "coalesced": self.coalesced,
+                "sent": self.sent,
+                "dropped": self.dropped,
+                "clients": clients
+            }
@@ -20,7 +20,7 @@ import pygame
 import json
 import tornado.websocket
 
-from threading import Thread
+from collections import OrderedDict
 
 class WebSocketHandler(tornado.websocket.WebSocketHandler):
     """ Custom WebSocket handler extends Tornado handler """
@@ -33,6 +33,9 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
         """
         self.redraw_web_ui = redraw_web_ui
         self.web_clients = web_clients
+        self.version = None
+        self.write_future = None
+        self.backlog = OrderedDict()
         args = self.request.arguments
         if args and args.get("custom"):
             self.custom = True
@@ -70,6 +73,7 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
         :param d: command object
         """
         if d["command"] == "init":
+            self.version = None # full screen is sent to the client without the current UI version
             self.redraw_web_ui()
         elif d["command"] == "ping":
             pass
@@ -87,5 +91,4 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
                 event = pygame.event.Event(pygame.MOUSEMOTION, **a)
                 event.p = True
             event.source = "browser"
-            thread = Thread(target=pygame.event.post, args=[event])
-            thread.start()
+            pygame.event.post(event) # thread safe and non-blocking, keeps the order of events
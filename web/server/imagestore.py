@@ -0,0 +1,180 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import base64
+import hashlib
+import logging
+import pygame
+
+from threading import RLock
+from util.cache import LruCache, MEGABYTE
+from util.imageutil import EXT_SVG
+
+IMAGE_STORE_SIZE = 8 * MEGABYTE
+IMAGE_URL = "/api/image/"
+CONTENT_TYPE_PNG = "image/png"
+CONTENT_TYPE_JPEG = "image/jpeg"
+CONTENT_TYPE_GIF = "image/gif"
+CONTENT_TYPE_SVG = "image/svg+xml"
+CONTENT_TYPE_BINARY = "application/octet-stream"
+
+class ImageStore(object):
+    """ Content addressed store of encoded images for the web clients. Images are referenced
+    by the hash of their content, so the same artwork is encoded only once and the web clients
+    can cache it forever. The hash is also used as ETag of the image. The latest screen
+    snapshot is kept separately, so polling clients don't evict the referenced images.
+    """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.images = LruCache("web.images", IMAGE_STORE_SIZE)
+        self.lock = RLock()
+        self.snapshot = None
+
+    def get_url(self, key):
+        """ Get image url
+
+        :param key: image hash
+
+        :return: relative url of the image
+        """
+        return IMAGE_URL + key
+
+    def get_image(self, key):
+        """ Get encoded image
+
+        :param key: image hash
+
+        :return: tuple (content type, image bytes) or None if image is not in the store
+        """
+        return self.images.get(key)
+
+    def put_surface(self, surface, image_util):
+        """ Encode Pygame Surface as PNG image and put it into the store.
+        The surface is hashed on every call because the surface content can change.
+        PNG encoding happens only for the new content.
+
+        :param surface: Pygame Surface object
+        :param image_util: image utility object
+
+        :return: image hash or None if surface cannot be encoded
+        """
+        key = self.get_surface_hash(surface)
+        if key == None:
+            return None
+
+        if key in self.images:
+            return key
+
+        img = image_util.get_png_from_surface(surface)
+        if img == None:
+            return None
+
+        self.images[key] = (CONTENT_TYPE_PNG, img)
+        return key
+
+    def put_snapshot(self, surface, image_util):
+        """ Encode screen snapshot as PNG image. Only the latest snapshot is kept.
+
+        :param surface: Pygame Surface object
+        :param image_util: image utility object
+
+        :return: tuple (image hash, (content type, image bytes)) or None if surface cannot be encoded
+        """
+        key = self.get_surface_hash(surface)
+        if key == None:
+            return None
+
+        with self.lock:
+            snapshot = self.snapshot
+        if snapshot != None and snapshot[0] == key:
+            return snapshot
+
+        img = image_util.get_png_from_surface(surface)
+        if img == None:
+            return None
+
+        snapshot = (key, (CONTENT_TYPE_PNG, img))
+        with self.lock:
+            self.snapshot = snapshot
+        return snapshot
+
+    def get_surface_hash(self, surface):
+        """ Get hash of the surface content
+
+        :param surface: Pygame Surface object
+
+        :return: hash or None if surface cannot be read
+        """
+        if surface == None:
+            return None
+
+        try:
+            d = pygame.image.tostring(surface, "RGBA", False)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        h = hashlib.sha1(d)
+        h.update(str(surface.get_size()).encode())
+        return h.hexdigest()
+
+    def put_base64(self, filename, data):
+        """ Put base64 encoded image into the store
+
+        :param filename: image filename used to detect SVG images
+        :param data: base64 encoded image
+
+        :return: image hash or None if there is no data
+        """
+        if not data:
+            return None
+
+        key = hashlib.sha1(data.encode()).hexdigest()
+        if key in self.images:
+            return key
+
+        try:
+            img = base64.b64decode(data)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        self.images[key] = (self.get_content_type(filename, img), img)
+        return key
+
+    def get_content_type(self, filename, img):
+        """ Detect image content type
+
+        :param filename: image filename
+        :param img: image bytes
+
+        :return: content type
+        """
+        if img.startswith(b"\x89PNG"):
+            return CONTENT_TYPE_PNG
+        elif img.startswith(b"\xff\xd8"):
+            return CONTENT_TYPE_JPEG
+        elif img.startswith(b"GIF8"):
+            return CONTENT_TYPE_GIF
+        elif filename.lower().endswith(EXT_SVG) or img.lstrip().startswith(b"<"):
+            return CONTENT_TYPE_SVG
+        else:
+            return CONTENT_TYPE_BINARY
+
+image_store = ImageStore()
@@ -20,6 +20,7 @@ import random
 
 from ui.component import Component
 from ui.container import Container
+from web.server.imagestore import image_store
 from util.keys import KEY_STATIONS, KEY_LOADING
 from screensaver.screensaverdispatcher import WEB_SAVERS
 from util.config import USAGE, USE_ALBUM_ART, USE_BROWSER_STREAM_PLAYER, SCREEN_INFO, VOLUME, MUTE, PAUSE, \
@@ -292,17 +293,27 @@ class JsonFactory(object):
         c["h"] = img.get_height()
 
         if c["filename"].startswith(GENERATED_IMAGE):
-            c["data"] = self.image_util.get_base64_surface(img)
+            self.set_image_url(c, image_store.put_surface(img, self.image_util))
             return c
         
         if not c["filename"].startswith("http"):
-            c["data"] = self.image_util.load_image(c["filename"], True)
+            data = self.image_util.load_image(c["filename"], True)
+            self.set_image_url(c, image_store.put_base64(c["filename"], data))
         
         if "_" in c["filename"] and not c["filename"].startswith("http"):
             c["filename"] = c["filename"][0 : c["filename"].find("_")]
 
         return c
 
+    def set_image_url(self, c, key):
+        """ Reference image from the image store instead of embedding it into Json
+
+        :param c: image dictionary
+        :param key: image hash
+        """
+        if key:
+            c["url"] = image_store.get_url(key)
+
     def component_to_json(self, component):
         """ Dispatcher method for converting components into Json dictionaries
         
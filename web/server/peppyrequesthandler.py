@@ -34,3 +34,21 @@ class PeppyRequestHandler(RequestHandler):
         tokens = c.split(",")
         nums = [int(i) for i in tokens]
         return nums
+
+    def write_image(self, key, image, cache_control):
+        """ Write encoded image using its hash as ETag.
+        If the client already has the same image the response status is 304 without body.
+
+        :param key: image hash
+        :param image: tuple (content type, image bytes)
+        :param cache_control: Cache-Control header value
+        """
+        self.set_header("Etag", '"' + key + '"')
+        self.set_header("Cache-Control", cache_control)
+
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+
+        self.set_header("Content-Type", image[0])
+        self.write(image[1])
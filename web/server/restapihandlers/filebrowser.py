@@ -22,6 +22,7 @@ import sys
 
 from tornado.web import RequestHandler
 from util.config import MUSIC_FOLDER
+from web.server.blockingexecutor import run_blocking
 
 COMMAND_CURRENT_FOLDER = "currentfolder"
 COMMAND_CURRENT_FILE = "currentfile"
@@ -34,11 +35,16 @@ COMMAND_FILE_INFO = "fileinfo"
 
 ARGUMENT_IMAGES = "images"
 ARGUMENT_METADATA = "metadata"
+ARGUMENT_CURSOR = "cursor"
+ARGUMENT_LIMIT = "limit"
 
 FOLDER = "folder"
 FILE = "file"
 FILES = "files"
 FOLDER_IMAGE_PATH = "folder.image.path"
+TOTAL = "total"
+NEXT_CURSOR = "next"
+STREAM_CHUNK_SIZE = 100
 
 FILE_NAME = "file_name"
 FILE_TYPE = "file_type"
@@ -66,6 +72,8 @@ class FileBrowserHandler(RequestHandler):
             "url": "C:\\music\\test.flac"
         }
     curl http://localhost:8000/api/filebrowser?folder="C:\\music\\samples"
+    curl http://localhost:8000/api/filebrowser?cursor=200&limit=100 - return 100 items starting from item 200,
+        "total" is the number of items in folder, "next" is the cursor of the next page or null
     """
     def initialize(self, peppy):
         self.util = peppy.util
@@ -74,14 +82,14 @@ class FileBrowserHandler(RequestHandler):
         self.show_file_details = True
         self.default_music_folder = self.util.config[MUSIC_FOLDER]
 
-    def get(self):
+    async def get(self):
         view = self.get_argument("view", default="full")
         if view == "full":
-            self.get_full_content()
+            await self.get_full_content()
         elif view == "simple":
-            self.get_simple_content()
+            await self.get_simple_content()
 
-    def get_simple_content(self):
+    async def get_simple_content(self):
         """
          curl 'http://localhost:8000/api/filebrowser?folder=C:\\music\\pop\\a\\ABBA&view=simple'
         """
@@ -91,7 +99,7 @@ class FileBrowserHandler(RequestHandler):
             folder = self.default_music_folder
 
         try:
-            files = self.file_util.get_folders_audio_files(folder, True)
+            files = await run_blocking(self.file_util.get_folders_audio_files, folder, True)
             tokens = folder.split(os.sep)
             path_tokens = list(filter(lambda token: token, tokens))
             breadcrumbs = []
@@ -124,29 +132,87 @@ class FileBrowserHandler(RequestHandler):
             self.set_status(500, reason=str(e))
             return self.finish()
 
-    def get_full_content(self):
+    async def get_full_content(self):
         try:
             folder = self.file_util.current_folder
-            store_folder_name = True
+            cursor = 0
+            limit = None
             
             if self.request.arguments:
                 folder = self.get_argument("folder", default=folder)
                 self.read_embedded_images = self.get_boolean_argument(ARGUMENT_IMAGES, FALSE)
-
-            file_objects = self.file_util.get_folder_content(folder, store_folder_name, self.read_embedded_images, self.show_file_details)
-            folder_image_path = self.util.get_folder_image_path(folder)
-
-            if file_objects == None:
-                files = {FOLDER: folder, FOLDER_IMAGE_PATH: folder_image_path, FILES: []}
-            else:
-                folder_content = self.convert_to_dictionaries(file_objects)
-                files = {FOLDER: folder, FOLDER_IMAGE_PATH: folder_image_path, FILES: folder_content}
-
-            self.write(json.dumps(files))
+                cursor = max(int(self.get_argument(ARGUMENT_CURSOR, default="0")), 0)
+                limit = self.get_argument(ARGUMENT_LIMIT, default=None)
+                if limit != None:
+                    limit = max(int(limit), 1)
+
+            # the folder is read in the thread pool with store_folder_name=False,
+            # only the first page changes the current folder and it's done on the IOLoop thread
+            store_folder_name = cursor == 0
+            found_folder, content = await run_blocking(self.get_content_page, folder, False, cursor, limit)
+            if store_folder_name and found_folder != None:
+                self.file_util.current_folder = found_folder
         except Exception as e:
             self.set_status(500)
             return self.finish()
 
+        await self.write_content(content)
+
+    def get_content_page(self, folder, store_folder_name, cursor, limit):
+        """ Get folder content page. It's executed in the thread pool.
+
+        :param folder: folder
+        :param store_folder_name: remember folder name
+        :param cursor: index of the first item
+        :param limit: maximum number of items, None - all items
+
+        :return: tuple (normalized folder name or None if folder doesn't exist, content dictionary)
+        """
+        file_objects = self.file_util.get_folder_content(folder, store_folder_name, self.read_embedded_images, False)
+        if file_objects == None:
+            found_folder = None
+            file_objects = []
+        else:
+            found_folder = folder = self.file_util.normalize_folder_name(folder)
+
+        total = len(file_objects)
+        if limit == None:
+            end = total
+        else:
+            end = min(cursor + limit, total)
+
+        page = file_objects[cursor : end]
+        if self.show_file_details:
+            self.file_util.add_file_details(page)
+        if self.read_embedded_images:
+            self.file_util.probe_embedded_images(page)
+
+        return (found_folder, {
+            FOLDER: folder, 
+            FOLDER_IMAGE_PATH: self.util.get_folder_image_path(folder),
+            TOTAL: total,
+            NEXT_CURSOR: end if end < total else None,
+            FILES: self.convert_to_dictionaries(page)
+        })
+
+    async def write_content(self, content):
+        """ Write content JSON. The list of files is sent in chunks.
+
+        :param content: content dictionary
+        """
+        files = content.pop(FILES)
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        self.write(json.dumps(content)[0 : -1] + ", " + json.dumps(FILES) + ": [")
+
+        for i in range(0, len(files), STREAM_CHUNK_SIZE):
+            chunk = ", ".join([json.dumps(f) for f in files[i : i + STREAM_CHUNK_SIZE]])
+            if i > 0:
+                chunk = ", " + chunk
+            self.write(chunk)
+            await self.flush()
+
+        self.write("]}")
+
     def get_boolean_argument(self, name, default_value):
         arg = self.get_argument(name, default=default_value)
         if not isinstance(arg, str):
@@ -17,13 +17,17 @@
 
 from web.server.jsonfactory import JsonFactory
 from web.server.peppyrequesthandler import PeppyRequestHandler
+from web.server.blockingexecutor import run_blocking
+from web.server.imagestore import image_store
+
+NO_CACHE = "no-cache"
 
 class ImageHandler(PeppyRequestHandler):
     def initialize(self, peppy):
         self.peppy = peppy
         self.json_factory = JsonFactory(peppy.util, peppy)
 
-    def get(self):
+    async def get(self):
         try:
             current_player_screen = self.peppy.current_player_screen
             if not current_player_screen:
@@ -40,9 +44,12 @@ class ImageHandler(PeppyRequestHandler):
             else:
                 surface = content
             
-            img = self.peppy.util.image_util.get_png_from_surface(surface)
-            self.set_header("Content-Type", "image/png")
-            self.write(img)
+            snapshot = await run_blocking(image_store.put_snapshot, surface.copy(), self.peppy.util.image_util)
+            if snapshot == None:
+                self.set_status(500)
+                return self.finish()
+
+            self.write_image(snapshot[0], snapshot[1], NO_CACHE)
         except:
             self.set_status(500)
             return self.finish()
@@ -0,0 +1,37 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+from web.server.peppyrequesthandler import PeppyRequestHandler
+from web.server.imagestore import image_store
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+class ImageDataHandler(PeppyRequestHandler):
+    """ Image referenced by the hash of its content in Json updates.
+    curl http://localhost:8000/api/image/<hash>
+    """
+    def get(self, key):
+        try:
+            image = image_store.get_image(key)
+            if image == None:
+                self.set_status(404)
+                return self.finish()
+
+            self.write_image(key, image, IMMUTABLE)
+        except:
+            self.set_status(500)
+            return self.finish()
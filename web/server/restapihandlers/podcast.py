@@ -18,6 +18,7 @@
 import json
 
 from tornado.web import RequestHandler
+from web.server.blockingexecutor import run_blocking
 
 NAME = "name"
 DESCRIPTION = "description"
@@ -31,30 +32,36 @@ class PodcastHandler(RequestHandler):
     def initialize(self, peppy):
         self.podcast_util = peppy.util.get_podcasts_util()
 
-    def get(self, resource):
+    async def get(self, resource):
         try:
-            if resource == "links":
-                payload = self.podcast_util.get_podcasts_links()
-                if not payload:
-                    return
-            elif resource == "info":
-                info = self.podcast_util.get_podcasts_info()
-                if not info:
-                    return
-                payload = self.convert_info_to_dictionaries(info)
-            elif resource.startswith("url="):
-                url = resource.split("=")
-                info = self.podcast_util.get_podcast_info(None, url[1], include_icon=False)
-                payload = self.convert_info_to_dictionary(info)
-            elif resource.startswith("episodes/url="):
-                url = resource.split("=")
-                episodes = self.podcast_util.get_episodes(url[1])
-                payload = self.convert_episodes_to_dictionaries(episodes)
+            payload = await run_blocking(self.get_payload, resource)
+            if payload == None:
+                return
             self.write(json.dumps(payload))
         except:
             self.set_status(500)
             return self.finish()
 
+    def get_payload(self, resource):
+        if resource == "links":
+            payload = self.podcast_util.get_podcasts_links()
+            if not payload:
+                return None
+        elif resource == "info":
+            info = self.podcast_util.get_podcasts_info()
+            if not info:
+                return None
+            payload = self.convert_info_to_dictionaries(info)
+        elif resource.startswith("url="):
+            url = resource.split("=")
+            info = self.podcast_util.get_podcast_info(None, url[1], include_icon=False)
+            payload = self.convert_info_to_dictionary(info)
+        elif resource.startswith("episodes/url="):
+            url = resource.split("=")
+            episodes = self.podcast_util.get_episodes(url[1])
+            payload = self.convert_episodes_to_dictionaries(episodes)
+        return payload
+
     def convert_info_to_dictionaries(self, info):
         result = []
         for i in info:
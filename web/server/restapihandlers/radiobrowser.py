@@ -18,6 +18,7 @@
 import json
 
 from tornado.web import RequestHandler
+from web.server.blockingexecutor import run_blocking
 
 class RadioBrowserHandler(RequestHandler):
     """ curl http://localhost:8000/api/radiobrowser """
@@ -26,20 +27,20 @@ class RadioBrowserHandler(RequestHandler):
         self.util = peppy.util
         self.radio_browser = peppy.util.radio_browser
 
-    def get(self):
+    async def get(self):
         try:
             r = None
 
             a = self.get_argument("category", None)
             if a:
                 if a == "countries":
-                    r = self.radio_browser.get_countries()
+                    r = await run_blocking(self.radio_browser.get_countries)
                     if r:
                         self.radio_browser.sort_list(r, "name")
 
             a = self.get_argument("country", None)
             if a:
-                r = self.radio_browser.get_countries()   
+                r = await run_blocking(self.radio_browser.get_countries)
 
             if r:
                 self.write(json.dumps(r))
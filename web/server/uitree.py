@@ -0,0 +1,167 @@
+# Copyright 2024 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import hashlib
+
+from threading import RLock
+
+COMMAND = "command"
+COMPONENTS = "components"
+VERSION = "version"
+BASE = "base"
+NAME = "name"
+TYPE = "type"
+UPDATE_SCREEN = "update_screen"
+UPDATE_SCREENSAVER = "update_screensaver"
+UPDATE_ELEMENT = "update_element"
+SCREEN_COMMANDS = [UPDATE_SCREEN, UPDATE_SCREENSAVER]
+STATELESS_COMMANDS = ["start_timer", "stop_timer", "mode_changed", "vumeter"]
+LAYOUT_TYPES = ["screen", "panel"]
+
+class UiTree(object):
+    """ Versioned tree of the components shown in web UI. Every component is stored with
+    the hash of its Json representation. When the same screen is sent again only the changed
+    components are sent to the clients which have the previous version of the tree.
+    Other clients (e.g. just connected) get the full screen.
+    """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.lock = RLock()
+        self.version = 0
+        self.reset()
+
+    def reset(self):
+        """ Forget the current screen, so the next screen update is sent completely """
+
+        with self.lock:
+            self.command = None
+            self.components = []
+            self.indexes = {}
+            self.hashes = []
+
+    def get_hash(self, component):
+        """ Get component hash
+
+        :param component: component dictionary
+
+        :return: hash of the component Json representation
+        """
+        s = json.dumps(component, sort_keys=True).encode(encoding="utf-8")
+        return hashlib.sha1(s).hexdigest()
+
+    def get_full_screen(self):
+        """ Get Json object with all components of the current screen
+
+        :return: Json object or None if there is no screen yet
+        """
+        with self.lock:
+            if self.command == None:
+                return None
+            return {COMMAND: self.command, COMPONENTS: list(self.components), VERSION: self.version}
+
+    def update(self, j):
+        """ Apply Json object to the tree
+
+        :param j: Json object which would be sent to the clients
+
+        :return: tuple (base, message). If base is None the message should be sent to all clients.
+            Otherwise the message is a delta which should be sent only to the clients having
+            the base version, all other clients should get the full screen. Message is None
+            if nothing changed.
+        """
+        with self.lock:
+            command = j.get(COMMAND)
+            if command in SCREEN_COMMANDS:
+                return self.update_screen(j)
+            elif command == UPDATE_ELEMENT and self.command != None and self.indexes != None:
+                return self.update_elements(j)
+
+            if command not in STATELESS_COMMANDS:
+                self.reset()
+            return (None, j)
+
+    def update_screen(self, j):
+        """ Apply screen update
+
+        :param j: Json object with screen components
+
+        :return: tuple (base, message)
+        """
+        components = [c for c in j[COMPONENTS] if c]
+        names = [c.get(NAME) for c in components]
+        hashes = [self.get_hash(c) for c in components]
+
+        if j[COMMAND] == self.command and self.indexes != None and len(names) == len(self.components) \
+            and all(self.indexes.get(n) == i for i, n in enumerate(names)):
+            changed = [t for t in zip(components, names, hashes) if t[2] != self.hashes[self.indexes[t[1]]]]
+            if not [t for t in changed if t[0].get(TYPE) in LAYOUT_TYPES]:
+                return self.apply_changes(changed)
+
+        self.command = j[COMMAND]
+        self.components = components
+        self.hashes = hashes
+        self.indexes = {n: i for i, n in enumerate(names)}
+        if None in self.indexes or len(self.indexes) != len(names):
+            self.indexes = None # components cannot be identified, only full updates are possible
+        self.version += 1
+        return (None, self.get_full_screen())
+
+    def update_elements(self, j):
+        """ Apply update of the screen components
+
+        :param j: Json object with updated components
+
+        :return: tuple (base, message)
+        """
+        components = [c for c in j[COMPONENTS] if c and c.get(NAME) != None]
+        names = [c[NAME] for c in components]
+        hashes = [self.get_hash(c) for c in components]
+        changed = []
+        for t in zip(components, names, hashes):
+            i = self.indexes.get(t[1])
+            if i == None or self.hashes[i] != t[2]:
+                changed.append(t)
+
+        return self.apply_changes(changed)
+
+    def apply_changes(self, changed):
+        """ Store changed components and create delta message
+
+        :param changed: list of tuples (component, name, hash) for changed components
+
+        :return: tuple (base, message)
+        """
+        base = self.version
+        if not changed:
+            return (base, None)
+
+        for c, n, h in changed:
+            i = self.indexes.get(n)
+            if i == None:
+                self.indexes[n] = len(self.components)
+                self.components.append(c)
+                self.hashes.append(h)
+            else:
+                self.components[i] = c
+                self.hashes[i] = h
+
+        self.version += 1
+        components = [t[0] for t in changed]
+        return (base, {COMMAND: UPDATE_ELEMENT, COMPONENTS: components, BASE: base, VERSION: self.version})
@@ -20,13 +20,14 @@ import tornado.httpserver
 import tornado.ioloop
 import tornado.web
 import os
-import json
 import asyncio
 
 from threading import Thread, RLock
 from util.config import WEB_SERVER, HTTP_PORT, HTTPS, SCREENSAVER, NAME
 from util.keys import KEY_ABOUT
 from web.server.jsonfactory import JsonFactory
+from web.server.uitree import UiTree
+from web.server.broadcastqueue import BroadcastQueue
 from screensaver.screensaverdispatcher import WEB_SAVERS
 from tornado.web import StaticFileHandler, Application
 from tornado.httpserver import HTTPServer
@@ -79,6 +80,8 @@ from web.server.restapihandlers.wakeup import WakeUpHandler
 from web.server.restapihandlers.network import NetworkHandler
 from web.server.restapihandlers.wifi import WiFiHandler
 from web.server.restapihandlers.image import ImageHandler
+from web.server.restapihandlers.imagedata import ImageDataHandler
+from web.server.restapihandlers.broadcast import BroadcastHandler
 from web.server.restapihandlers.time import TimeHandler
 from web.server.restapihandlers.fileplayer import FilePlayerHandler
 from web.server.restapihandlers.filebrowser import FileBrowserHandler
@@ -113,6 +116,8 @@ class WebServer(object):
         self.web_clients = []
         self.player_listeners = []
         self.json_factory = JsonFactory(util, peppy)
+        self.ui_tree = UiTree()
+        self.broadcast_queue = BroadcastQueue(self.ui_tree, self.web_clients)
         self.instance = None
         thread = Thread(target=self.start_web_server)
         thread.daemon = True        
@@ -194,6 +199,8 @@ class WebServer(object):
             ("/api/wifi", WiFiHandler, {"peppy": self.peppy}),
             ("/api/wifi/(.*)", WiFiHandler, {"peppy": self.peppy}),
             ("/api/image", ImageHandler, {"peppy": self.peppy}),
+            (r"/api/image/([0-9a-f]+)", ImageDataHandler),
+            ("/api/broadcast", BroadcastHandler, {"broadcast_queue": self.broadcast_queue}),
             ("/api/time", TimeHandler, {"peppy": self.peppy}),
             ("/api/fileplayer", FilePlayerHandler, {"peppy": self.peppy}),
             ("/api/filebrowser", FileBrowserHandler, {"peppy": self.peppy}),
@@ -222,6 +229,7 @@ class WebServer(object):
         asyncio.set_event_loop(asyncio.new_event_loop())
         http_server.listen(port)
         self.instance = tornado.ioloop.IOLoop.instance()
+        self.broadcast_queue.start(self.instance)
         logging.debug("Web Server Started")
         self.instance.start()
     
@@ -312,7 +320,7 @@ class WebServer(object):
                 current_screen = self.peppy.screensaver_dispatcher.current_screensaver.name
                 if current_screen not in WEB_SAVERS:
                     current_screen = KEY_ABOUT
-                    screen = self.peppy.screens[KEY_ABOUT]
+                    screen = self.peppy.get_about_screen()
                     screen.visible = True
         return self.json_factory.screen_to_json(current_screen, screen)
 
@@ -340,32 +348,22 @@ class WebServer(object):
         self.send_json_to_web_ui(j)
     
     def send_json_to_web_ui(self, j):
-        """ Send provided Json object to all web clients
+        """ Queue provided Json object for all web clients. The queue is sent once per frame window.
         
         :param j: Json object to send
         """
-        if len(self.web_clients) == 0:
+        if len(self.web_clients) == 0 or not j:
             return
 
         try:
-            for c in self.web_clients:
-                # custom - alternative UI e.g. minimalist
-                if j and j["command"] == "update_screensaver" and getattr(c, "custom", False):
-                    continue
-                e = json.dumps(j).encode(encoding="utf-8")
-                self.instance.add_callback(c.write_message, e)
+            self.broadcast_queue.put(j)
         except Exception as e:
             logging.debug(e)
 
     def mode_changed(self):
         """ Notify clients that mode changed """
 
-        try:
-            for c in self.web_clients:
-                e = json.dumps({"command":"mode_changed"}).encode(encoding="utf-8")
-                self.instance.add_callback(c.write_message, e)
-        except Exception as e:
-            logging.debug(e)
+        self.send_json_to_web_ui({"command":"mode_changed"})
 
     def is_screensaver(self):
         """ Check if the current screen is a screensaver screen